@@ -0,0 +1,82 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+# JWT 인증에서 토큰의 user_id로 User를 찾는 조회를 프로세스 메모리에 캐시한다.
+# 인증된 요청마다 나가던 User SELECT가 캐시가 살아 있는 동안에는 없어진다.
+#
+# - 크기(AUTH_USER_CACHE_SIZE)를 넘으면 가장 오래 안 쓴 항목부터 버리는 LRU, 항목마다 TTL(AUTH_USER_CACHE_TTL)
+# - User 저장/삭제(비밀번호 변경, 비활성화 포함)와 로그아웃 때 지운다. (accounts/signals.py)
+# - 캐시는 프로세스마다 따로 있으므로 다른 워커 프로세스에서 바뀐 내용은 최대 TTL만큼 늦게 반영된다.
+
+class UserCache:
+
+    def __init__(self):
+        self._entries = OrderedDict() # user_id -> (user, expires_at)
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self):
+        return getattr(settings, 'AUTH_USER_CACHE_SIZE', 1024)
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'AUTH_USER_CACHE_TTL', 60)
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user):
+        with self._lock:
+            self._entries[user_id] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(str(user_id)) if user_id is not None else None
+
+        if user is None:
+            # 토큰 검사, 사용자 없음/비활성 확인은 simplejwt 그대로
+            user = super().get_user(validated_token)
+            user_cache.set(str(user_id), user)
+        elif api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            # 토큰마다 다른 값이므로 캐시에서 꺼낸 경우에도 확인
+            raise AuthenticationFailed("The user's password has been changed.", code="password_changed")
+
+        # 요청에서 request.user를 바꿔도 캐시된 객체에는 영향이 없도록 복사본을 돌려준다
+        return copy.copy(user)
@@ -0,0 +1,138 @@
+import base64
+import json
+import threading
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.settings import get_secret
+
+
+# 구글 OAuth(인가 코드 -> 토큰 -> 사용자 정보) HTTP 클라이언트
+# 요청마다 새 연결을 만들지 않도록 프로세스 전체에서 하나의 requests.Session(연결 풀, keep-alive)을 공유하고,
+# 모든 요청에 connect/read 타임아웃을 걸어서 구글 응답이 늦어도 워커가 무한정 묶이지 않게 한다.
+#
+# 토큰 교환과 사용자 정보 조회는 access token이 있어야 두 번째 요청을 보낼 수 있어서 동시에 보낼 수 없다.
+# 대신 scope에 openid가 있으면 토큰 응답의 id_token에 이메일/이름이 들어 있으므로 userinfo 요청 자체를 생략한다.
+# (id_token을 토큰 엔드포인트에서 TLS로 직접 받았으므로 서명 검증은 생략 가능 - OpenID Connect Core 3.1.3.7)
+#
+# 엔드포인트 URL은 settings로 바꿀 수 있어서 로컬의 가짜 OAuth 서버로 테스트할 수 있다.
+
+class OAuthError(Exception):
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def _decode_id_token(id_token):
+    """JWT payload(claims)만 꺼낸다. 형식이 이상하면 None"""
+    try:
+        payload = id_token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload.encode('ascii')))
+    except (IndexError, ValueError, UnicodeError):
+        return None
+
+
+class GoogleOAuthClient:
+
+    def __init__(self, token_url, userinfo_url, client_id, client_secret, redirect_uri,
+                 connect_timeout=3.0, read_timeout=5.0, pool_size=10, retries=2):
+        self.token_url = token_url
+        self.userinfo_url = userinfo_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.redirect_uri = redirect_uri
+        self.timeout = (connect_timeout, read_timeout)
+
+        # 연결 실패와 GET의 일시적인 5xx만 재시도한다.
+        # 인가 코드는 한 번만 쓸 수 있으므로 토큰 교환(POST)은 요청이 전달된 뒤에는 재시도하지 않는다.
+        retry = Retry(
+            total=retries, connect=retries, read=0, status=retries,
+            status_forcelist=(500, 502, 503, 504), allowed_methods=frozenset({'GET'}),
+            backoff_factor=0.2, raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _request(self, method, url, **kwargs):
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.Timeout:
+            raise OAuthError('Google OAuth server timed out.', status_code=504)
+        except requests.RequestException:
+            raise OAuthError('Failed to connect to Google OAuth server.', status_code=502)
+
+        try:
+            data = response.json()
+        except ValueError:
+            raise OAuthError('Invalid response from Google OAuth server.', status_code=502)
+        return response.status_code, data
+
+    def exchange_code(self, code):
+        """인가 코드를 토큰 응답(dict)으로 바꾼다."""
+        # client_secret이 URL(접근 로그)에 남지 않도록 form body로 보낸다
+        status_code, data = self._request('POST', self.token_url, data={
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'code': code,
+            'grant_type': 'authorization_code',
+            'redirect_uri': self.redirect_uri,
+        })
+        if status_code != 200 or data.get('error') is not None or not data.get('access_token'):
+            raise OAuthError(data.get('error_description') or data.get('error') or 'Failed to get access token')
+        return data
+
+    def fetch_userinfo(self, access_token):
+        status_code, data = self._request(
+            'GET', self.userinfo_url, headers={'Authorization': f'Bearer {access_token}'}
+        )
+        if status_code != 200:
+            raise OAuthError('Failed to get user info')
+        return data
+
+    def get_user_info(self, code):
+        """인가 코드로 {'name', 'email'}을 가져온다. id_token에 있으면 userinfo 요청을 생략한다."""
+        token = self.exchange_code(code)
+
+        claims = _decode_id_token(token['id_token']) if token.get('id_token') else None
+        if claims and claims.get('email') and claims.get('name'):
+            return {'name': claims['name'], 'email': claims['email']}
+
+        info = self.fetch_userinfo(token['access_token'])
+        if not info.get('email'):
+            raise OAuthError('Email does not exist.')
+        return {'name': info.get('name') or info['email'].split('@')[0], 'email': info['email']}
+
+    async def aget_user_info(self, code):
+        """ASGI용. 이벤트 루프를 막지 않도록 같은 연결 풀을 쓰는 스레드에서 실행한다."""
+        return await sync_to_async(self.get_user_info, thread_sensitive=False)(code)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_google_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GoogleOAuthClient(
+                    token_url=getattr(settings, 'GOOGLE_OAUTH_TOKEN_URL', 'https://oauth2.googleapis.com/token'),
+                    userinfo_url=getattr(settings, 'GOOGLE_OAUTH_USERINFO_URL', 'https://www.googleapis.com/oauth2/v3/userinfo'),
+                    client_id=get_secret("GOOGLE_CLIENT_ID"),
+                    client_secret=get_secret("GOOGLE_SECRET"),
+                    redirect_uri=get_secret("GOOGLE_CALLBACK_URI"),
+                    connect_timeout=getattr(settings, 'GOOGLE_OAUTH_CONNECT_TIMEOUT', 3.0),
+                    read_timeout=getattr(settings, 'GOOGLE_OAUTH_READ_TIMEOUT', 5.0),
+                    pool_size=getattr(settings, 'GOOGLE_OAUTH_POOL_SIZE', 10),
+                )
+    return _client
@@ -0,0 +1,33 @@
+from django.contrib.auth.signals import user_logged_out
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+
+from .authentication import user_cache
+from .models import User
+
+
+# 인증 사용자 캐시(accounts/authentication.py) 무효화
+# 비밀번호 변경(set_password 후 save), 비활성화 등은 모두 User 저장으로 들어온다.
+# 롤백되기 전 값이 다시 캐시되지 않도록 커밋 이후에도 한 번 더 지운다.
+def _invalidate(user):
+    user_id = str(getattr(user, api_settings.USER_ID_FIELD))
+    user_cache.invalidate(user_id)
+    transaction.on_commit(lambda: user_cache.invalidate(user_id))
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_cache_on_save(sender, instance, **kwargs):
+    _invalidate(instance)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_user_cache_on_delete(sender, instance, **kwargs):
+    _invalidate(instance)
+
+
+@receiver(user_logged_out)
+def invalidate_user_cache_on_logout(sender, request, user, **kwargs):
+    if user is not None and user.is_authenticated:
+        _invalidate(user)
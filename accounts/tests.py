@@ -1,3 +1,262 @@
-from django.test import TestCase
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs
 
-# Create your tests here.
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.base import APITestCase
+
+from .authentication import CachedJWTAuthentication, user_cache
+from .models import User
+from .oauth_client import GoogleOAuthClient, OAuthError
+
+
+def _id_token(claims):
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b'=').decode()
+    return f'header.{payload}.signature'
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass # 타임아웃 테스트에서 클라이언트가 먼저 끊은 연결
+
+
+class FakeOAuthServer:
+    """토큰/사용자 정보 엔드포인트를 흉내 내는 로컬 HTTP 서버 (keep-alive 지원)"""
+
+    def __init__(self):
+        self.token_response = {'access_token': 'access-1'}
+        self.token_status = 200
+        self.token_delay = 0
+        self.userinfo_response = {'email': 'user@example.com', 'name': '사용자'}
+        self.requests = []      # (method, path, form 또는 Authorization 헤더)
+        self.connections = set()
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, data):
+                body = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                fake.connections.add(self.client_address)
+                form = parse_qs(self.rfile.read(int(self.headers['Content-Length'])).decode())
+                fake.requests.append(('POST', self.path, form))
+                if fake.token_delay:
+                    time.sleep(fake.token_delay)
+                self._send(fake.token_status, fake.token_response)
+
+            def do_GET(self):
+                fake.connections.add(self.client_address)
+                fake.requests.append(('GET', self.path, self.headers.get('Authorization')))
+                self._send(200, fake.userinfo_response)
+
+        self.server = _QuietServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class GoogleOAuthClientTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.fake = FakeOAuthServer()
+        self.addCleanup(self.fake.close)
+        self.client_ = self.make_client()
+
+    def make_client(self, **kwargs):
+        client = GoogleOAuthClient(
+            token_url=f'{self.fake.url}/token', userinfo_url=f'{self.fake.url}/userinfo',
+            client_id='client-id', client_secret='client-secret', redirect_uri='http://testserver/callback',
+            **kwargs,
+        )
+        self.addCleanup(client.session.close)
+        return client
+
+    def test_userinfo_is_fetched_with_access_token(self):
+        self.assertEqual(self.client_.get_user_info('code-1'), {'name': '사용자', 'email': 'user@example.com'})
+        (_, token_path, form), (_, userinfo_path, authorization) = self.fake.requests
+        self.assertEqual((token_path, userinfo_path), ('/token', '/userinfo'))
+        self.assertEqual(form['code'], ['code-1'])
+        self.assertEqual(form['client_secret'], ['client-secret'])
+        self.assertEqual(authorization, 'Bearer access-1')
+
+    def test_id_token_skips_userinfo(self):
+        self.fake.token_response = {
+            'access_token': 'access-1',
+            'id_token': _id_token({'email': 'id@example.com', 'name': '아이디 토큰'}),
+        }
+        self.assertEqual(self.client_.get_user_info('code-1'), {'name': '아이디 토큰', 'email': 'id@example.com'})
+        self.assertEqual([method for method, _, _ in self.fake.requests], ['POST'])
+
+    def test_connection_is_reused(self):
+        for _ in range(3):
+            self.client_.get_user_info('code')
+        self.assertEqual(len(self.fake.requests), 6)
+        self.assertEqual(len(self.fake.connections), 1)
+
+    def test_token_error(self):
+        self.fake.token_status = 400
+        self.fake.token_response = {'error': 'invalid_grant', 'error_description': 'Bad Request'}
+        with self.assertRaises(OAuthError) as raised:
+            self.client_.get_user_info('used-code')
+        self.assertEqual((raised.exception.status_code, raised.exception.message), (400, 'Bad Request'))
+
+    def test_slow_token_endpoint_times_out(self):
+        self.fake.token_delay = 0.5
+        with self.assertRaises(OAuthError) as raised:
+            self.make_client(read_timeout=0.1).get_user_info('code')
+        self.assertEqual(raised.exception.status_code, 504)
+        # 인가 코드는 한 번만 쓸 수 있으므로 토큰 요청은 재시도하지 않는다
+        self.assertEqual(len(self.fake.requests), 1)
+
+    def test_unreachable_server(self):
+        self.fake.close()
+        with self.assertRaises(OAuthError) as raised:
+            self.make_client(retries=0).get_user_info('code')
+        self.assertEqual(raised.exception.status_code, 502)
+
+
+class GoogleCallbackTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.fake = FakeOAuthServer()
+        self.addCleanup(self.fake.close)
+        client = GoogleOAuthClient(
+            token_url=f'{self.fake.url}/token', userinfo_url=f'{self.fake.url}/userinfo',
+            client_id='client-id', client_secret='client-secret', redirect_uri='http://testserver/callback',
+        )
+        self.addCleanup(client.session.close)
+        patcher = mock.patch('accounts.oauth_client._client', client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_callback_creates_user_and_returns_tokens(self):
+        response = self.client.get('/account/google/callback/', {'code': 'code-1'})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['user']['email'], 'user@example.com')
+        self.assertTrue(body['token']['access_token'])
+        self.assertTrue(User.objects.filter(email='user@example.com').exists())
+
+        # 같은 이메일로 다시 로그인하면 기존 사용자
+        self.assertEqual(self.client.get('/account/google/callback/', {'code': 'code-2'}).json()['user']['id'], body['user']['id'])
+
+    async def test_async_callback(self):
+        response = await self.async_client.get('/account/google/callback/async/', {'code': 'code-1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user']['email'], 'user@example.com')
+
+    def test_missing_code(self):
+        self.assertEqual(self.client.get('/account/google/callback/').status_code, 400)
+
+    def test_oauth_error_status_is_returned(self):
+        self.fake.token_status = 400
+        self.fake.token_response = {'error': 'invalid_grant'}
+        response = self.client.get('/account/google/callback/', {'code': 'used-code'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], 'invalid_grant')
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.token = str(AccessToken.for_user(self.user))
+
+    def authenticate(self, token=None):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token or self.token}')
+        user, _ = CachedJWTAuthentication().authenticate(request)
+        return user
+
+    def test_user_is_cached(self):
+        with self.assertNumQueries(1):
+            first = self.authenticate()
+        with self.assertNumQueries(0):
+            second = self.authenticate()
+        self.assertEqual(second.pk, self.user.pk)
+
+        # 요청에서 바꾼 값이 캐시에 남지 않는다
+        self.assertIsNot(first, second)
+        second.username = 'changed'
+        self.assertEqual(self.authenticate().username, 'tester')
+
+    def test_save_invalidates(self):
+        self.authenticate()
+        self.user.email = 'new@example.com'
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate().email, 'new@example.com')
+
+    def test_password_change_invalidates(self):
+        self.authenticate()
+        self.user.set_password('new-password-5678')
+        self.user.save()
+        self.assertTrue(self.authenticate().check_password('new-password-5678'))
+
+    def test_deactivated_user_is_rejected(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_deleted_user_is_rejected(self):
+        self.authenticate()
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_value_cached_inside_transaction_is_dropped_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.email = 'new@example.com'
+            self.user.save()
+            self.authenticate() # 커밋 전에 다시 캐시된 값
+        self.assertIsNone(user_cache.get(str(self.user.pk)))
+
+    def test_logout_invalidates(self):
+        self.authenticate()
+        response = self.client.post('/account/logout/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(user_cache.get(str(self.user.pk)))
+
+    def test_entry_expires_after_ttl(self):
+        with mock.patch('accounts.authentication.time.monotonic', return_value=1000.0):
+            self.authenticate()
+        with self.settings(AUTH_USER_CACHE_TTL=60):
+            with mock.patch('accounts.authentication.time.monotonic', return_value=1059.0):
+                self.assertIsNotNone(user_cache.get(str(self.user.pk)))
+            with mock.patch('accounts.authentication.time.monotonic', return_value=1060.0):
+                self.assertIsNone(user_cache.get(str(self.user.pk)))
+
+    def test_least_recently_used_user_is_evicted(self):
+        other = self.make_user('other')
+        with self.settings(AUTH_USER_CACHE_SIZE=1):
+            self.authenticate()
+            self.authenticate(str(AccessToken.for_user(other)))
+        self.assertIsNone(user_cache.get(str(self.user.pk)))
+        self.assertEqual(user_cache.get(str(other.pk)).pk, other.pk)
@@ -1,7 +1,6 @@
 from django.urls import path
 from .views import *
 from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
     TokenRefreshView,
     TokenVerifyView,
 )
@@ -13,11 +12,12 @@ urlpatterns = [
     path("logout/", LogoutView.as_view()),
 
      # 토큰 관련 url 추가
-    path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("token/", ThrottledTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
 
     # 소셜로그인
     path("google/login/", google_login, name="google_login"), # 프론트 협업 시 삭제
     path("google/callback/", google_callback, name="google_callback"),
+    path("google/callback/async/", google_callback_async, name="google_callback_async"), # ASGI용
 ]
\ No newline at end of file
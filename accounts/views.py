@@ -2,6 +2,7 @@ from django.shortcuts import render
 
 # Create your views here.
 from rest_framework_simplejwt.serializers import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from .serializers import *
@@ -14,10 +15,14 @@ from rest_framework import status # week11
 
 from config.settings import get_secret # week11
 from django.shortcuts import redirect
-from json import JSONDecodeError
 from django.http import JsonResponse
-import requests 
+from asgiref.sync import sync_to_async
+from .oauth_client import get_google_client, OAuthError # 구글 OAuth HTTP 클라이언트
+from config.throttling import IPTokenBucketThrottle # 요청 제한 (settings.RATE_LIMITS)
 class RegisterView(APIView):
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = 'register'
+
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
 
@@ -47,6 +52,10 @@ class RegisterView(APIView):
         
 
 class AuthView(APIView):
+    # 비밀번호 해시 검사 전에 IP별로 로그인 시도 횟수를 제한
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = 'login'
+
     def post(self, request):
         serializer = AuthSerializer(data=request.data)
         
@@ -79,7 +88,13 @@ class AuthView(APIView):
         # 유효성 검사 실패 시 오류 반환
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        
+
+
+# simplejwt 토큰 발급도 비밀번호를 확인하므로 로그인과 같은 버킷(IP별 'login')으로 제한
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = 'login'
+
 class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -104,28 +119,32 @@ def google_callback(request):
     if code is None:
         return JsonResponse({'error': 'Authorization code error.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    # 인가코드로 access token 받기
-    token_req = requests.post(f"https://oauth2.googleapis.com/token?client_id={GOOGLE_CLIENT_ID}&client_secret={GOOGLE_SECRET}&code={code}&grant_type=authorization_code&redirect_uri={GOOGLE_CALLBACK_URI}")
-    token_req_json = token_req.json()
-    error = token_req_json.get("error")
+    # 인가코드로 access token을 받고 구글 계정 정보 가져오기 (연결 풀 + 타임아웃, accounts/oauth_client.py)
+    try:
+        user_info = get_google_client().get_user_info(code)
+    except OAuthError as e:
+        return JsonResponse({'status': e.status_code, 'message': e.message}, status=e.status_code)
 
-    if error is not None:
-        raise JSONDecodeError(error)
+    return _google_login_response(user_info)
 
-    google_access_token = token_req_json.get('access_token')
+# ASGI용 async 버전, 구글 응답을 기다리는 동안 이벤트 루프를 막지 않는다
+async def google_callback_async(request):
+    code = request.GET.get("code", None)
 
-    # access token으로 구글 계정 정보 가져오기
-    user_info = requests.get(f"https://www.googleapis.com/oauth2/v3/userinfo?access_token={google_access_token}")
-    res_status = user_info.status_code
+    if code is None:
+        return JsonResponse({'error': 'Authorization code error.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    if res_status != 200:
-        return JsonResponse({'status': 400,'message': 'Failed to get access token'}, status=status.HTTP_400_BAD_REQUEST)
-    
-    user_info_json = user_info.json()
+    try:
+        user_info = await get_google_client().aget_user_info(code)
+    except OAuthError as e:
+        return JsonResponse({'status': e.status_code, 'message': e.message}, status=e.status_code)
+
+    return await sync_to_async(_google_login_response)(user_info)
 
+def _google_login_response(user_info):
     data = {
-        "username": user_info_json['name'],
-        "email": user_info_json['email']
+        "username": user_info['name'],
+        "email": user_info['email']
     }
     
     serializer = OAuthSerializer(data=data)
@@ -0,0 +1,16 @@
+# API 벤치마크(python manage.py bench_api) 전용 설정
+# 기본은 SQLite로 실행하고, BENCH_DB=mysql 이면 settings.py의 MySQL 설정을 그대로 쓴다.
+# 어느 쪽이든 bench_api는 테스트 DB(test_*)를 새로 만들어서 측정하고 끝나면 지운다.
+#
+# 사용 예)
+#   python manage.py bench_api --settings=config.bench_settings
+#   BENCH_DB=mysql python manage.py bench_api --settings=config.bench_settings --output bench.json
+from .settings import *
+
+if os.environ.get('BENCH_DB', 'sqlite') == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'bench.sqlite3',
+        }
+    }
@@ -47,6 +47,10 @@ class PostValidationException(ValidationErrorException):
         super().__init__(detail=detail, code=code)
         self.field_errors = field_errors or {}
 
+class InvalidCursorException(ValidationErrorException):
+    default_detail = "유효하지 않은 페이지 커서입니다."
+    default_code = "INVALID_CURSOR"
+
 class RequiredFieldException(ValidationErrorException):
     default_detail = "Required field is missing."
     default_code = "REQUIRED_FIELD_ERROR"
@@ -77,14 +81,28 @@ class CommentValidationException(ValidationErrorException):
         super().__init__(detail=detail, code=code)
         self.field_errors = field_errors or {}
 
+class NotFoundException(BaseCustomAPIException):
+    status_code = 404
+    default_detail = "Resource not found."
+    default_code = "NOT_FOUND"
+
+class UploadNotFoundException(NotFoundException):
+    default_detail = "업로드된 파일을 찾을 수 없습니다. 업로드를 먼저 완료해주세요."
+    default_code = "UPLOAD_NOT_FOUND"
+
+class InvalidUploadTokenException(ValidationErrorException):
+    default_detail = "유효하지 않거나 만료된 업로드 토큰입니다. 업로드 URL을 다시 발급받아주세요."
+    default_code = "INVALID_UPLOAD_TOKEN"
+
 class DailyPostLimitException(BaseCustomAPIException):
     status_code = 429  # Too Many Requests
     default_detail = "일일 게시글 작성 제한에 도달했습니다."
     default_code = "DAILY_POST_LIMIT_EXCEEDED"
     
-    def __init__(self, user=None, detail=None, code=None):
+    def __init__(self, user=None, detail=None, code=None, reset_at=None):
         if user and detail is None:
             detail = f"'{user}'님은 오늘 이미 게시글을 작성하셨습니다. 하루에 하나의 게시글만 작성할 수 있습니다."
         
         super().__init__(detail=detail, code=code)
-        self.user = user
\ No newline at end of file
+        self.user = user
+        self.reset_at = reset_at # 작성 횟수가 초기화되는 시각 (posts/quota.py의 다음 구간 시작)
\ No newline at end of file
@@ -1,4 +1,6 @@
 from rest_framework.views import exception_handler
+from django.conf import settings
+from django.utils import timezone
 from rest_framework.exceptions import ErrorDetail, ValidationError
 from .custom_api_exceptions import PostValidationException, DailyPostLimitException
 
@@ -148,6 +150,16 @@ def _extract_error_detail(error_data):
 
 def _create_daily_limit_error_response(exc, response):
     """DailyPostLimitException에 대한 상세한 응답을 생성합니다."""
+    # 초기화 시각은 제한 구간(DAILY_POST_WINDOW)에 따라 다르므로 예외에 담긴 값을 쓴다
+    reset_at = getattr(exc, 'reset_at', None)
+    if reset_at is not None:
+        reset_time = timezone.localtime(reset_at).isoformat()
+        suggestion = f"{timezone.localtime(reset_at):%Y-%m-%d %H:%M} 이후에 다시 시도해주세요!"
+        response['Retry-After'] = str(max(int((reset_at - timezone.now()).total_seconds()), 1))
+    else:
+        reset_time = None
+        suggestion = '제한 구간이 지난 뒤 다시 시도해주세요!'
+
     return {
         'success': False,
         'error': {
@@ -156,10 +168,10 @@ def _create_daily_limit_error_response(exc, response):
             'status_code': response.status_code,
             'details': {
                 'limit_type': '일일 게시글 작성 제한',
-                'max_posts_per_day': 1,
+                'max_posts_per_day': getattr(settings, 'DAILY_POST_LIMIT', 1),
                 'user': getattr(exc, 'user', None),
-                'reset_time': '내일 00:00 (자정)',
-                'suggestion': '내일 다시 시도해주세요!'
+                'reset_time': reset_time,
+                'suggestion': suggestion
             }
         }
     }
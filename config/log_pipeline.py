@@ -0,0 +1,163 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+
+
+# 요청 로그 파이프라인
+# 요청 스레드는 로그 레코드를 크기 제한이 있는 큐에 넣기만 하고(디스크 I/O 없음),
+# 파일 쓰기는 백그라운드 리스너 스레드가 맡는다.
+# 큐가 차오르면 INFO 이하 레코드는 샘플링하고, 가득 차면 버린다. (요청을 막지 않는다)
+#
+# 파일 회전은 하지 않는다. gunicorn 워커 여러 개가 같은 파일에 쓰기 때문에 프로세스마다 회전하면
+# 서로의 파일을 덮어쓰거나 지울 수 있다. 회전/압축은 logrotate가 한 곳에서 하고,
+# 각 프로세스는 WatchedFileHandler로 파일이 바뀐 것을 알아채서 새 파일을 연다.
+#
+# settings.LOGGING 예)
+#   'formatters': {'json': {'()': 'config.log_pipeline.JsonFormatter'}},
+#   'handlers': {'file_info': {'class': 'config.log_pipeline.NonBlockingFileHandler',
+#                              'filename': ..., 'formatter': 'json'}}
+#
+# /etc/logrotate.d/likelion 예) 하루 또는 50MB마다 회전, 14개 보관, gzip 압축
+#   /srv/likelion/logs/*.log {
+#       daily
+#       maxsize 50M
+#       rotate 14
+#       compress
+#       delaycompress
+#       missingok
+#       notifempty
+#   }
+
+# 요청 로그에 구조화해서 남기는 필드 (RequestLoggingMiddleware가 extra로 넘긴다)
+STRUCTURED_FIELDS = ('method', 'path', 'status', 'latency_ms', 'user_id', 'request_id', 'queries', 'db_ms')
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 JSON 객체 하나씩 쓰는 포매터"""
+
+    def format(self, record):
+        data = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        # Django가 남기는 요청 로그(Not Found 등)는 status_code로 들어온다
+        if 'status' not in data and getattr(record, 'status_code', None) is not None:
+            data['status'] = record.status_code
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exc'] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _Listener(QueueListener):
+
+    def enqueue_sentinel(self):
+        # 큐가 가득 차 있어도 종료 신호는 넣어야 하므로 잠시 기다린다
+        try:
+            self.queue.put(self._sentinel, timeout=5)
+        except queue.Full:
+            pass
+
+
+class NonBlockingFileHandler(QueueHandler):
+    """큐에 넣기만 하는 핸들러. 실제 파일 쓰기는 리스너 스레드의 WatchedFileHandler가 한다.
+
+    - queue_size: 큐 최대 크기. 가득 차면 레코드를 버린다. (dropped)
+    - sample_threshold: 큐가 이 비율 이상 차면 WARNING 미만 레코드는 sample_rate개 중 1개만 남긴다. (sampled_out)
+    버리거나 샘플링한 개수는 큐에 여유가 생기면 WARNING 레코드 한 줄로 남긴다.
+    """
+
+    def __init__(self, filename, queue_size=10000, sample_threshold=0.8, sample_rate=10):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.target = WatchedFileHandler(filename, encoding='utf-8', delay=True)
+        self.queue_size = queue_size
+        self.sample_limit = int(queue_size * sample_threshold)
+        self.sample_rate = max(1, sample_rate)
+        self.dropped = 0
+        self.sampled_out = 0
+        self._seen = 0
+        self._reported = (0, 0)
+        self._counter_lock = threading.Lock()
+
+        self.listener = _Listener(self.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.close)
+
+    def setFormatter(self, fmt):
+        # 포맷은 리스너 스레드에서 하도록 실제 파일 핸들러에 넘긴다
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def setLevel(self, level):
+        super().setLevel(level)
+        self.target.setLevel(level)
+
+    def prepare(self, record):
+        # 메시지 인자와 예외는 요청 스레드에서 문자열로 만들어 둔다 (객체가 바뀌거나 프레임이 남지 않도록)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        for key in ('request', 'stack_info'):
+            record.__dict__.pop(key, None)
+        return record
+
+    def emit(self, record):
+        # 레코드를 복사하기 전에 샘플링 여부부터 정한다
+        if self.queue.qsize() >= self.sample_limit and record.levelno < logging.WARNING:
+            with self._counter_lock:
+                self._seen += 1
+                if self._seen % self.sample_rate:
+                    self.sampled_out += 1
+                    return
+        try:
+            self.enqueue(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._counter_lock:
+                self.dropped += 1
+            return
+        self._report_loss(record)
+
+    def _report_loss(self, record):
+        if (self.dropped, self.sampled_out) == self._reported or self.queue.qsize() >= self.sample_limit:
+            return
+        with self._counter_lock:
+            dropped = self.dropped - self._reported[0]
+            sampled_out = self.sampled_out - self._reported[1]
+            self._reported = (self.dropped, self.sampled_out)
+        if dropped or sampled_out:
+            notice = logging.LogRecord(
+                record.name, logging.WARNING, __file__, 0,
+                f"log backpressure: dropped={dropped} sampled_out={sampled_out}", None, None,
+            )
+            try:
+                self.queue.put_nowait(notice)
+            except queue.Full:
+                pass
+
+    def close(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+            self.target.close()
+        super().close()
@@ -1,10 +1,193 @@
 import logging
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.functional import LazyObject, empty
+
 logger = logging.getLogger('django.request')
 
+# 아래 미들웨어는 동기/비동기 양쪽을 지원한다 (sync_capable, async_capable).
+# ASGI 서버에서 async 뷰(posts/async_views.py)를 부를 때 미들웨어 때문에 요청마다 스레드를 잡지 않도록
+# 다음 단계(get_response)가 코루틴이면 __acall__ 경로로 처리한다.
 class RequestLoggingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = self._start(request)
+        response = self.get_response(request)
+        self._finish(request, response, start, resolve_user=True)
+        return response
+
+    async def __acall__(self, request):
+        start = self._start(request)
+        response = await self.get_response(request)
+        # 이벤트 루프에서는 동기 DB 조회를 할 수 없으므로 이미 읽어 둔 사용자만 기록한다
+        self._finish(request, response, start, resolve_user=False)
+        return response
+
+    def _start(self, request):
+        # 프록시/클라이언트가 보낸 X-Request-ID를 이어 쓰고, 없으면 새로 만든다
+        request.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+        return time.perf_counter()
+
+    def _finish(self, request, response, start, resolve_user):
+        request_id = request.request_id
+        latency_ms = round((time.perf_counter() - start) * 1000, 2)
+        response['X-Request-ID'] = request_id
+        user = getattr(request, 'user', None)
+        if not resolve_user and isinstance(user, LazyObject) and user._wrapped is empty:
+            user = None
+
+        # JSON 포매터가 쓰는 구조화 필드 (config.log_pipeline.STRUCTURED_FIELDS)
+        extra = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'latency_ms': latency_ms,
+            'user_id': user.pk if user is not None and user.is_authenticated else None,
+            'request_id': request_id,
+        }
+        message = f"{request.method} {request.path} {response.status_code} {latency_ms}ms"
+        # QueryCountMiddleware가 켜져 있으면 쿼리 수/DB 시간을 같은 줄에 붙인다
+        metrics = getattr(request, 'query_metrics', None)
+        if metrics is not None:
+            message += f" {metrics.summary()}"
+            extra['queries'] = metrics.count
+            extra['db_ms'] = round(metrics.duration * 1000, 2)
+        logger.info(message, extra=extra)
+
+
+class QueryMetrics:
+    """요청 하나 동안 실행된 SQL의 개수, 총 시간, 가장 느린 쿼리"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_sql = None
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper로 등록되어 모든 쿼리 실행을 감싼다
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if elapsed > self.slowest_duration:
+                self.slowest_duration = elapsed
+                self.slowest_sql = sql
+
+    def summary(self):
+        text = f"queries={self.count} db={self.duration * 1000:.1f}ms"
+        if self.slowest_sql is not None:
+            limit = getattr(settings, 'QUERY_METRICS_SQL_MAX_LENGTH', 200)
+            sql = ' '.join(self.slowest_sql.split())
+            if len(sql) > limit:
+                sql = sql[:limit] + '...'
+            text += f" slowest={self.slowest_duration * 1000:.1f}ms {sql}"
+        return text
+
+
+# async 요청의 쿼리는 sync_to_async 스레드의 DB 연결(스레드마다 따로 있음)에서 실행되므로
+# 요청에서 연결마다 execute_wrapper를 등록할 수 없다. 대신 모든 연결에 아래 wrapper를 한 번 달아 두고,
+# 요청의 QueryMetrics는 ContextVar로 넘긴다. (sync_to_async는 ContextVar를 스레드로 복사한다)
+_current_metrics = ContextVar('query_metrics', default=None)
+
+
+def _count_query(execute, sql, params, many, context):
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def _install_wrapper(connection, **kwargs):
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+def _install_wrapper_on_open_connections():
+    for connection in connections.all(initialized_only=True):
+        _install_wrapper(connection)
+
+
+# 요청별 SQL 쿼리 수와 DB 시간 측정 (N+1 쿼리 찾기용)
+# 결과는 request.query_metrics에 남겨서 RequestLoggingMiddleware가 로그에 함께 쓰고,
+# QUERY_METRICS_HEADERS가 켜져 있으면 응답 헤더 X-Query-Count와 Server-Timing(db)으로도 내보낸다.
+# QUERY_METRICS_ENABLED = False면 MiddlewareNotUsed로 미들웨어 체인에서 빠지므로 비용이 없다.
+# 스트리밍 응답은 본문을 보내는 동안 실행되는 쿼리가 집계되지 않으므로 헤더를 붙이지 않는다.
+class QueryCountMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_METRICS_ENABLED', True):
+            raise MiddlewareNotUsed()
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+            # 이후에 열리는 연결에는 signal로 wrapper를 단다 (ASGI는 요청마다 새 스레드/연결을 쓴다)
+            connection_created.connect(_install_wrapper, dispatch_uid='query_count_middleware')
+            self._installed = False
 
     def __call__(self, request):
-        logger.info(f"{request.method} {request.path}")
-        return self.get_response(request)
\ No newline at end of file
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self._measure(request) as metrics:
+            response = self.get_response(request)
+        return self._add_headers(response, metrics)
+
+    async def __acall__(self, request):
+        if not self._installed:
+            # 미들웨어를 만들기 전에 이미 열려 있던 연결 (처음 한 번만 스레드에서 실행)
+            await sync_to_async(_install_wrapper_on_open_connections)()
+            self._installed = True
+
+        metrics = QueryMetrics()
+        request.query_metrics = metrics
+        token = _current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        return self._add_headers(response, metrics)
+
+    @staticmethod
+    @contextmanager
+    def _measure(request):
+        metrics = QueryMetrics()
+        request.query_metrics = metrics
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(metrics))
+            yield metrics
+
+    @staticmethod
+    def _add_headers(response, metrics):
+        # 쿼리 수/DB 시간은 외부에 노출되므로 헤더는 따로 켠 경우에만 붙인다 (로그에는 항상 남음)
+        if response.streaming or not getattr(settings, 'QUERY_METRICS_HEADERS', settings.DEBUG):
+            return response
+
+        response['X-Query-Count'] = str(metrics.count)
+        timing = f'db;dur={metrics.duration * 1000:.1f};desc="{metrics.count} queries"'
+        if response.has_header('Server-Timing'):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response['Server-Timing'] = timing
+        return response
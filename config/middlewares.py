@@ -1,16 +1,29 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.http import JsonResponse
 from django.http import Http404
 from django.core.exceptions import PermissionDenied
 from config.custom_exceptions import BaseCustomException
 # 13주차 실습
 
+# async 뷰(posts/async_views.py)를 부를 때 요청마다 스레드를 잡지 않도록 동기/비동기 양쪽을 지원한다
+# process_exception은 예외가 났을 때만 Django가 불러준다
 class ExceptionHandlerMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         response = self.get_response(request)
         return response
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
     
     def process_exception(self, request, exception):
         error_info = self._get_error_info(exception)
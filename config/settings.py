@@ -60,6 +60,7 @@ DJANGO_APPS = [
 
 PROJECT_APPS = [
     'posts', 'accounts',
+    'taskqueue', # DB 작업 큐 (manage.py run_tasks)
 ]
 
 THIRD_PARTY_APPS = [
@@ -80,6 +81,7 @@ INSTALLED_APPS = DJANGO_APPS + PROJECT_APPS + THIRD_PARTY_APPS
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware', # 반드시 가장 위쪽에 추가
     'config.logmiddleware.RequestLoggingMiddleware', # log에 대한 커스텀 미들웨어
+    'config.logmiddleware.QueryCountMiddleware', # 요청별 SQL 쿼리 수/DB 시간 (QUERY_METRICS_ENABLED)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -195,20 +197,27 @@ LOGGING = {
             'format': '[{asctime}] {levelname} {message}', # [시간] 로그_레벨 로그_메시지지
             'style': '{', # python 3의 포맷 스타일
         },
+        'json': { # 한 줄에 JSON 하나 (method, path, status, latency_ms, user_id, request_id ...)
+            '()': 'config.log_pipeline.JsonFormatter',
+        },
     },
 
+    # 요청 스레드는 큐에 넣기만 하고 파일 쓰기는 백그라운드 스레드가 한다 (config/log_pipeline.py)
+    # 파일 회전/압축은 logrotate가 하고(여러 워커 프로세스가 같은 파일에 쓰므로), 큐가 차면 INFO는 샘플링/버림
     'handlers': { # 로그 메시지를 어디로 전달할 지 정해주는 handler
         'file_info': { # info 형식의 로그는 requests.log로 전송
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'config.log_pipeline.NonBlockingFileHandler',
             'filename': os.path.join(log_directory, 'requests.log'),
-            'formatter': 'verbose',
+            'formatter': 'json',
+            'queue_size': 10000,
         },
         'file_error': { # waring 형식의 로그는 errors.log로 전송
             'level': 'WARNING',
-            'class': 'logging.FileHandler',
+            'class': 'config.log_pipeline.NonBlockingFileHandler',
             'filename': os.path.join(log_directory, 'errors.log'),
-            'formatter': 'verbose',
+            'formatter': 'json',
+            'queue_size': 10000,
         },
     },
 
@@ -223,7 +232,7 @@ LOGGING = {
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication', # JWTAuthentication + 사용자 조회 캐시
     ),
     # 커스텀 예외 처리 함수 지정
     'EXCEPTION_HANDLER': 'config.custom_exception_handler.custom_exception_handler'
@@ -231,6 +240,86 @@ REST_FRAMEWORK = {
 
 REST_USE_JWT = True
 
+# 요청별 SQL 쿼리 수/DB 시간 측정 (요청 로그에 기록)
+QUERY_METRICS_ENABLED = True
+# X-Query-Count, Server-Timing 응답 헤더로도 내보낼지. 쿼리 정보가 외부에 노출되므로 개발 환경(DEBUG)에서만 켠다
+QUERY_METRICS_HEADERS = DEBUG
+QUERY_METRICS_SQL_MAX_LENGTH = 200  # 로그에 남기는 가장 느린 쿼리의 최대 길이
+
+# 목록 조회 API 커서 페이지네이션 설정
+PAGINATION_PAGE_SIZE = 20       # page_size 파라미터가 없을 때 기본 개수
+PAGINATION_MAX_PAGE_SIZE = 100  # 한 페이지 최대 개수
+
+# 카테고리 메모리 인덱스를 다시 만드는 주기(초), 다른 워커 프로세스의 변경을 반영하기 위함
+CATEGORY_INDEX_TTL = 300
+# 카테고리 필터가 IN 절 하나에 넣는 post id 개수 (SQLite 변수 수 제한 999, MySQL 패킷 크기보다 충분히 작게)
+CATEGORY_FILTER_CHUNK_SIZE = 500
+
+# ?stream=1 목록 스트리밍 시 DB에서 한 번에 읽어오는 행 개수
+STREAM_CHUNK_SIZE = 500
+
+# 게시글/댓글 상세 조회 캐시
+# secrets.json의 OBJECT_CACHE_BACKEND로 백엔드 선택: locmem(기본) / file / redis
+# redis는 Redis 프로토콜을 쓰는 서버라면 무엇이든 가능 (로컬 대체 서버 포함, redis 패키지 필요)
+OBJECT_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'object-cache',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache'),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': secrets.get("REDIS_URL", "redis://127.0.0.1:6379/0"),
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'objects': OBJECT_CACHE_BACKENDS[secrets.get("OBJECT_CACHE_BACKEND", "locmem")],
+}
+
+OBJECT_CACHE_ALIAS = 'objects'
+OBJECT_CACHE_TTL = 60           # 캐시 값이 최신으로 취급되는 시간(초)
+OBJECT_CACHE_STALE_TTL = 30     # 만료 후 갱신하는 동안 이전 값을 돌려줄 수 있는 시간(초)
+OBJECT_CACHE_LOCK_TIMEOUT = 5   # 갱신 락 유지 시간(초)
+
+# 게시글 작성 제한: DAILY_POST_WINDOW 구간(epoch 기준, 기본 UTC 자정마다 초기화)마다 DAILY_POST_LIMIT개
+DAILY_POST_LIMIT = 1
+DAILY_POST_WINDOW = timedelta(days=1)
+
+# 요청 제한 (config/throttling.py, 토큰 버킷) - scope: {'ip' / 'user': '버킷 크기/기간'}
+# 예) '10/min': 한 번에 10번까지, 이후 6초마다 1번씩 다시 허용
+# 버킷 저장소: secrets.json에 RATE_LIMIT_REDIS_URL이 있으면 Redis(모든 워커 프로세스가 공유, redis 패키지 필요),
+# 없으면 프로세스 메모리 (워커 프로세스마다 따로 센다)
+RATE_LIMIT_REDIS_URL = secrets.get("RATE_LIMIT_REDIS_URL")
+RATE_LIMIT_BACKEND = 'redis' if RATE_LIMIT_REDIS_URL else 'local'
+RATE_LIMIT_REDIS_TIMEOUT = 0.1      # Redis 연결/응답 대기 시간(초)
+RATE_LIMIT_REDIS_RETRY = 5          # Redis에 실패한 뒤 이 시간(초) 동안은 프로세스 메모리로 센다
+RATE_LIMITS = {
+    'login': {'ip': '10/min'},
+    'register': {'ip': '5/hour'},
+    'post_create': {'ip': '30/min', 'user': '10/min'},
+    'comment_create': {'ip': '60/min', 'user': '20/min'},
+    'bulk_create': {'ip': '20/hour', 'user': '10/hour'},
+}
+
+# 일괄 작성 API
+BULK_CREATE_MAX_ITEMS = 5000    # 한 요청에 보낼 수 있는 최대 항목 수
+BULK_CREATE_BATCH_SIZE = 500    # bulk_create 한 번에 INSERT 하는 행 수
+
+# 게시글 전문 검색 색인
+# 개발 환경(DEBUG)에서는 로컬 SQLite FTS5 파일, 그 외에는 프로세스 메모리 역색인 사용
+SEARCH_BACKEND = 'posts.search.Fts5SearchBackend' if DEBUG else 'posts.search.InMemorySearchBackend'
+SEARCH_INDEX_PATH = BASE_DIR / 'search_index.sqlite3'
+SEARCH_SNIPPET_LENGTH = 120     # 본문 하이라이트 미리보기 길이
+SEARCH_INDEX_TTL = 300          # 메모리 색인을 DB에서 다시 만드는 주기(초), 다른 워커 프로세스의 변경 반영용
+TITLE_INDEX_TTL = 300           # 제목 자동완성 인덱스를 DB에서 다시 만드는 주기(초)
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=3),    # 유효기간 3시간, 가변적으로 가능
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),    # 유효기간 7일
@@ -239,6 +328,18 @@ SIMPLE_JWT = {
     'TOKEN_USER_CLASS': 'accounts.User',
 }
 
+# JWT 인증 사용자 캐시 (accounts/authentication.py, 프로세스별 LRU)
+AUTH_USER_CACHE_SIZE = 1024  # 최대 사용자 수
+AUTH_USER_CACHE_TTL = 60     # 초, 다른 프로세스에서 바뀐 사용자 정보가 늦게 반영될 수 있는 최대 시간
+
+# 구글 소셜로그인 HTTP 클라이언트 (accounts/oauth_client.py)
+# 로컬의 가짜 OAuth 서버로 테스트할 때는 secrets.json에 GOOGLE_OAUTH_TOKEN_URL / GOOGLE_OAUTH_USERINFO_URL 지정
+GOOGLE_OAUTH_TOKEN_URL = secrets.get("GOOGLE_OAUTH_TOKEN_URL", "https://oauth2.googleapis.com/token")
+GOOGLE_OAUTH_USERINFO_URL = secrets.get("GOOGLE_OAUTH_USERINFO_URL", "https://www.googleapis.com/oauth2/v3/userinfo")
+GOOGLE_OAUTH_CONNECT_TIMEOUT = 3.0  # 연결 타임아웃(초)
+GOOGLE_OAUTH_READ_TIMEOUT = 5.0     # 응답 대기 타임아웃(초)
+GOOGLE_OAUTH_POOL_SIZE = 10         # 호스트별로 유지하는 keep-alive 연결 수
+
 # django-allauth 라이브러리에서 사용하는 옵션 (week11)
 ACCOUNT_LOGIN_METHODS = {'email'}                  # 로그인 방식 설정
 ACCOUNT_SIGNUP_FIELDS = ['email*', 'username*']    # 회원가입 시 필수 입력 필드 설정
@@ -281,4 +382,31 @@ AWS_STORAGE_BUCKET_NAME = 'cjkim'
 AWS_S3_CUSTOM_DOMAIN = '%s.s3.%s.amazonaws.com' % (AWS_STORAGE_BUCKET_NAME,AWS_REGION)
 AWS_S3_OBJECT_PARAMETERS = {
     'CacheControl': 'max-age=86400',
-}
\ No newline at end of file
+}
+
+# 이미지 업로드용 S3 클라이언트 (posts/storage.py)
+AWS_S3_ENDPOINT_URL = secrets.get("AWS_S3_ENDPOINT_URL")  # 로컬 S3 호환 서버(moto 등)로 테스트할 때만 지정
+AWS_S3_MAX_POOL_CONNECTIONS = 50             # 프로세스 전체에서 공유하는 S3 연결 수
+AWS_S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024  # 이 크기 이상이면 multipart 업로드
+AWS_S3_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024  # part 크기
+AWS_S3_MAX_CONCURRENCY = 4                    # 업로드 하나에서 동시에 보내는 part 수 (메모리 = chunksize * concurrency)
+
+# presigned URL로 브라우저에서 S3에 바로 올리는 이미지 업로드 (posts/upload/presign/, posts/upload/complete/)
+IMAGE_UPLOAD_CONTENT_TYPES = ('image/jpeg', 'image/png', 'image/gif', 'image/webp')
+IMAGE_UPLOAD_MAX_SIZE = 10 * 1024 * 1024  # 최대 파일 크기(바이트)
+IMAGE_UPLOAD_PRESIGN_EXPIRES = 600        # presigned POST 유효 시간(초)
+IMAGE_UPLOAD_TOKEN_MAX_AGE = 3600         # complete 호출에 쓰는 업로드 토큰 유효 시간(초), 업로드가 끝날 때까지 여유를 둔다
+
+# 업로드 이미지 파생본 (posts/derivatives.py, 워커 프로세스 풀에서 생성)
+IMAGE_VARIANT_WIDTHS = (320, 800, 1600)        # 너비(px), 원본보다 큰 크기는 만들지 않음
+IMAGE_VARIANT_FORMATS = ('webp', 'jpeg')
+IMAGE_VARIANT_QUALITY = {'webp': 80, 'jpeg': 85}
+
+# DB 작업 큐 (taskqueue 앱, manage.py run_tasks 로 실행)
+TASK_WORKER_POOL = 'process'      # process 또는 thread
+TASK_WORKER_CONCURRENCY = 2       # 워커 하나가 동시에 실행하는 작업 수
+TASK_POLL_INTERVAL = 1.0          # 작업이 없을 때 다시 확인하는 간격(초)
+TASK_MAX_ATTEMPTS = 5             # 이 횟수만큼 실패하면 dead 상태로 남김
+TASK_VISIBILITY_TIMEOUT = 300     # 실행 중인 작업을 이 시간(초) 안에 끝내지 못하면 다른 워커가 다시 실행
+TASK_RETRY_BACKOFF = 2            # 재시도 대기 시간(초) = backoff * 2^(실패 횟수-1), 최대 TASK_RETRY_BACKOFF_MAX
+TASK_RETRY_BACKOFF_MAX = 600
\ No newline at end of file
@@ -0,0 +1,191 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger('django.request')
+
+
+# 토큰 버킷 요청 제한 (DRF throttle)
+# 버킷마다 최대 N개의 토큰이 있고 period 동안 N개가 고르게 다시 채워진다. 요청 하나가 토큰 하나를 쓰고,
+# 토큰이 없으면 다음 토큰이 생길 때까지의 시간을 Retry-After로 담아 429를 돌려준다.
+# DRF는 인증/권한 확인 직후, 핸들러(비밀번호 해시, DB 작업)보다 먼저 throttle을 검사한다.
+#
+# 뷰 설정:
+#     throttle_classes = [IPTokenBucketThrottle, UserTokenBucketThrottle]
+#     throttle_scope = 'post_create'      # settings.RATE_LIMITS의 키
+#     throttle_methods = ('POST',)        # 생략하면 모든 메서드
+#
+# settings.RATE_LIMITS[scope]에 'ip' / 'user' 항목이 없으면 그 기준으로는 제한하지 않는다.
+# 저장소는 RATE_LIMIT_BACKEND로 고른다.
+# - 'redis': RATE_LIMIT_REDIS_URL의 Redis. 모든 워커 프로세스가 공유한다.
+#   읽고-계산하고-쓰는 과정을 Lua 스크립트 하나로 Redis 안에서 실행하므로 락 없이 왕복 한 번이면 되고,
+#   동시에 들어온 요청도 한도를 넘지 않는다.
+#   Redis에 닿지 못하면 요청을 실패(500)시키지 않고 RATE_LIMIT_REDIS_RETRY초 동안 프로세스 메모리로 센다.
+# - 'local'(기본): 프로세스 메모리. 가장 빠르지만 워커 프로세스마다 따로 센다.
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'10/min' -> (버킷 크기 10, 초당 채워지는 토큰 10/60)"""
+    num, period = rate.split('/')
+    capacity = int(num)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+def _take(state, capacity, refill_rate, now):
+    """버킷 상태(tokens, updated)에서 토큰 하나를 쓴다. (새 상태, 기다릴 시간(초), 0이면 허용)"""
+    tokens, updated = state if state is not None else (capacity, now)
+    tokens = min(capacity, tokens + max(0.0, now - updated) * refill_rate)
+    if tokens >= 1:
+        return (tokens - 1, now), 0.0
+    return (tokens, now), (1 - tokens) / refill_rate
+
+
+class LocalBucketStore:
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate):
+        now = time.time()
+        with self._lock:
+            state, wait = _take(self._buckets.get(key), capacity, refill_rate, now)
+            self._buckets[key] = state
+            self._buckets.move_to_end(key)
+            # 오래 안 쓴 버킷은 버린다 (다시 만들면 가득 찬 버킷)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# KEYS[1]: 버킷 (tokens, updated 해시), ARGV: 버킷 크기, 초당 채워지는 토큰, 현재 시각, 만료(초)
+# _take()와 같은 계산. Lua 숫자를 그대로 돌려주면 정수로 잘리므로 기다릴 시간은 문자열로 돌려준다.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * refill_rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / refill_rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+
+    def __init__(self, url):
+        self.url = url
+        self._script = None
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+
+    def _get_script(self):
+        if self._script is None:
+            with self._lock:
+                if self._script is None:
+                    import redis # 선택 의존성: Redis를 쓸 때만 필요
+
+                    timeout = getattr(settings, 'RATE_LIMIT_REDIS_TIMEOUT', 0.1)
+                    client = redis.Redis.from_url(self.url, socket_timeout=timeout, socket_connect_timeout=timeout)
+                    self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+        return self._script
+
+    def consume(self, key, capacity, refill_rate):
+        if time.monotonic() < self._down_until:
+            return local_store.consume(key, capacity, refill_rate)
+        # 버킷이 가득 찰 시간이 지나면 지워져도 결과가 같다
+        ttl = int(capacity / refill_rate) + 1
+        try:
+            wait = self._get_script()(keys=[key], args=[capacity, refill_rate, time.time(), ttl])
+        except Exception:
+            logger.warning("rate limit store %s unavailable, counting in process memory", self.url, exc_info=True)
+            self._down_until = time.monotonic() + getattr(settings, 'RATE_LIMIT_REDIS_RETRY', 5)
+            return local_store.consume(key, capacity, refill_rate)
+        return float(wait)
+
+
+local_store = LocalBucketStore()
+_redis_stores = {}
+_redis_stores_lock = threading.Lock()
+
+
+def get_bucket_store():
+    if getattr(settings, 'RATE_LIMIT_BACKEND', 'local') != 'redis':
+        return local_store
+    # URL마다 하나를 만들어 연결 풀을 재사용한다
+    url = settings.RATE_LIMIT_REDIS_URL
+    store = _redis_stores.get(url)
+    if store is None:
+        with _redis_stores_lock:
+            store = _redis_stores.setdefault(url, RedisBucketStore(url))
+    return store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    kind = None # RATE_LIMITS[scope]의 항목 이름
+
+    def __init__(self):
+        self._wait = None
+
+    def get_ident_key(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        methods = getattr(view, 'throttle_methods', None)
+        if methods is not None and request.method not in methods:
+            return True
+
+        scope = getattr(view, 'throttle_scope', None)
+        rate = getattr(settings, 'RATE_LIMITS', {}).get(scope, {}).get(self.kind)
+        if not rate:
+            return True
+
+        ident = self.get_ident_key(request)
+        if ident is None:
+            return True
+
+        capacity, refill_rate = parse_rate(rate)
+        self._wait = get_bucket_store().consume(f'ratelimit:{scope}:{self.kind}:{ident}', capacity, refill_rate)
+        return self._wait == 0
+
+    def wait(self):
+        return self._wait
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    kind = 'ip'
+
+    def get_ident_key(self, request):
+        # X-Forwarded-For는 REST_FRAMEWORK['NUM_PROXIES']에 맞춰 해석 (DRF 기본 동작)
+        return self.get_ident(request)
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    kind = 'user'
+
+    def get_ident_key(self, request):
+        # 로그인하지 않은 요청은 IP 기준 제한만 받는다
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return None
+        return user.pk
@@ -1,8 +1,11 @@
 from django.contrib import admin
-from .models import Post, Comment, Category, cat_post_linker
+from .models import Post, Comment, Category, cat_post_linker, PostQuota, Image, ImageVariant
 
 # Register your models here.
 admin.site.register(Post)
 admin.site.register(Comment)
 admin.site.register(Category)
-admin.site.register(cat_post_linker)
\ No newline at end of file
+admin.site.register(cat_post_linker)
+admin.site.register(PostQuota)
+admin.site.register(Image)
+admin.site.register(ImageVariant)
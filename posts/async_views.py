@@ -0,0 +1,158 @@
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import PermissionDenied as DjangoPermissionDenied
+from django.http import Http404, HttpResponse, JsonResponse
+from django.views import View
+from rest_framework.exceptions import APIException, PermissionDenied
+from rest_framework.renderers import JSONRenderer
+
+from accounts.permissions import IsAllowedTime
+from config.custom_exception_handler import custom_exception_handler
+from .cache import post_cache
+from .category_index import category_index, id_chunks
+from .fast_serializers import post_fast, comment_fast
+from .models import Post, Comment
+from .pagination import KeysetPaginator
+
+
+# 읽기 전용 API의 async 버전 (ASGI 서버에서 요청마다 스레드를 잡지 않도록)
+# DRF APIView는 async 핸들러를 지원하지 않으므로 Django View의 async 핸들러로 만들고,
+# 응답 JSON과 에러 형식은 기존 DRF 뷰(views.py)와 같게 유지한다.
+# 인증은 세션(request.auser)만 보므로 쓰기 API는 기존 DRF 뷰를 사용한다.
+#
+# 조건부 GET(ETag)은 etag 함수가 동기 ORM을 쓰기 때문에 async 뷰에는 붙이지 않았다.
+
+def _json(data, status=200):
+    # DRF Response와 같은 바이트가 나오도록 DRF JSONRenderer로 직렬화
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+
+
+class AsyncAPIView(View):
+    # 각 권한의 has_permission은 bool 또는 awaitable을 돌려줄 수 있다
+    permission_classes = []
+
+    def get_permissions(self):
+        return [permission() for permission in self.permission_classes]
+
+    async def check_permissions(self, request):
+        for permission in self.get_permissions():
+            allowed = permission.has_permission(request, self)
+            if inspect.isawaitable(allowed):
+                allowed = await allowed
+            if not allowed:
+                raise PermissionDenied(getattr(permission, 'message', None))
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            # 권한 검사에서 request.user를 보더라도 동기 DB 조회가 일어나지 않도록 미리 읽어 둔다
+            request.user = await request.auser()
+            await self.check_permissions(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except (APIException, Http404, DjangoPermissionDenied) as exc:
+            response = custom_exception_handler(exc, {'view': self, 'request': request})
+            if response is None:
+                raise
+            return _json(response.data, status=response.status_code)
+
+
+class AsyncPostList(AsyncAPIView):
+
+    async def get(self, request):
+        paginator = KeysetPaginator(
+            post_fast.values(Post.objects.all()), time_field='created', pk_field='id', columns=post_fast.columns
+        )
+        rows, next_cursor, prev_cursor = await paginator.apaginate(request)
+        data = post_fast.to_representation(rows)
+        return _json({
+            'success': True,
+            'message': '게시글 목록을 성공적으로 조회했습니다.',
+            'data': data,
+            'count': len(data),
+            'next': next_cursor,
+            'prev': prev_cursor,
+        })
+
+
+class AsyncPostDetail(AsyncAPIView):
+    permission_classes = [IsAllowedTime]
+
+    async def get(self, request, post_id):
+        data = await post_cache.aget_or_set(post_id, lambda: self._load(post_id))
+        return _json(data)
+
+    async def _load(self, post_id):
+        data = await post_fast.afirst(Post.objects.filter(id=post_id))
+        if data is None:
+            raise Http404("No Post matches the given query.")
+        return data
+
+
+class AsyncCommentList(AsyncAPIView):
+
+    async def get(self, request):
+        paginator = KeysetPaginator(
+            comment_fast.values(Comment.objects.all()), time_field='writen_time', pk_field='c_id', columns=comment_fast.columns
+        )
+        rows, next_cursor, prev_cursor = await paginator.apaginate(request)
+        data = comment_fast.to_representation(rows)
+        return _json({
+            'success': True,
+            'message': '댓글 목록을 성공적으로 조회했습니다.',
+            'data': data,
+            'count': len(data),
+            'next': next_cursor,
+            'prev': prev_cursor,
+        })
+
+
+class AsyncPostCommentList(AsyncAPIView):
+
+    async def get(self, request, post_id):
+        try:
+            post = await Post.objects.only('id', 'title', 'comment_count').aget(id=post_id)
+        except Post.DoesNotExist:
+            raise Http404("No Post matches the given query.")
+
+        comments = Comment.objects.filter(post_id=post.id).order_by('-writen_time', '-c_id')
+        data = await comment_fast.ato_representation(comments)
+        return _json({
+            'success': True,
+            'message': f'게시글 "{post.title}"의 댓글 목록을 성공적으로 조회했습니다.',
+            'data': data,
+            'count': post.comment_count,
+            'post_info': {
+                'id': post.id,
+                'title': post.title
+            }
+        })
+
+
+async def async_filter_post_by_category(request, category):
+    if request.method != "GET":
+        return JsonResponse({'status': 405, 'message': '허용되지 않는 메소드입니다.'}, status=405)
+
+    # 메모리 인덱스는 바로 읽고, 처음 만들거나 TTL이 지나 다시 만들 때만 동기 ORM을 스레드에서 실행
+    post_ids = category_index.cached_post_ids(category)
+    if post_ids is None:
+        post_ids = await sync_to_async(category_index.post_ids)(category)
+    post_filtered_json_all = []
+    # 동기 뷰와 같은 순서(id 내림차순)와 IN 절 크기
+    for chunk in id_chunks(post_ids):
+        queryset = Post.objects.filter(id__in=chunk).order_by('-id')
+        async for post_id, title, content, post_status, user_id in queryset.values_list(
+            'id', 'title', 'content', 'status', 'user_id'
+        ):
+            post_filtered_json_all.append({
+                "id": post_id,
+                "title": title,
+                "content": content,
+                "status": post_status,
+                "user": user_id,
+            })
+
+    return JsonResponse({
+        'status': 200,
+        'message': '카테고리별 모든 post 조회',
+        'date': post_filtered_json_all
+    })
@@ -0,0 +1,23 @@
+import logging
+import threading
+
+from django.db import connections
+
+logger = logging.getLogger('django.request')
+
+
+# 프로세스 메모리 인덱스(카테고리, 제목 자동완성)를 요청을 기다리게 하지 않고 다시 만들 때 쓰는 백그라운드 스레드
+# 스레드마다 새 DB 연결이 열리므로 끝나면 닫는다. 예외는 요청으로 전달할 곳이 없으므로 로그만 남긴다.
+
+def run_in_background(func, name):
+    def target():
+        try:
+            func()
+        except Exception:
+            logger.exception("background task %s failed", name)
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=target, name=name, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,221 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+
+from accounts.models import User
+from config.custom_api_exceptions import PostConflictException, DailyPostLimitException
+from rest_framework import serializers
+
+from .models import Post, Comment
+from .quota import post_quota
+from .cache import post_cache
+from .comment_counts import add_comment_counts
+from .search import get_search_backend
+from .autocomplete import title_index
+from .serializers import PostBulkItemSerializer, CommentSerializer
+
+
+# 게시글/댓글 일괄 작성
+# 항목마다 쿼리를 날리지 않고 배치 전체에 대해 집합 단위 쿼리(사용자 1번, 제목 1번, 작성 제한 1번)로
+# 검사한 뒤 bulk_create로 나눠서 INSERT 한다. 실패한 항목은 index와 함께 오류를 돌려준다.
+
+def _batch_size():
+    return getattr(settings, 'BULK_CREATE_BATCH_SIZE', 500)
+
+
+def _item_error(index, errors):
+    return {'index': index, 'errors': errors}
+
+
+def bulk_create_posts(items):
+    """게시글 dict 목록을 검사해서 저장하고 (created, errors)를 반환한다.
+
+    created는 [{'index', 'id', 'title'}], errors는 [{'index', 'errors'}] 형태.
+    """
+    errors = []
+
+    # 1) 작성자 한 번에 조회
+    user_ids = set()
+    for item in items:
+        try:
+            user_ids.add(int(item.get('user')))
+        except (AttributeError, TypeError, ValueError):
+            pass
+    users = User.objects.in_bulk(user_ids)
+
+    # 2) 항목별 필드 검사 (DB 조회 없음)
+    valid = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append(_item_error(index, {'non_field_errors': ['객체 형태여야 합니다.']}))
+            continue
+        serializer = PostBulkItemSerializer(data=item, context={'users': users})
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append(_item_error(index, serializer.errors))
+
+    # 3) 제목 중복: 배치 안에서의 중복 + 이미 저장된 제목을 한 번에 조회
+    titles = [data['title'] for _, data in valid]
+    existing = set(Post.objects.filter(title__in=titles).values_list('title', flat=True))
+    seen = set()
+    deduped = []
+    for index, data in valid:
+        title = data['title']
+        if title in existing or title in seen:
+            errors.append(_item_error(index, {'title': [f"'{title}' 제목의 게시글이 이미 존재합니다."]}))
+            continue
+        seen.add(title)
+        deduped.append((index, data))
+
+    # 4) 일일 작성 제한: 사용자별 남은 횟수를 한 번에 조회하고 초과분은 오류 처리
+    remaining = post_quota.remaining_many({data['user'].id for _, data in deduped})
+    accepted = []
+    per_user = {}
+    for index, data in deduped:
+        user = data['user']
+        if remaining[user.id] <= 0:
+            errors.append(_item_error(index, {'non_field_errors': [str(DailyPostLimitException(user=user.username).detail)]}))
+            continue
+        remaining[user.id] -= 1
+        per_user[user] = per_user.get(user, 0) + 1
+        accepted.append((index, data))
+
+    if not accepted:
+        return [], sorted(errors, key=lambda e: e['index'])
+
+    # 5) 작성 횟수 차감과 INSERT를 한 트랜잭션으로 (동시 요청과 경합하면 전체 롤백)
+    try:
+        with transaction.atomic():
+            for user, amount in per_user.items():
+                post_quota.consume(user, amount=amount)
+            Post.objects.bulk_create(
+                [Post(**data) for _, data in accepted],
+                batch_size=_batch_size(),
+            )
+    except IntegrityError:
+        # 오류 메시지는 DB마다 다르므로 롤백된 뒤 제목이 그 사이에 생겼는지 직접 확인
+        if Post.objects.filter(title__in=[data['title'] for _, data in accepted]).exists():
+            raise PostConflictException(detail="다른 요청과 제목이 중복되어 일괄 작성이 취소되었습니다.")
+        raise
+
+    # MySQL은 bulk_create 후 pk를 채워주지 않으므로 unique인 제목으로 id를 한 번에 조회
+    ids = dict(Post.objects.filter(title__in=[data['title'] for _, data in accepted]).values_list('title', 'id'))
+
+    # bulk_create는 post_save 시그널이 없으므로 검색 색인과 자동완성 인덱스는 직접 갱신
+    search_backend = get_search_backend()
+    for _, data in accepted:
+        if ids.get(data['title']) is not None:
+            search_backend.index(ids[data['title']], data['title'], data['content'])
+            title_index.add(ids[data['title']], data['title'])
+    created = [
+        {'index': index, 'id': ids.get(data['title']), 'title': data['title']}
+        for index, data in accepted
+    ]
+    return created, sorted(errors, key=lambda e: e['index'])
+
+
+def bulk_create_comments(items):
+    """댓글 dict 목록을 검사해서 저장하고 (created, errors)를 반환한다.
+
+    게시글 존재 여부는 한 번의 쿼리로 확인하고, CommentSerializer의
+    validate_body/validate_author 규칙을 같은 인스턴스로 반복 호출한다.
+    """
+    errors = []
+    rules = CommentSerializer()
+    field_labels = {'post': '게시글', 'author': '작성자', 'body': '댓글 내용'}
+
+    # 1) 참조하는 게시글 id를 한 번에 확인
+    post_ids = set()
+    for item in items:
+        try:
+            post_ids.add(int(item.get('post')))
+        except (AttributeError, TypeError, ValueError):
+            pass
+    existing_posts = set(Post.objects.filter(id__in=post_ids).values_list('id', flat=True))
+
+    # 2) 항목별 필드 검사
+    accepted = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append(_item_error(index, {'non_field_errors': ['객체 형태여야 합니다.']}))
+            continue
+
+        item_errors = {}
+        missing = [field for field in ('post', 'author', 'body') if not item.get(field)]
+        if missing:
+            item_errors['non_field_errors'] = [
+                f"다음 필드들이 누락되었습니다: {', '.join(field_labels[f] for f in missing)}"
+            ]
+
+        post_id = None
+        if 'post' not in missing:
+            try:
+                post_id = int(item['post'])
+            except (TypeError, ValueError):
+                item_errors['post'] = ['게시글 id는 정수여야 합니다.']
+            else:
+                if post_id not in existing_posts:
+                    item_errors['post'] = [f'Invalid pk "{post_id}" - object does not exist.']
+
+        cleaned = {}
+        for field, rule in (('author', rules.validate_author), ('body', rules.validate_body)):
+            if field in missing:
+                continue
+            if not isinstance(item[field], str):
+                item_errors[field] = ['문자열이어야 합니다.']
+                continue
+            try:
+                cleaned[field] = rule(item[field])
+            except serializers.ValidationError as e:
+                item_errors[field] = [str(detail) for detail in e.detail]
+
+        if item_errors:
+            errors.append(_item_error(index, item_errors))
+            continue
+        accepted.append((index, Comment(post_id=post_id, author=cleaned['author'], body=cleaned['body'])))
+
+    if not accepted:
+        return [], errors
+
+    # 3) 나눠서 INSERT (bulk_create는 post_save 시그널이 없으므로 댓글 수와 캐시는 직접 갱신)
+    per_post = {}
+    for _, comment in accepted:
+        per_post[comment.post_id] = per_post.get(comment.post_id, 0) + 1
+
+    comments = [comment for _, comment in accepted]
+    with transaction.atomic():
+        last_id = Comment.objects.aggregate(last=Max('c_id'))['last'] or 0
+        Comment.objects.bulk_create(comments, batch_size=_batch_size())
+        add_comment_counts(per_post)
+        if any(comment.c_id is None for comment in comments):
+            _read_back_comment_ids(comments, last_id)
+
+    for post_id in per_post:
+        post_cache.invalidate(post_id)
+
+    created = [{'index': index, 'c_id': comment.c_id, 'post': comment.post_id} for index, comment in accepted]
+    return created, errors
+
+
+def _read_back_comment_ids(comments, last_id):
+    """bulk_create가 pk를 채워주지 않는 DB(MySQL)에서 INSERT 전 최대 c_id 이후의 행을 읽어 c_id를 채운다.
+
+    댓글에는 unique한 값이 없으므로 (게시글, 작성자, 내용)이 같은 행끼리 c_id 순서대로 짝짓는다.
+    그 사이 다른 요청이 완전히 같은 댓글을 넣었다면 서로 바뀔 수 있지만 내용은 같다.
+    """
+    pending = {}
+    for comment in comments:
+        pending.setdefault((comment.post_id, comment.author, comment.body), []).append(comment)
+    for key in pending:
+        pending[key].reverse()
+
+    rows = (
+        Comment.objects.filter(c_id__gt=last_id, post_id__in={comment.post_id for comment in comments})
+        .order_by('c_id')
+        .values_list('c_id', 'post_id', 'author', 'body')
+    )
+    for c_id, post_id, author, body in rows.iterator(chunk_size=_batch_size()):
+        waiting = pending.get((post_id, author, body))
+        if waiting:
+            waiting.pop().c_id = c_id
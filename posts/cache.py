@@ -0,0 +1,167 @@
+import asyncio
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+# 상세 조회 API 응답(직렬화 결과)을 id별로 저장하는 read-through 캐시
+# 백엔드는 settings.CACHES의 OBJECT_CACHE_ALIAS 항목으로 고른다
+# (locmem / 파일 / Redis 프로토콜 서버 모두 Django 캐시 백엔드로 교체 가능).
+#
+# 캐시 스탬피드 방지:
+# - 값은 (payload, fresh_until)로 저장하고, 실제 만료(timeout)는 fresh_until보다 STALE_TTL만큼 길게 둔다.
+# - fresh_until이 지나면 cache.add()로 락을 잡은 요청 하나만 DB에서 다시 읽고
+#   나머지 요청은 잠깐 동안 이전 값을 그대로 돌려준다.
+# - 값이 아예 없을 때도 락을 잡은 요청만 DB를 읽고, 나머지는 잠시 기다렸다가 캐시를 다시 본다.
+#
+# 무효화는 id별 세대(generation) 번호를 올려서 한다. 값의 key에 세대가 들어가므로
+# DB를 읽는 동안 무효화가 일어나면 읽은 값은 저장하지 않고(저장하더라도 이전 세대 key라 다시 읽히지 않는다),
+# 락에는 요청마다 다른 토큰을 넣어서 lock_timeout이 지나 다른 요청이 잡은 락은 지우지 않는다.
+class ObjectCache:
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'OBJECT_CACHE_ALIAS', 'default')]
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'OBJECT_CACHE_TTL', 60)
+
+    @property
+    def stale_ttl(self):
+        return getattr(settings, 'OBJECT_CACHE_STALE_TTL', 30)
+
+    @property
+    def lock_timeout(self):
+        return getattr(settings, 'OBJECT_CACHE_LOCK_TIMEOUT', 5)
+
+    def make_key(self, object_id, generation):
+        return f'{self.prefix}:{object_id}:{generation}'
+
+    def _generation_key(self, object_id):
+        return f'{self.prefix}:{object_id}:gen'
+
+    def _lock_key(self, object_id):
+        return f'{self.prefix}:{object_id}:lock'
+
+    @staticmethod
+    def _new_generation():
+        # 세대 key가 캐시에서 밀려나도 예전 세대 값과 겹치지 않도록 시각으로 시작한다
+        return time.time_ns()
+
+    def _generation(self, cache, object_id):
+        key = self._generation_key(object_id)
+        generation = cache.get(key)
+        if generation is None:
+            cache.add(key, self._new_generation(), timeout=None)
+            generation = cache.get(key)
+        return generation
+
+    async def _ageneration(self, cache, object_id):
+        key = self._generation_key(object_id)
+        generation = await cache.aget(key)
+        if generation is None:
+            await cache.aadd(key, self._new_generation(), timeout=None)
+            generation = await cache.aget(key)
+        return generation
+
+    def _load(self, cache, object_id, generation, loader):
+        payload = loader()
+        # 읽는 동안 무효화되었다면 이미 오래된 값이므로 저장하지 않는다
+        if self._generation(cache, object_id) == generation:
+            cache.set(self.make_key(object_id, generation), (payload, time.time() + self.ttl),
+                      timeout=self.ttl + self.stale_ttl)
+        return payload
+
+    def _release(self, cache, lock_key, token):
+        # 내가 잡은 락일 때만 지운다 (lock_timeout이 지나 다른 요청이 잡았을 수 있음)
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+    def get_or_set(self, object_id, loader):
+        """캐시에 있으면 돌려주고, 없으면 loader()로 만들어서 저장한 뒤 돌려준다."""
+        cache = self.cache
+        generation = self._generation(cache, object_id)
+        key = self.make_key(object_id, generation)
+        lock_key = self._lock_key(object_id)
+        token = uuid.uuid4().hex
+
+        entry = cache.get(key)
+        if entry is not None:
+            payload, fresh_until = entry
+            if time.time() < fresh_until:
+                return payload
+
+            # 만료가 가까운 값: 락을 잡은 요청만 갱신하고 나머지는 이전 값을 사용
+            if cache.add(lock_key, token, timeout=self.lock_timeout):
+                try:
+                    return self._load(cache, object_id, generation, loader)
+                finally:
+                    self._release(cache, lock_key, token)
+            return payload
+
+        if cache.add(lock_key, token, timeout=self.lock_timeout):
+            try:
+                return self._load(cache, object_id, generation, loader)
+            finally:
+                self._release(cache, lock_key, token)
+
+        # 다른 요청이 값을 만드는 중이면 잠시 기다린다
+        deadline = time.monotonic() + getattr(settings, 'OBJECT_CACHE_WAIT', 0.2)
+        while time.monotonic() < deadline:
+            time.sleep(0.01)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry[0]
+
+        return loader()
+
+    async def aget_or_set(self, object_id, loader):
+        """get_or_set()의 async 버전. loader는 코루틴 함수이다."""
+        cache = self.cache
+        generation = await self._ageneration(cache, object_id)
+        key = self.make_key(object_id, generation)
+        lock_key = self._lock_key(object_id)
+        token = uuid.uuid4().hex
+
+        entry = await cache.aget(key)
+        if entry is not None:
+            payload, fresh_until = entry
+            if time.time() < fresh_until or not await cache.aadd(lock_key, token, timeout=self.lock_timeout):
+                return payload
+        elif not await cache.aadd(lock_key, token, timeout=self.lock_timeout):
+            # 다른 요청이 값을 만드는 중이면 잠시 기다린다
+            deadline = time.monotonic() + getattr(settings, 'OBJECT_CACHE_WAIT', 0.2)
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+                entry = await cache.aget(key)
+                if entry is not None:
+                    return entry[0]
+            return await loader()
+
+        try:
+            payload = await loader()
+            if await self._ageneration(cache, object_id) == generation:
+                await cache.aset(key, (payload, time.time() + self.ttl), timeout=self.ttl + self.stale_ttl)
+            return payload
+        finally:
+            if await cache.aget(lock_key) == token:
+                await cache.adelete(lock_key)
+
+    def invalidate(self, object_id):
+        cache = self.cache
+        key = self._generation_key(object_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # 세대 key가 없으면(처음이거나 밀려남) 새 세대로 시작
+            cache.set(key, self._new_generation(), timeout=None)
+
+
+post_cache = ObjectCache('post')
+comment_cache = ObjectCache('comment')
@@ -0,0 +1,192 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+
+from django.conf import settings
+
+from .background import run_in_background
+
+
+# 카테고리별 게시글 id 인덱스 (프로세스 메모리)
+# category_id -> 정렬된 post id 배열(array('q'))을 들고 있어서
+# 여러 카테고리의 AND/OR 조합을 DB 조인 없이 메모리에서 계산한다.
+# 처음 조회할 때 cat_post_linker 한 번의 쿼리로 만들어지고(lazy),
+# 이후에는 cat_post_linker save/delete 시그널로 갱신된다.
+# 워커 프로세스가 여러 개라면 다른 프로세스의 변경은 시그널로 전달되지 않으므로
+# CATEGORY_INDEX_TTL(초)이 지나면 다시 만든다.
+# 다시 만드는 일은 백그라운드 스레드에서 하고 그동안 요청은 이전 인덱스로 조회한다. (요청이 전체 테이블 읽기를 기다리지 않음)
+# 그 사이 들어온 add/remove는 기록해 두었다가 새 인덱스로 바꾼 뒤 다시 적용한다.
+class CategoryIndex:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._postings = None
+        self._built_at = 0.0
+        self._generation = 0  # invalidate()마다 증가, 그 전에 시작한 rebuild 결과는 버린다
+        self._pending = None  # 다시 만드는 중에 들어온 변경 [(add 여부, category_id, post_id)]
+
+    def _ttl(self):
+        return getattr(settings, 'CATEGORY_INDEX_TTL', 300)
+
+    def _stale(self):
+        return time.monotonic() - self._built_at >= self._ttl()
+
+    def _build(self):
+        from .models import cat_post_linker
+
+        postings = {}
+        rows = cat_post_linker.objects.values_list('category_id', 'post_id').order_by('category_id', 'post_id')
+        for category_id, post_id in rows.iterator(chunk_size=5000):
+            ids = postings.get(category_id)
+            if ids is None:
+                ids = postings[category_id] = array('q')
+            # 같은 (카테고리, 게시글) 링크가 중복 저장된 경우는 한 번만 넣는다
+            if not ids or ids[-1] != post_id:
+                ids.append(post_id)
+        return postings
+
+    def _get_postings(self):
+        postings = self._postings
+        if postings is None:
+            # 처음 한 번은 만들어질 때까지 기다린다
+            with self._rebuild_lock:
+                postings = self._postings
+                if postings is None:
+                    postings = self.rebuild()
+            return postings
+
+        self._refresh_if_stale()
+        return postings
+
+    def _refresh_if_stale(self):
+        # 오래된 인덱스: 한 스레드만 백그라운드에서 다시 만들고, 그동안은 이전 인덱스로 조회
+        if self._stale() and self._rebuild_lock.acquire(blocking=False):
+            try:
+                run_in_background(self._rebuild_and_release, 'category-index-rebuild')
+            except BaseException:
+                self._rebuild_lock.release()
+                raise
+
+    def _rebuild_and_release(self):
+        try:
+            self.rebuild()
+        finally:
+            self._rebuild_lock.release()
+
+    def rebuild(self):
+        """DB에서 다시 읽어 인덱스를 바꾸고 새 postings를 반환한다."""
+        with self._lock:
+            generation = self._generation
+            self._pending = []
+        try:
+            postings = self._build()
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+
+        with self._lock:
+            pending, self._pending = self._pending, None
+            if generation != self._generation:
+                return postings # 읽는 동안 invalidate()됨: 다음 조회 때 다시 만든다
+            for added, category_id, post_id in pending:
+                if added:
+                    self._add(postings, category_id, post_id)
+                else:
+                    self._remove(postings, category_id, post_id)
+            self._postings = postings
+            self._built_at = time.monotonic()
+        return postings
+
+    def invalidate(self):
+        with self._lock:
+            self._postings = None
+            self._generation += 1
+
+    @staticmethod
+    def _add(postings, category_id, post_id):
+        ids = postings.setdefault(category_id, array('q'))
+        pos = bisect_left(ids, post_id)
+        if pos == len(ids) or ids[pos] != post_id:
+            insort(ids, post_id)
+
+    @staticmethod
+    def _remove(postings, category_id, post_id):
+        ids = postings.get(category_id)
+        if not ids:
+            return
+        pos = bisect_left(ids, post_id)
+        if pos < len(ids) and ids[pos] == post_id:
+            del ids[pos]
+
+    def add(self, category_id, post_id):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((True, category_id, post_id))
+            if self._postings is not None:
+                self._add(self._postings, category_id, post_id)
+            # 아직 만들어지지 않았다면 다음 조회 때 새로 만든다
+
+    def remove(self, category_id, post_id, still_linked=False):
+        if still_linked:
+            return
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((False, category_id, post_id))
+            if self._postings is not None:
+                self._remove(self._postings, category_id, post_id)
+
+    def post_ids(self, category_id):
+        return self._get_postings().get(category_id, array('q'))
+
+    def cached_post_ids(self, category_id):
+        """인덱스가 이미 만들어져 있으면 DB 조회 없이 post_ids()를, 아니면 None을 반환 (async 뷰용)
+
+        TTL이 지났으면 백그라운드에서 다시 만들기 시작하고 이전 인덱스로 답한다.
+        """
+        postings = self._postings
+        if postings is None:
+            return None
+        self._refresh_if_stale()
+        return postings.get(category_id, array('q'))
+
+    def match(self, category_ids, mode='or'):
+        """카테고리 id 목록에 해당하는 post id 집합을 반환한다.
+
+        mode='and'면 모든 카테고리에 속한 게시글, 'or'면 하나라도 속한 게시글.
+        """
+        postings = self._get_postings()
+        lists = [postings.get(cid, ()) for cid in category_ids]
+        if not lists:
+            return set()
+
+        if mode == 'and':
+            # 가장 짧은 목록부터 교집합을 구해서 중간 결과를 작게 유지
+            lists.sort(key=len)
+            result = set(lists[0])
+            for ids in lists[1:]:
+                if not result:
+                    break
+                result.intersection_update(ids)
+            return result
+
+        result = set()
+        for ids in lists:
+            result.update(ids)
+        return result
+
+
+category_index = CategoryIndex()
+
+
+def id_chunks(post_ids, chunk_size=None):
+    """post id를 최신순(id 내림차순)으로 chunk_size개씩 나눈다.
+
+    카테고리 필터는 id 목록을 IN 절로 조회하므로 큰 카테고리도 DB 파라미터 수 제한을 넘지 않게 나눠서 읽는다.
+    """
+    chunk_size = chunk_size or getattr(settings, 'CATEGORY_FILTER_CHUNK_SIZE', 500)
+    ids = sorted(post_ids, reverse=True)
+    for start in range(0, len(ids), chunk_size):
+        yield ids[start:start + chunk_size]
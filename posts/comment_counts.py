@@ -0,0 +1,40 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Post, Comment
+
+
+# Post.comment_count 비정규화 카운터 관리
+# 댓글을 세지 않고 F() 기반 UPDATE 한 번으로 증감하기 때문에 동시 작성에도 값이 꼬이지 않는다.
+
+def change_comment_count(post_id, delta):
+    if delta > 0:
+        Post.objects.filter(pk=post_id).update(comment_count=F('comment_count') + delta)
+    elif delta < 0:
+        # 어긋난 값 때문에 음수가 되지 않도록 0에서 멈춘다
+        Post.objects.filter(pk=post_id).update(comment_count=Greatest(F('comment_count') + delta, Value(0)))
+
+
+def add_comment_counts(counts):
+    """{post_id: 추가된 댓글 수}를 반영한다 (일괄 작성용, 게시글마다 UPDATE 1번)."""
+    for post_id, delta in counts.items():
+        change_comment_count(post_id, delta)
+
+
+def actual_comment_count():
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(n=Count('c_id'))
+            .values('n'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def drifted_posts():
+    """저장된 comment_count와 실제 댓글 수가 다른 게시글"""
+    return Post.objects.annotate(actual=actual_comment_count()).exclude(comment_count=F('actual'))
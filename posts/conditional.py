@@ -0,0 +1,66 @@
+from django.db.models import Count, Max
+
+from .models import Post, Comment
+
+
+# 조건부 GET(ETag / Last-Modified / 304)용 검증값 계산
+# 직렬화 없이 updated 컬럼만 읽는 가벼운 쿼리로 만든다.
+# condition 데코레이터가 etag_func, last_modified_func를 따로 부르기 때문에
+# 요청 객체에 결과를 저장해서 쿼리는 한 번만 실행한다.
+
+def _memoize(request, name, compute):
+    cached = getattr(request, '_conditional_cache', None)
+    if cached is None:
+        cached = request._conditional_cache = {}
+    if name not in cached:
+        cached[name] = compute()
+    return cached[name]
+
+
+def _timestamp(value):
+    return int(value.timestamp() * 1_000_000)
+
+
+# 게시글 단건: updated 기준 (댓글 수는 updated를 바꾸지 않으므로 ETag에 함께 넣는다)
+def _post_validators(request, post_id):
+    def compute():
+        row = Post.objects.filter(id=post_id).values_list('updated', 'comment_count').first()
+        if row is None:
+            return None, None
+        updated, comment_count = row
+        return f'post-{post_id}-{_timestamp(updated)}-{comment_count}', updated
+    return _memoize(request, f'post:{post_id}', compute)
+
+
+def post_etag(request, post_id, *args, **kwargs):
+    return _post_validators(request, post_id)[0]
+
+
+def post_last_modified(request, post_id, *args, **kwargs):
+    return _post_validators(request, post_id)[1]
+
+
+# 게시글의 댓글 목록: 게시글(제목, 댓글 수가 응답에 들어감) + 댓글 max(updated) + 개수 기준
+# (삭제도 개수 변화로 감지, 댓글이 없는 글도 게시글 updated로 검증값을 만든다)
+def _post_comments_validators(request, post_id):
+    def compute():
+        row = Post.objects.filter(id=post_id).values_list('updated', 'comment_count').first()
+        if row is None:
+            return None, None
+        post_updated, comment_count = row
+        result = Comment.objects.filter(post_id=post_id).aggregate(last=Max('updated'), count=Count('c_id'))
+        last = max(post_updated, result['last']) if result['last'] is not None else post_updated
+        etag = (
+            f'comments-{post_id}-{_timestamp(post_updated)}-{comment_count}'
+            f'-{result["count"]}-{_timestamp(last)}'
+        )
+        return etag, last
+    return _memoize(request, f'comments:{post_id}', compute)
+
+
+def post_comments_etag(request, post_id, *args, **kwargs):
+    return _post_comments_validators(request, post_id)[0]
+
+
+def post_comments_last_modified(request, post_id, *args, **kwargs):
+    return _post_comments_validators(request, post_id)[1]
@@ -0,0 +1,53 @@
+from django.conf import settings
+
+from taskqueue.registry import enqueue
+
+from .models import ImageVariant
+from .storage import object_url
+
+
+# 업로드된 이미지의 파생본(IMAGE_VARIANT_WIDTHS x IMAGE_VARIANT_FORMATS) 생성
+# 리사이즈/인코딩은 CPU를 많이 쓰므로 요청에서 하지 않고 작업 큐(posts.tasks.generate_image_variants)에 넣는다.
+# run_tasks 워커(프로세스 풀)가 posts/imaging.py로 파생본을 만들고, 결과를 ImageVariant 행으로 저장한다.
+
+
+def _s3_options():
+    return {
+        'aws_access_key_id': settings.AWS_ACCESS_KEY_ID,
+        'aws_secret_access_key': settings.AWS_SECRET_ACCESS_KEY,
+        'region_name': settings.AWS_REGION,
+        'endpoint_url': getattr(settings, 'AWS_S3_ENDPOINT_URL', None),
+    }
+
+
+def variant_job(key):
+    """render_variants에 넘길 인자 (settings의 S3/파생본 설정)"""
+    return (
+        _s3_options(),
+        settings.AWS_STORAGE_BUCKET_NAME,
+        key,
+        tuple(getattr(settings, 'IMAGE_VARIANT_WIDTHS', (320, 800, 1600))),
+        tuple(getattr(settings, 'IMAGE_VARIANT_FORMATS', ('webp', 'jpeg'))),
+        dict(getattr(settings, 'IMAGE_VARIANT_QUALITY', {'webp': 80, 'jpeg': 85})),
+    )
+
+
+def save_variants(image_id, variants):
+    ImageVariant.objects.bulk_create(
+        [
+            ImageVariant(
+                image_id=image_id, width=v['width'], height=v['height'], format=v['format'],
+                image_url=object_url(v['key']), size=v['size'],
+            )
+            for v in variants
+        ],
+        ignore_conflicts=True, # 같은 이미지를 다시 처리해도 중복 행을 만들지 않는다
+    )
+
+
+def schedule_image_variants(image_id, key):
+    """파생본 생성 작업을 넣는다. (기다리지 않음)
+
+    Image를 만든 트랜잭션 안에서 호출하면 롤백될 때 작업도 같이 사라진다.
+    """
+    return enqueue('posts.generate_image_variants', (image_id, key))
@@ -0,0 +1,80 @@
+import io
+import os
+
+import boto3
+from PIL import Image as PILImage, ImageOps
+
+
+# 이미지 파생본(썸네일 등) 생성 - 워커 프로세스에서 실행되는 부분
+# spawn으로 시작한 자식 프로세스에서 import되므로 Django 설정/모델에 의존하지 않는다.
+# 원본을 S3에서 받아 너비별/포맷별로 줄인 뒤 원본 옆(같은 prefix)에 올리고, 만든 파생본 정보를 돌려준다.
+
+EXTENSIONS = {'jpeg': 'jpg', 'webp': 'webp'}
+CONTENT_TYPES = {'jpeg': 'image/jpeg', 'webp': 'image/webp'}
+
+_clients = {}
+
+
+def _client(s3_options):
+    # 워커 프로세스마다 클라이언트 하나를 만들어 재사용
+    key = tuple(sorted(s3_options.items()))
+    if key not in _clients:
+        _clients[key] = boto3.session.Session(
+            aws_access_key_id=s3_options.get('aws_access_key_id'),
+            aws_secret_access_key=s3_options.get('aws_secret_access_key'),
+            region_name=s3_options.get('region_name'),
+        ).client('s3', endpoint_url=s3_options.get('endpoint_url'))
+    return _clients[key]
+
+
+def variant_key(key, width, fmt):
+    """uploads/cat_<uuid>.png -> uploads/cat_<uuid>_320w.webp"""
+    stem, _ = os.path.splitext(key)
+    return f"{stem}_{width}w.{EXTENSIONS[fmt]}"
+
+
+def _encode(img, fmt, quality):
+    if fmt == 'jpeg' and img.mode != 'RGB':
+        # JPEG는 투명도가 없으므로 흰 배경에 합성
+        background = PILImage.new('RGB', img.size, (255, 255, 255))
+        rgba = img.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        img = background
+    buffer = io.BytesIO()
+    if fmt == 'jpeg':
+        img.save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+    else:
+        img.save(buffer, 'WEBP', quality=quality, method=4)
+    return buffer.getvalue()
+
+
+def render_variants(s3_options, bucket, key, widths, formats, quality):
+    """원본(bucket/key)의 파생본을 만들어 올리고 [{'width', 'height', 'format', 'key', 'size'}]를 돌려준다.
+
+    원본보다 넓은 크기로는 늘리지 않는다.
+    """
+    client = _client(s3_options)
+    original = client.get_object(Bucket=bucket, Key=key)['Body'].read()
+
+    with PILImage.open(io.BytesIO(original)) as source:
+        # JPEG는 필요한 가장 큰 크기에 맞춰 디코딩 단계에서 줄여 읽는다
+        source.draft('RGB', (max(widths), max(widths)))
+        source = ImageOps.exif_transpose(source)
+        if source.mode not in ('RGB', 'RGBA'):
+            source = source.convert('RGBA' if 'transparency' in source.info or source.mode in ('LA', 'PA') else 'RGB')
+
+        variants = []
+        for width in sorted(widths, reverse=True):
+            if width >= source.width:
+                continue
+            height = max(1, round(source.height * width / source.width))
+            resized = source.resize((width, height), PILImage.Resampling.LANCZOS)
+            for fmt in formats:
+                body = _encode(resized, fmt, quality.get(fmt, 85))
+                target = variant_key(key, width, fmt)
+                client.put_object(
+                    Bucket=bucket, Key=target, Body=body, ContentType=CONTENT_TYPES[fmt],
+                    CacheControl='max-age=31536000, immutable',
+                )
+                variants.append({'width': width, 'height': height, 'format': fmt, 'key': target, 'size': len(body)})
+    return variants
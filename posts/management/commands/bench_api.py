@@ -0,0 +1,263 @@
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from accounts.models import User
+from posts.category_index import category_index
+from posts.models import Post, Comment, Category, cat_post_linker
+
+BENCH_PASSWORD = 'bench-password-1234'
+
+
+def latency_summary(latencies):
+    """지연 시간(초) 목록의 p50/p95/p99/평균(ms)"""
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+    return {
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'p99_ms': round(p99 * 1000, 3),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "테스트 DB에 여러 규모의 데이터를 만들고 주요 API의 지연 시간(p50/p95/p99), 처리량, 요청당 쿼리 수를 측정합니다. "
+        "SQLite로 돌리려면 --settings=config.bench_settings 를 사용하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='1000,10000', help="쉼표로 구분한 게시글 개수 (작은 것부터 차례로 추가 생성)")
+        parser.add_argument('--comments-per-post', type=int, default=5)
+        parser.add_argument('--categories', type=int, default=50)
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=200, help="엔드포인트별 측정 요청 수")
+        parser.add_argument('--login-requests', type=int, default=20, help="로그인은 비밀번호 해시 비용이 커서 따로 지정")
+        parser.add_argument('--warmup', type=int, default=10, help="측정 전에 버리는 요청 수")
+        parser.add_argument('--seed', type=int, default=13, help="요청 대상(id 등)을 고르는 난수 시드")
+        parser.add_argument('--endpoints', help="쉼표로 구분한 엔드포인트 이름 (기본: 전체)")
+        parser.add_argument('--output', help="결과를 저장할 JSON 파일 경로")
+        parser.add_argument('--compare', help="이전 결과 JSON과 비교해서 변화량을 출력")
+
+    def handle(self, *args, **options):
+        try:
+            scales = sorted(int(scale) for scale in options['scales'].split(','))
+        except ValueError:
+            raise CommandError("--scales는 쉼표로 구분한 정수여야 합니다.")
+
+        endpoints = self.endpoints()
+        if options['endpoints']:
+            names = options['endpoints'].split(',')
+            unknown = set(names) - set(endpoints)
+            if unknown:
+                raise CommandError(f"알 수 없는 엔드포인트: {', '.join(sorted(unknown))} (가능: {', '.join(endpoints)})")
+            endpoints = {name: endpoints[name] for name in names}
+
+        # 실제 DB를 건드리지 않도록 테스트 DB를 새로 만들고, 끝나면 지운다
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            # 접근 시간 제한(22:00~07:00)은 측정 시각에 따라 결과가 달라지므로 벤치마크 중에는 항상 허용
+            # 같은 클라이언트로 반복 요청하므로 요청 제한(RATE_LIMITS)도 끈다
+            with mock.patch('accounts.permissions.IsAllowedTime.has_permission', return_value=True), \
+                    override_settings(RATE_LIMITS={}):
+                results = self._run(scales, endpoints, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {'meta': self._meta(options), 'results': results}
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+                f.write('\n')
+            self.stdout.write(f"결과 저장: {options['output']}")
+        if options['compare']:
+            self._compare(options['compare'], results)
+
+    # 측정할 엔드포인트: 이름 -> (method, 요청 생성 함수)
+    # 요청 생성 함수는 (rng, data)를 받아 (path, body)를 돌려준다
+    @staticmethod
+    def endpoints():
+        return {
+            'post_list': ('get', lambda rng, data: ('/post/', None)),
+            'post_detail': ('get', lambda rng, data: (f'/post/{rng.choice(data["post_ids"])}/', None)),
+            'post_comment_list': ('get', lambda rng, data: (f'/post/{rng.choice(data["post_ids"])}/comments/', None)),
+            'comment_list': ('get', lambda rng, data: ('/post/comments/', None)),
+            'filter_post_by_category': ('get', lambda rng, data: (f'/post/filter/{rng.choice(data["category_ids"])}/', None)),
+            'auth_login': ('post', lambda rng, data: (
+                '/account/login/', {'username': rng.choice(data['usernames']), 'password': BENCH_PASSWORD}
+            )),
+        }
+
+    def _run(self, scales, endpoints, options):
+        data = self._seed_base(options)
+        results = []
+        created = 0
+        for scale in scales:
+            self._seed_posts(data, created, scale, options)
+            created = scale
+            self._reset_caches()
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"scale={scale} (posts={scale}, comments={scale * options['comments_per_post']})"
+            ))
+
+            for name, (method, make_request) in endpoints.items():
+                count = options['login_requests'] if name == 'auth_login' else options['requests']
+                result = self._measure(name, method, make_request, data, count, options)
+                result['scale'] = scale
+                results.append(result)
+                self.stdout.write(
+                    f"  {name:<24} p50={result['p50_ms']:8.2f}ms p95={result['p95_ms']:8.2f}ms "
+                    f"p99={result['p99_ms']:8.2f}ms rps={result['rps']:8.1f} "
+                    f"queries={result['queries_per_request']:5.1f} errors={result['errors']}"
+                )
+        return results
+
+    def _seed_base(self, options):
+        password = make_password(BENCH_PASSWORD) # 해시는 한 번만 계산해서 모든 사용자에 재사용
+        User.objects.bulk_create(
+            User(username=f'bench-user-{i}', email=f'bench-user-{i}@example.com', password=password)
+            for i in range(options['users'])
+        )
+        Category.objects.bulk_create(Category(cat_name=f'bench-cat-{i}') for i in range(options['categories']))
+        return {
+            'user_ids': list(User.objects.values_list('id', flat=True)),
+            'usernames': list(User.objects.values_list('username', flat=True)),
+            'category_ids': list(Category.objects.values_list('cat_id', flat=True)),
+            'post_ids': [],
+        }
+
+    def _seed_posts(self, data, start, end, options):
+        # 시그널을 거치지 않도록 bulk_create로 만들고, 파생 값(comment_count, 카테고리 인덱스)은 직접 맞춘다
+        rng = random.Random(options['seed'] + end)
+        per_post = options['comments_per_post']
+        user_ids = data['user_ids']
+        Post.objects.bulk_create(
+            (Post(title=f'bench-{i}', content=f'벤치마크 게시글 본문 {i} ' * 5, user_id=user_ids[i % len(user_ids)],
+                  comment_count=per_post)
+             for i in range(start, end)),
+            batch_size=1000,
+        )
+        new_ids = list(Post.objects.filter(id__gt=max(data['post_ids'], default=0)).values_list('id', flat=True))
+
+        Comment.objects.bulk_create(
+            (Comment(post_id=post_id, author=f'bench-{n}', body='벤치마크 댓글입니다. ' * 3)
+             for post_id in new_ids for n in range(per_post)),
+            batch_size=1000,
+        )
+        cat_post_linker.objects.bulk_create(
+            (cat_post_linker(post_id=post_id, category_id=rng.choice(data['category_ids'])) for post_id in new_ids),
+            batch_size=1000,
+        )
+        data['post_ids'].extend(new_ids)
+
+    @staticmethod
+    def _reset_caches():
+        category_index.invalidate()
+        for alias in settings.CACHES:
+            caches[alias].clear()
+
+    def _measure(self, name, method, make_request, data, count, options):
+        client = Client()
+        rng = random.Random(options['seed'])
+        queries = [0]
+
+        def count_queries(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        def send():
+            path, body = make_request(rng, data)
+            if method == 'post':
+                return client.post(path, body, content_type='application/json')
+            return client.get(path)
+
+        for _ in range(options['warmup']):
+            send()
+
+        latencies, query_counts, errors = [], [], 0
+        with connection.execute_wrapper(count_queries):
+            for _ in range(count):
+                queries[0] = 0
+                start = time.perf_counter()
+                response = send()
+                if getattr(response, 'streaming', False):
+                    b''.join(response.streaming_content)
+                latencies.append(time.perf_counter() - start)
+                query_counts.append(queries[0])
+                if response.status_code >= 400:
+                    errors += 1
+
+        return {
+            'endpoint': name,
+            'requests': count,
+            'errors': errors,
+            **latency_summary(latencies),
+            'rps': round(len(latencies) / sum(latencies), 1),
+            'queries_per_request': round(statistics.fmean(query_counts), 2),
+        }
+
+    @staticmethod
+    def _git_commit():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def _meta(self, options):
+        return {
+            'commit': self._git_commit(),
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'options': {
+                key: options[key] for key in (
+                    'scales', 'comments_per_post', 'categories', 'users', 'requests', 'login_requests', 'warmup', 'seed',
+                )
+            },
+        }
+
+    def _compare(self, path, results):
+        try:
+            with open(path, encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"비교할 결과 파일을 읽을 수 없습니다: {e}")
+
+        previous = {(r['scale'], r['endpoint']): r for r in baseline.get('results', [])}
+        self.stdout.write(self.style.MIGRATE_HEADING(f"비교 기준: {path} (commit {baseline.get('meta', {}).get('commit')})"))
+        for result in results:
+            before = previous.get((result['scale'], result['endpoint']))
+            if before is None:
+                continue
+            changes = []
+            for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+                change = (result[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+                changes.append(f"{key[:3]} {change:+6.1f}%")
+            query_change = result['queries_per_request'] - before['queries_per_request']
+            self.stdout.write(
+                f"  scale={result['scale']:<7} {result['endpoint']:<24} {'  '.join(changes)}  queries {query_change:+.1f}"
+            )
@@ -0,0 +1,84 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import User
+from posts.fast_serializers import post_fast, comment_fast
+from posts.models import Post, Comment
+from posts.serializers import PostSerializer, CommentSerializer
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "기존 시리얼라이저와 빠른 직렬화(values_list 기반)의 목록 직렬화 속도를 비교합니다. (데이터는 롤백됨)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,100000', help="쉼표로 구분한 행 개수")
+        parser.add_argument('--repeat', type=int, default=3, help="각 측정을 반복해서 가장 빠른 값을 사용")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted(int(size) for size in options['sizes'].split(','))
+        except ValueError:
+            raise CommandError("--sizes는 쉼표로 구분한 정수여야 합니다.")
+
+        # 측정용 데이터는 트랜잭션 안에서 만들고 마지막에 롤백한다
+        try:
+            with transaction.atomic():
+                self._run(sizes, options['repeat'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _run(self, sizes, repeat):
+        user = User.objects.create(username='bench-serializers')
+        created = 0
+        for size in sizes:
+            self._seed(user, created, size)
+            created = size
+
+            posts = Post.objects.filter(user=user).order_by('-created', '-id')
+            comments = Comment.objects.filter(post__user=user).order_by('-writen_time', '-c_id')
+            self._compare('Post', size, repeat,
+                          lambda: PostSerializer(posts, many=True).data,
+                          lambda: post_fast.to_representation(post_fast.values(posts)))
+            self._compare('Comment', size, repeat,
+                          lambda: CommentSerializer(comments, many=True).data,
+                          lambda: comment_fast.to_representation(comment_fast.values(comments)))
+
+    def _seed(self, user, start, end):
+        Post.objects.bulk_create(
+            (Post(title=f'bench-{i}', content=f'벤치마크 본문 {i}', user=user) for i in range(start, end)),
+            batch_size=1000,
+        )
+        post_ids = Post.objects.filter(user=user, title__startswith='bench-').values_list('id', flat=True)
+        existing = set(Comment.objects.filter(post__user=user).values_list('post_id', flat=True))
+        Comment.objects.bulk_create(
+            (Comment(post_id=post_id, author='bench', body='벤치마크 댓글입니다.' * 2)
+             for post_id in post_ids.iterator(chunk_size=1000) if post_id not in existing),
+            batch_size=1000,
+        )
+
+    def _time(self, func, repeat):
+        best, data = None, None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, data
+
+    def _compare(self, label, size, repeat, drf, fast):
+        drf_time, drf_data = self._time(drf, repeat)
+        fast_time, fast_data = self._time(fast, repeat)
+
+        renderer = JSONRenderer()
+        same = renderer.render(drf_data) == renderer.render(fast_data)
+        line = (f"{label:<8} rows={size:<7} drf={drf_time * 1000:9.1f}ms fast={fast_time * 1000:8.1f}ms "
+                f"x{drf_time / fast_time:5.1f}  identical={same}")
+        self.stdout.write(self.style.SUCCESS(line) if same else self.style.ERROR(line))
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from .bench_api import latency_summary
+
+
+class Command(BaseCommand):
+    help = (
+        "실행 중인 서버에 동시 연결(keep-alive)로 GET 요청을 보내 처리량과 지연 시간을 측정합니다. "
+        "WSGI와 ASGI 비교 예) "
+        "gunicorn config.wsgi -w 4 --threads 8 -b :8000 / uvicorn config.asgi:application --workers 4 --port 8001 를 띄운 뒤 "
+        "loadtest --url http://127.0.0.1:8000/post/ --label wsgi, "
+        "loadtest --url http://127.0.0.1:8001/post/async/ --label asgi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', required=True, action='append', help="요청할 URL (여러 번 지정 가능, 돌아가며 요청)")
+        parser.add_argument('--concurrency', default='100,1000', help="쉼표로 구분한 동시 연결 수")
+        parser.add_argument('--duration', type=float, default=10.0, help="동시 연결 수마다 측정할 시간(초)")
+        parser.add_argument('--timeout', type=float, default=30.0, help="요청 하나의 최대 대기 시간(초)")
+        parser.add_argument('--label', default='', help="결과에 붙일 이름 (예: wsgi, asgi)")
+        parser.add_argument('--output', help="결과를 저장할 JSON 파일 경로")
+
+    def handle(self, *args, **options):
+        targets = []
+        for url in options['url']:
+            parts = urlsplit(url)
+            if parts.scheme != 'http' or not parts.hostname:
+                raise CommandError(f"http:// URL만 지원합니다: {url}")
+            path = parts.path or '/'
+            if parts.query:
+                path += f'?{parts.query}'
+            targets.append((parts.hostname, parts.port or 80, path))
+        try:
+            levels = [int(level) for level in options['concurrency'].split(',')]
+        except ValueError:
+            raise CommandError("--concurrency는 쉼표로 구분한 정수여야 합니다.")
+
+        results = []
+        for concurrency in levels:
+            result = asyncio.run(self._run(targets, concurrency, options['duration'], options['timeout']))
+            result.update({'label': options['label'], 'concurrency': concurrency, 'urls': options['url']})
+            results.append(result)
+            if result['requests']:
+                self.stdout.write(
+                    f"{options['label'] or '-':<6} c={concurrency:<5} requests={result['requests']:<7} "
+                    f"rps={result['rps']:8.1f} p50={result['p50_ms']:8.2f}ms p95={result['p95_ms']:8.2f}ms "
+                    f"p99={result['p99_ms']:8.2f}ms errors={result['errors']}"
+                )
+            else:
+                self.stdout.write(self.style.ERROR(f"c={concurrency}: 성공한 요청이 없습니다. (errors={result['errors']})"))
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2, sort_keys=True)
+                f.write('\n')
+            self.stdout.write(f"결과 저장: {options['output']}")
+
+    async def _run(self, targets, concurrency, duration, timeout):
+        deadline = time.monotonic() + duration
+        latencies = []
+        errors = [0]
+
+        async def worker(index):
+            conn = None
+            n = index
+            while time.monotonic() < deadline:
+                host, port, path = targets[n % len(targets)]
+                n += 1
+                start = time.perf_counter()
+                try:
+                    if conn is None:
+                        conn = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+                    status, keep_alive = await asyncio.wait_for(self._request(conn, host, port, path), timeout)
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                    errors[0] += 1
+                    conn = await self._close(conn)
+                    continue
+                latencies.append(time.perf_counter() - start)
+                if status >= 400:
+                    errors[0] += 1
+                if not keep_alive:
+                    conn = await self._close(conn)
+            await self._close(conn)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        result = {'requests': len(latencies), 'errors': errors[0], 'seconds': round(elapsed, 2)}
+        if latencies:
+            result.update(latency_summary(latencies))
+            result['rps'] = round(len(latencies) / elapsed, 1)
+        return result
+
+    @staticmethod
+    async def _request(conn, host, port, path):
+        """HTTP/1.1 keep-alive GET 한 번. (상태 코드, 연결 재사용 가능 여부)를 돌려준다."""
+        reader, writer = conn
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nAccept: application/json\r\n"
+            f"Connection: keep-alive\r\n\r\n".encode('latin-1')
+        )
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise asyncio.IncompleteReadError(b'', None)
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif 'content-length' in headers:
+            await reader.readexactly(int(headers['content-length']))
+        else:
+            await reader.read()
+            return status, False
+
+        return status, headers.get('connection', '').lower() != 'close'
+
+    @staticmethod
+    async def _close(conn):
+        if conn is not None:
+            writer = conn[1]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        return None
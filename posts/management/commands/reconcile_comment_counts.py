@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.cache import post_cache
+from posts.comment_counts import drifted_posts
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = "Post.comment_count를 실제 댓글 수와 비교해서 어긋난 값을 바로잡습니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="수정하지 않고 어긋난 게시글만 출력")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        fixed = 0
+        batch = []
+
+        for post in drifted_posts().only('id', 'comment_count').iterator(chunk_size=options['batch_size']):
+            if options['dry_run']:
+                self.stdout.write(f"post {post.id}: {post.comment_count} -> {post.actual}")
+            else:
+                batch.append((post.id, post.actual))
+                if len(batch) >= options['batch_size']:
+                    self._apply(batch)
+                    batch = []
+            fixed += 1
+
+        if batch:
+            self._apply(batch)
+
+        verb = "어긋난 게시글" if options['dry_run'] else "수정한 게시글"
+        self.stdout.write(self.style.SUCCESS(f"{verb}: {fixed}개"))
+
+    def _apply(self, batch):
+        with transaction.atomic():
+            for post_id, actual in batch:
+                Post.objects.filter(pk=post_id).update(comment_count=actual)
+        for post_id, _ in batch:
+            post_cache.invalidate(post_id)
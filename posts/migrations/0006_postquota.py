@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:13
+
+import django.db.models.deletion
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+
+# 배포 당일 이미 작성된 게시글도 제한에 반영되도록 오늘 구간의 카운터를 채운다
+def backfill_today_quota(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    PostQuota = apps.get_model('posts', 'PostQuota')
+
+    window = getattr(settings, 'DAILY_POST_WINDOW', timedelta(days=1)).total_seconds()
+    now = timezone.now()
+    window_start = now - timedelta(seconds=now.timestamp() % window)
+
+    rows = (
+        Post.objects.filter(created__gte=window_start)
+        .values('user_id')
+        .annotate(count=Count('id'))
+    )
+    PostQuota.objects.bulk_create([
+        PostQuota(user_id=row['user_id'], window_start=window_start, count=row['count'])
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_post_comment_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostQuota',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('window_start', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='post_quota', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'window_start'), name='post_quota_user_window_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_today_quota, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:13
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+# unique 인덱스를 만들기 전에 중복 제목을 정리한다
+# 가장 먼저 작성된 게시글은 제목을 유지하고, 나머지는 "제목-id" 형태로 바꾼다 (삭제하지 않음)
+# 바꾼 제목이 이미 있으면 "제목-id-2", "제목-id-3" ... 처럼 빈 제목이 나올 때까지 번호를 붙인다
+# 중복 그룹만 GROUP BY로 찾아서 처리하므로 큰 테이블에서도 중복 행만 갱신한다
+def deduplicate_titles(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    max_length = Post._meta.get_field('title').max_length
+
+    duplicates = (
+        Post.objects.values('title')
+        .annotate(n=Count('id'), keep_id=Min('id'))
+        .filter(n__gt=1)
+        .order_by()
+    )
+
+    for group in duplicates.iterator(chunk_size=500):
+        rows = Post.objects.filter(title=group['title']).exclude(id=group['keep_id']).only('id', 'title')
+        for post in rows:
+            n = 1
+            while True:
+                suffix = f"-{post.id}" if n == 1 else f"-{post.id}-{n}"
+                new_title = f"{post.title[:max_length - len(suffix)]}{suffix}"
+                if not Post.objects.filter(title=new_title).exists():
+                    break
+                n += 1
+            Post.objects.filter(id=post.id).update(title=new_title)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_postquota'),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicate_titles, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='post',
+            name='title',
+            field=models.CharField(max_length=30, unique=True),
+        ),
+    ]
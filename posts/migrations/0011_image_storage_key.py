@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:02
+
+from django.db import migrations, models
+
+
+def fill_storage_key(apps, schema_editor):
+    # 기존 이미지는 URL의 uploads/... 부분이 key. 같은 URL이 여러 번 저장된 경우 가장 먼저 만든 행만 key를 갖는다
+    Image = apps.get_model('posts', 'Image')
+    seen = set()
+    for image in Image.objects.order_by('id').only('id', 'image_url'):
+        _, sep, rest = image.image_url.partition('/uploads/')
+        key = f'uploads/{rest}' if sep else None
+        if key is None or key in seen:
+            continue
+        seen.add(key)
+        Image.objects.filter(pk=image.pk).update(storage_key=key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_image_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='storage_key',
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True, unique=True),
+        ),
+        migrations.RunPython(fill_storage_key, migrations.RunPython.noop),
+    ]
@@ -19,10 +19,18 @@ class Post(BaseModel): # BaseModel을 상속받음
     )
 
     id = models.AutoField(primary_key=True)
-    title = models.CharField(max_length=30)
+    title = models.CharField(max_length=30, unique=True) # 제목 중복은 DB unique 인덱스로 막는다
     content = models.TextField()
     status = models.CharField(max_length=15, choices=CHOICES, default='STORED')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='post')
+    # 댓글 수 (댓글 생성/삭제 시그널에서 F()로 갱신, 어긋나면 reconcile_comment_counts 명령으로 맞춘다)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # 커서 페이지네이션(created, id 내림차순)용 인덱스
+            models.Index(fields=['-created', '-id'], name='post_created_id_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -35,6 +43,14 @@ class Comment(BaseModel): # 댓글 기능, 댓글 사용자의 id는 따로 입
     writen_time = models.DateTimeField(auto_now_add = True)
     modified_time = models.DateTimeField(auto_now = True)
 
+    class Meta:
+        indexes = [
+            # 커서 페이지네이션(writen_time, c_id 내림차순)용 인덱스
+            models.Index(fields=['-writen_time', '-c_id'], name='comment_time_id_idx'),
+            # 게시글별 댓글 목록 최신순 조회용 인덱스
+            models.Index(fields=['post', '-writen_time', '-c_id'], name='comment_post_time_id_idx'),
+        ]
+
     def __str__(self):
         return self.body
     
@@ -55,6 +71,48 @@ class cat_post_linker(BaseModel):
 class Image(BaseModel):
     id = models.AutoField(primary_key=True)
     image_url = models.URLField(max_length=500)  # S3에 업로드된 이미지의 URL 저장
+    # 파일 내용의 SHA-256. 같은 파일을 다시 올리면 업로드/저장 없이 기존 이미지를 돌려준다 (presigned 업로드는 complete 때 계산)
+    content_hash = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
+    # S3 key. 같은 key로 complete를 여러 번(동시에) 호출해도 Image는 하나만 만들어진다
+    storage_key = models.CharField(max_length=255, unique=True, null=True, blank=True, editable=False)
+
+    def __str__(self):
+        return f"Image {self.id}"
+
+# 업로드된 이미지의 크기/포맷별 파생본 (posts/derivatives.py의 워커 프로세스가 만든다)
+class ImageVariant(BaseModel):
+
+    FORMATS = (
+        ('webp', 'WebP'),
+        ('jpeg', 'JPEG'),
+    )
+
+    image = models.ForeignKey(Image, on_delete=models.CASCADE, related_name='variants')
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    format = models.CharField(max_length=10, choices=FORMATS)
+    image_url = models.URLField(max_length=500)
+    size = models.PositiveIntegerField() # 파일 크기(바이트)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['image', 'width', 'format'], name='image_variant_uniq'),
+        ]
+
+    def __str__(self):
+        return f"Image {self.image_id} {self.width}w {self.format}"
+
+# 사용자별 게시글 작성 횟수 카운터 (일일 작성 제한용)
+# window_start는 제한 구간(기본 하루)의 시작 시각
+class PostQuota(BaseModel):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='post_quota')
+    window_start = models.DateTimeField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'window_start'], name='post_quota_user_window_uniq'),
+        ]
 
     def __str__(self):
-        return f"Image {self.id}"
\ No newline at end of file
+        return f"{self.user} - {self.window_start:%Y-%m-%d %H:%M} ({self.count})"
\ No newline at end of file
@@ -0,0 +1,131 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from config.custom_api_exceptions import InvalidCursorException
+
+
+# 커서 기반(keyset) 페이지네이션
+# OFFSET을 쓰지 않고 (정렬 키, pk) 쌍으로 다음 페이지의 시작점을 찾기 때문에
+# N번째 페이지도 첫 페이지와 같은 비용(인덱스 range scan 한 번)으로 조회된다.
+# 정렬은 항상 최신순(내림차순)이며, 같은 시각에 생성된 행은 pk로 순서를 고정한다.
+class KeysetPaginator:
+
+    def __init__(self, queryset, time_field, pk_field, default_page_size=None, max_page_size=None, columns=None):
+        self.queryset = queryset
+        self.time_field = time_field
+        self.pk_field = pk_field
+        # values_list() 쿼리셋이면 튜플에서 키를 꺼낼 수 있도록 컬럼 순서를 받는다
+        self.columns = columns
+        self.default_page_size = default_page_size or getattr(settings, 'PAGINATION_PAGE_SIZE', 20)
+        self.max_page_size = max_page_size or getattr(settings, 'PAGINATION_MAX_PAGE_SIZE', 100)
+
+    # 커서는 {"t": 정렬 시각, "k": pk, "d": 방향}을 base64로 감싼 불투명한 문자열
+    @staticmethod
+    def encode_cursor(time_value, pk_value, direction):
+        raw = json.dumps({'t': time_value.isoformat(), 'k': pk_value, 'd': direction}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            time_value = parse_datetime(payload['t'])
+            pk_value = int(payload['k'])
+            direction = payload['d']
+        except (ValueError, KeyError, TypeError, UnicodeError):
+            raise InvalidCursorException()
+
+        if time_value is None or direction not in ('next', 'prev'):
+            raise InvalidCursorException()
+        return time_value, pk_value, direction
+
+    @staticmethod
+    def _params(request):
+        # DRF Request는 query_params, async 뷰의 HttpRequest는 GET
+        return getattr(request, 'query_params', request.GET)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(self._params(request).get('page_size', self.default_page_size))
+        except (TypeError, ValueError):
+            page_size = self.default_page_size
+
+        return max(1, min(page_size, self.max_page_size))
+
+    def _key(self, row, field):
+        # 모델 인스턴스, values() dict, values_list() 튜플 모두 지원
+        if isinstance(row, dict):
+            return row[field]
+        if isinstance(row, tuple):
+            return row[self.columns.index(field)]
+        return getattr(row, field)
+
+    def _page_queryset(self, request):
+        page_size = self.get_page_size(request)
+        cursor = self._params(request).get('cursor')
+
+        t, k = self.time_field, self.pk_field
+        queryset = self.queryset
+        direction = 'next'
+
+        if cursor:
+            time_value, pk_value, direction = self.decode_cursor(cursor)
+            if direction == 'next':
+                # 커서보다 오래된 행
+                queryset = queryset.filter(
+                    Q(**{f'{t}__lt': time_value}) | Q(**{t: time_value, f'{k}__lt': pk_value})
+                )
+            else:
+                # 커서보다 최신인 행
+                queryset = queryset.filter(
+                    Q(**{f'{t}__gt': time_value}) | Q(**{t: time_value, f'{k}__gt': pk_value})
+                )
+
+        if direction == 'next':
+            queryset = queryset.order_by(f'-{t}', f'-{k}')
+        else:
+            queryset = queryset.order_by(t, k)
+
+        # 한 개를 더 읽어서 다음 페이지가 있는지 판단 (COUNT 쿼리 불필요)
+        return queryset[:page_size + 1], page_size, cursor, direction
+
+    def _page(self, rows, page_size, cursor, direction):
+        t, k = self.time_field, self.pk_field
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if direction == 'prev':
+            rows.reverse()
+
+        next_cursor = prev_cursor = None
+        if rows:
+            first, last = rows[0], rows[-1]
+            if direction == 'next':
+                if has_more:
+                    next_cursor = self.encode_cursor(self._key(last, t), self._key(last, k), 'next')
+                if cursor:
+                    prev_cursor = self.encode_cursor(self._key(first, t), self._key(first, k), 'prev')
+            else:
+                if has_more:
+                    prev_cursor = self.encode_cursor(self._key(first, t), self._key(first, k), 'prev')
+                next_cursor = self.encode_cursor(self._key(last, t), self._key(last, k), 'next')
+
+        return rows, next_cursor, prev_cursor
+
+    def paginate(self, request):
+        """요청의 cursor/page_size 쿼리 파라미터로 한 페이지를 가져온다.
+
+        (rows, next_cursor, prev_cursor)를 반환한다.
+        """
+        queryset, page_size, cursor, direction = self._page_queryset(request)
+        return self._page(list(queryset), page_size, cursor, direction)
+
+    async def apaginate(self, request):
+        """paginate()의 async 버전 (async ORM으로 읽는다)"""
+        queryset, page_size, cursor, direction = self._page_queryset(request)
+        return self._page([row async for row in queryset], page_size, cursor, direction)
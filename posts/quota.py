@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from config.custom_api_exceptions import DailyPostLimitException
+from .models import PostQuota
+
+
+# 일일 게시글 작성 제한 서비스
+# 게시글 테이블을 COUNT하지 않고 (사용자, 구간 시작 시각)별 카운터 한 행만 갱신한다.
+# "count < limit 일 때만 +1" 조건부 UPDATE 한 번으로 검사와 증가가 원자적으로 일어나기 때문에
+# 동시에 두 요청이 들어와도 제한을 넘을 수 없다.
+class PostQuotaService:
+
+    @property
+    def limit(self):
+        return getattr(settings, 'DAILY_POST_LIMIT', 1)
+
+    @property
+    def window(self):
+        return getattr(settings, 'DAILY_POST_WINDOW', timedelta(days=1))
+
+    def window_start(self, now=None):
+        # epoch 기준으로 구간을 나눈다 (기본값 하루 = UTC 자정마다 초기화)
+        now = now or timezone.now()
+        seconds = self.window.total_seconds()
+        start = (now.timestamp() // seconds) * seconds
+        return datetime.fromtimestamp(start, tz=dt_timezone.utc)
+
+    def reset_at(self, now=None):
+        """지금 구간이 끝나고 작성 횟수가 초기화되는 시각"""
+        return self.window_start(now) + self.window
+
+    def remaining(self, user):
+        used = PostQuota.objects.filter(user=user, window_start=self.window_start()).values_list('count', flat=True).first()
+        return max(self.limit - (used or 0), 0)
+
+    def remaining_many(self, user_ids):
+        """여러 사용자의 남은 작성 횟수를 한 번의 쿼리로 구한다."""
+        used = dict(
+            PostQuota.objects.filter(user_id__in=user_ids, window_start=self.window_start())
+            .values_list('user_id', 'count')
+        )
+        return {user_id: max(self.limit - used.get(user_id, 0), 0) for user_id in user_ids}
+
+    def consume(self, user, amount=1):
+        """user의 이번 구간 작성 횟수를 amount만큼 늘린다. 제한을 넘으면 DailyPostLimitException."""
+        now = timezone.now()
+        window_start = self.window_start(now)
+
+        with transaction.atomic():
+            quota, _ = PostQuota.objects.get_or_create(user=user, window_start=window_start)
+            updated = PostQuota.objects.filter(
+                pk=quota.pk, count__lte=self.limit - amount
+            ).update(count=F('count') + amount)
+
+        if not updated:
+            raise DailyPostLimitException(
+                user=user.username if hasattr(user, 'username') else str(user), reset_at=self.reset_at(now),
+            )
+
+
+post_quota = PostQuotaService()
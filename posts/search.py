@@ -0,0 +1,296 @@
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+
+
+# 게시글 전문 검색 (title/content)
+# icontains로 매번 전체 테이블을 훑지 않고 역색인(inverted index)에서 BM25로 순위를 매긴다.
+# 백엔드는 settings.SEARCH_BACKEND로 고른다.
+# - Fts5SearchBackend: 별도 SQLite 파일의 FTS5 가상 테이블 (개발 환경)
+# - InMemorySearchBackend: 프로세스 메모리의 역색인
+# 두 백엔드 모두 Post save/delete 시그널로 갱신되고 rebuild_search_index 명령으로 다시 만들 수 있다.
+# 메모리 색인은 워커 프로세스마다 따로 있어서 다른 프로세스의 변경은 시그널로 전달되지 않으므로
+# SEARCH_INDEX_TTL(초)이 지나면 다시 만든다. (FTS5 파일은 프로세스끼리 공유)
+
+# 한글(자모 포함), 한자, 가나는 띄어쓰기 단위에 조사/어미가 붙으므로 글자 n-gram으로 나눈다.
+# 'Django는'처럼 한 단어 안에 문자 체계가 섞이면 먼저 경계에서 잘라 'django' + '는'으로 본다.
+NGRAM_CHARS = '\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u9fff\uac00-\ud7af'
+SEGMENT_RE = re.compile(rf'[{NGRAM_CHARS}]+|[^\W{NGRAM_CHARS}]+')
+NGRAM_RE = re.compile(rf'[{NGRAM_CHARS}]')
+
+TITLE_WEIGHT = 2  # 제목에 나온 단어는 본문보다 가중치를 준다
+
+
+def tokenize(text, query=False):
+    """텍스트를 검색 토큰으로 나눈다.
+
+    한글 등은 단어 단위로 자르면 '장고는'과 '장고'가 다른 토큰이 되므로 글자 2-gram으로 나눈다.
+    색인할 때는 한 글자 검색어('밥')도 '밥을'에 걸리도록 1-gram도 함께 넣고,
+    검색어는 두 글자 이상이면 2-gram만, 한 글자면 그 글자 하나로 찾는다.
+    """
+    tokens = []
+    for segment in SEGMENT_RE.findall(text.casefold()):
+        if len(segment) == 1 or not NGRAM_RE.match(segment):
+            tokens.append(segment)
+            continue
+        if not query:
+            tokens.extend(segment)
+        tokens.extend(segment[i:i + 2] for i in range(len(segment) - 1))
+    return tokens
+
+
+def highlight(text, query, max_length=None):
+    """검색어가 나온 부분을 <mark>로 감싼다. max_length가 있으면 첫 일치 위치 주변만 잘라낸다."""
+    words = sorted({w for w in SEGMENT_RE.findall(query.casefold())}, key=len, reverse=True)
+    if not words:
+        return escape(text[:max_length] if max_length else text)
+
+    pattern = re.compile('|'.join(re.escape(w) for w in words), re.IGNORECASE)
+
+    if max_length and len(text) > max_length:
+        match = pattern.search(text)
+        start = max((match.start() if match else 0) - max_length // 4, 0)
+        snippet = text[start:start + max_length]
+        prefix = '…' if start > 0 else ''
+        suffix = '…' if start + max_length < len(text) else ''
+    else:
+        snippet, prefix, suffix = text, '', ''
+
+    parts = []
+    last = 0
+    for match in pattern.finditer(snippet):
+        parts.append(escape(snippet[last:match.start()]))
+        parts.append(f'<mark>{escape(match.group(0))}</mark>')
+        last = match.end()
+    parts.append(escape(snippet[last:]))
+    return prefix + ''.join(parts) + suffix
+
+
+def _iter_posts():
+    from .models import Post
+    return Post.objects.values_list('id', 'title', 'content').iterator(chunk_size=2000)
+
+
+class SearchBackend:
+
+    def index(self, post_id, title, content):
+        raise NotImplementedError
+
+    def remove(self, post_id):
+        raise NotImplementedError
+
+    def search(self, query, offset=0, limit=20):
+        """(전체 일치 개수, [(post_id, score), ...])를 점수 높은 순으로 반환"""
+        raise NotImplementedError
+
+    def rebuild(self):
+        raise NotImplementedError
+
+
+class InMemorySearchBackend(SearchBackend):
+    # term -> {post_id: 가중 tf}, 문서 길이로 BM25 계산
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._built_at = 0.0
+        self._postings = {}
+        self._doc_terms = {}
+        self._doc_len = {}
+        self._total_len = 0
+
+    def _ttl(self):
+        return getattr(settings, 'SEARCH_INDEX_TTL', 300)
+
+    def _stale(self):
+        return not self._built or time.monotonic() - self._built_at >= self._ttl()
+
+    def _ensure_built(self):
+        if self._stale():
+            with self._lock:
+                if self._stale():
+                    self.rebuild()
+
+    def _add(self, post_id, title, content):
+        counts = Counter()
+        for token in tokenize(title):
+            counts[token] += TITLE_WEIGHT
+        counts.update(tokenize(content))
+
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[post_id] = tf
+        length = sum(counts.values())
+        self._doc_terms[post_id] = tuple(counts)
+        self._doc_len[post_id] = length
+        self._total_len += length
+
+    def _discard(self, post_id):
+        for term in self._doc_terms.pop(post_id, ()):
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(post_id, None)
+                if not posting:
+                    del self._postings[term]
+        self._total_len -= self._doc_len.pop(post_id, 0)
+
+    def index(self, post_id, title, content):
+        with self._lock:
+            if not self._built:
+                return # 아직 만들어지지 않았다면 처음 검색할 때 전체를 읽는다
+            self._discard(post_id)
+            self._add(post_id, title, content)
+
+    def remove(self, post_id):
+        with self._lock:
+            if self._built:
+                self._discard(post_id)
+
+    def rebuild(self):
+        with self._lock:
+            self._postings, self._doc_terms, self._doc_len, self._total_len = {}, {}, {}, 0
+            for post_id, title, content in _iter_posts():
+                self._add(post_id, title, content)
+            self._built = True
+            self._built_at = time.monotonic()
+
+    def search(self, query, offset=0, limit=20):
+        self._ensure_built()
+        terms = list(dict.fromkeys(tokenize(query, query=True)))
+        if not terms:
+            return 0, []
+
+        with self._lock:
+            postings = [self._postings.get(term) for term in terms]
+            if not all(postings):
+                return 0, []
+
+            # 모든 검색어가 들어있는 문서만 (짧은 목록부터 교집합)
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+
+            n_docs = len(self._doc_len)
+            avg_len = self._total_len / n_docs if n_docs else 0
+            scores = {}
+            for posting in postings:
+                idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                for post_id in candidates:
+                    tf = posting[post_id]
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_len[post_id] / avg_len)
+                    scores[post_id] = scores.get(post_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return len(ranked), ranked[offset:offset + limit]
+
+
+class Fts5SearchBackend(SearchBackend):
+    # 미리 토큰화한 문자열(공백 구분)을 FTS5에 넣고, FTS5의 bm25()로 순위를 매긴다
+    # 게시글 DB가 MySQL이어도 검색 색인은 로컬 SQLite 파일(SEARCH_INDEX_PATH)에 둔다
+    index_version = 2  # tokenize()가 바뀌면 올려서 기존 파일을 다시 색인한다
+
+    def __init__(self):
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(settings.SEARCH_INDEX_PATH), timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS post_fts USING fts5(title, content, tokenize='unicode61')"
+            )
+            self._local.conn = conn
+        return conn
+
+    def _ensure_built(self):
+        if self._ready:
+            return
+        with self._init_lock:
+            if self._ready:
+                return
+            conn = self._connect()
+            # user_version이 0이면 한 번도 색인하지 않은 파일, 다르면 토큰화 방식이 바뀌기 전에 만든 파일
+            if conn.execute('PRAGMA user_version').fetchone()[0] != self.index_version:
+                self.rebuild()
+            self._ready = True
+
+    @staticmethod
+    def _terms(text):
+        return ' '.join(tokenize(text))
+
+    @contextmanager
+    def _transaction(self):
+        # 중간에 실패하면 롤백해서 스레드별로 재사용하는 연결에 열린 트랜잭션이 남지 않게 한다
+        conn = self._connect()
+        conn.execute('BEGIN')
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.execute('COMMIT')
+
+    def index(self, post_id, title, content):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM post_fts WHERE rowid = ?', (post_id,))
+            conn.execute(
+                'INSERT INTO post_fts(rowid, title, content) VALUES (?, ?, ?)',
+                (post_id, self._terms(title), self._terms(content)),
+            )
+
+    def remove(self, post_id):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM post_fts WHERE rowid = ?', (post_id,))
+
+    def rebuild(self):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM post_fts')
+            conn.executemany(
+                'INSERT INTO post_fts(rowid, title, content) VALUES (?, ?, ?)',
+                ((post_id, self._terms(title), self._terms(content)) for post_id, title, content in _iter_posts()),
+            )
+            conn.execute(f'PRAGMA user_version = {self.index_version}')
+
+    def search(self, query, offset=0, limit=20):
+        self._ensure_built()
+        terms = list(dict.fromkeys(tokenize(query, query=True)))
+        if not terms:
+            return 0, []
+
+        # 각 토큰을 따옴표로 감싸서 FTS5 문법으로 해석되지 않게 하고 AND로 묶는다
+        match = ' AND '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+        conn = self._connect()
+        total = conn.execute('SELECT count(*) FROM post_fts WHERE post_fts MATCH ?', (match,)).fetchone()[0]
+        rows = conn.execute(
+            f'SELECT rowid, bm25(post_fts, {float(TITLE_WEIGHT)}, 1.0) AS rank FROM post_fts '
+            'WHERE post_fts MATCH ? ORDER BY rank, rowid DESC LIMIT ? OFFSET ?',
+            (match, limit, offset),
+        ).fetchall()
+        # FTS5의 bm25()는 작을수록 관련도가 높으므로 부호를 바꿔서 돌려준다
+        return total, [(post_id, -rank) for post_id, rank in rows]
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = import_string(getattr(settings, 'SEARCH_BACKEND', 'posts.search.InMemorySearchBackend'))()
+    return _backend
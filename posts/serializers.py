@@ -2,10 +2,11 @@
 
 from rest_framework import serializers
 from .models import Post, Comment
-from .models import Image
-from config.custom_api_exceptions import PostConflictException, PostValidationException, CommentValidationException, DailyPostLimitException # 13주차 실습
-from django.utils import timezone
-from datetime import datetime, timedelta
+from .models import Image, ImageVariant
+from accounts.models import User
+from config.custom_api_exceptions import PostConflictException, PostValidationException, CommentValidationException # 13주차 실습
+from django.db import IntegrityError, transaction
+from .quota import post_quota # 일일 게시글 작성 제한
 
 
 class PostSerializer(serializers.ModelSerializer):
@@ -16,6 +17,10 @@ class PostSerializer(serializers.ModelSerializer):
 		# 모델에서 어떤 필드를 가져올지
 		# 전부 가져오고 싶을 때
     fields = "__all__"
+    # unique 필드에 자동으로 붙는 UniqueValidator(저장 전 exists() 쿼리)를 빼고 DB 인덱스에 맡긴다
+    extra_kwargs = {
+      'title': {'validators': []},
+    }
 
   # 필수 필드를 명시적으로 정의
   def __init__(self, *args, **kwargs):
@@ -60,39 +65,9 @@ class PostSerializer(serializers.ModelSerializer):
   # 중복된 게시글 제목이 있다면 예외 발생, 13주차 실습
   # validate 메서드는 시리얼라이저의 유효성 검사 단계에서 호출됨
   def validate(self, data):
-    print(f"Validating data: {data}")  # 디버깅용
-    
-    # 하루 게시글 작성 제한 검사 (새 게시글 작성 시에만)
-    if not self.instance:  # 새 게시글 작성 시에만 체크 (업데이트가 아닌 경우)
-      user = data.get('user')
-      if user:
-        # 오늘 00:00:00부터 현재까지의 시간 범위
-        today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
-        
-        # 오늘 해당 사용자가 작성한 게시글 개수 확인
-        today_posts_count = Post.objects.filter(
-          user=user,
-          created__gte=today_start,
-          created__lt=today_end
-        ).count()
-        
-        print(f"User {user} has written {today_posts_count} posts today")  # 디버깅용
-        
-        if today_posts_count >= 1:
-          raise DailyPostLimitException(user=user.username if hasattr(user, 'username') else str(user))
-    
-    # 제목 중복 검사 (업데이트 시에는 자기 자신 제외)
-    title = data.get('title')
-    if title:
-      existing_posts = Post.objects.filter(title=title)
-      
-      # 업데이트인 경우 현재 인스턴스 제외
-      if self.instance:
-        existing_posts = existing_posts.exclude(id=self.instance.id)
-      
-      if existing_posts.exists():
-        raise PostConflictException(detail=f"'{title}' 제목의 게시글이 이미 존재합니다.")
+    # 하루 게시글 작성 제한은 create()에서 PostQuotaService로 검사 (게시글 테이블 COUNT 제거)
+    
+    # 제목 중복 검사는 미리 조회하지 않고 저장 시 DB unique 인덱스 위반(IntegrityError)으로 판단
     
     # 모든 필수 필드 검사 (이 부분이 중요!)
     required_fields = ['title', 'content', 'user']
@@ -113,6 +88,49 @@ class PostSerializer(serializers.ModelSerializer):
     
     return data
 
+  # 새 게시글 작성 시 일일 작성 횟수를 원자적으로 차감한 뒤 저장
+  # INSERT가 실패하면 같은 트랜잭션이 롤백되어 차감도 취소된다
+  def create(self, validated_data):
+    try:
+      with transaction.atomic():
+        post_quota.consume(validated_data['user'])
+        return super().create(validated_data)
+    except IntegrityError as e:
+      raise self._title_conflict(e, validated_data)
+
+  def update(self, instance, validated_data):
+    try:
+      with transaction.atomic():
+        return super().update(instance, validated_data)
+    except IntegrityError as e:
+      raise self._title_conflict(e, validated_data, instance)
+
+  # 제목 unique 인덱스 위반이면 409, 그 외 무결성 오류는 그대로 올린다
+  # 오류 메시지는 DB마다 다르므로 롤백된 뒤 같은 제목의 다른 게시글이 있는지 직접 확인한다
+  def _title_conflict(self, error, validated_data, instance=None):
+    title = validated_data.get('title')
+    others = Post.objects.filter(title=title)
+    if instance is not None:
+      others = others.exclude(pk=instance.pk)
+    if title is None or not others.exists():
+      return error
+    return PostConflictException(detail=f"'{title}' 제목의 게시글이 이미 존재합니다.")
+
+# 일괄 작성용: user를 요청마다 조회하지 않고 미리 한 번에 읽어둔 사용자(context['users'])에서 찾는다
+class PrefetchedUserField(serializers.PrimaryKeyRelatedField):
+
+  def to_internal_value(self, data):
+    try:
+      user = self.context['users'].get(int(data))
+    except (TypeError, ValueError):
+      self.fail('incorrect_type', data_type=type(data).__name__)
+    if user is None:
+      self.fail('does_not_exist', pk_value=data)
+    return user
+
+class PostBulkItemSerializer(PostSerializer):
+  user = PrefetchedUserField(queryset=User.objects.all())
+
 # comment를 가져오는 시리얼라이져
 class CommentSerializer(serializers.ModelSerializer):
 
@@ -159,8 +177,6 @@ class CommentSerializer(serializers.ModelSerializer):
 
   # 전체 validation
   def validate(self, data):
-    print(f"Validating comment data: {data}")  # 디버깅용
-    
     # 모든 필수 필드 검사
     required_fields = ['author', 'body', 'post']
     missing_fields = []
@@ -180,7 +196,15 @@ class CommentSerializer(serializers.ModelSerializer):
     
     return data
 
+class ImageVariantSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImageVariant
+        fields = ['width', 'height', 'format', 'image_url', 'size']
+
 class ImageSerializer(serializers.ModelSerializer):
+    # 파생본은 업로드 후 백그라운드에서 만들어지므로 업로드 직후에는 빈 목록
+    variants = ImageVariantSerializer(many=True, read_only=True)
+
     class Meta:
         model = Image
         fields = "__all__"
\ No newline at end of file
@@ -0,0 +1,94 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Post, Comment, cat_post_linker
+from .category_index import category_index
+from .cache import post_cache, comment_cache
+from .comment_counts import change_comment_count
+from .search import get_search_backend
+from .autocomplete import title_index
+
+
+# 카테고리-게시글 연결이 바뀌면 메모리 인덱스를 갱신
+# 롤백된 변경이 인덱스에 남지 않도록 커밋 이후에 반영한다
+@receiver(post_save, sender=cat_post_linker)
+def update_category_index_on_save(sender, instance, created, **kwargs):
+    if created:
+        category_id, post_id = instance.category_id, instance.post_id
+        transaction.on_commit(lambda: category_index.add(category_id, post_id))
+    else:
+        # 수정 시에는 이전 (카테고리, 게시글) 값을 알 수 없으므로 다음 조회 때 다시 만든다
+        transaction.on_commit(category_index.invalidate)
+
+
+@receiver(post_delete, sender=cat_post_linker)
+def update_category_index_on_delete(sender, instance, **kwargs):
+    category_id, post_id = instance.category_id, instance.post_id
+
+    def _remove():
+        # 같은 연결이 중복 저장되어 있었다면 인덱스에는 남겨둔다
+        still_linked = cat_post_linker.objects.filter(category_id=category_id, post_id=post_id).exists()
+        category_index.remove(category_id, post_id, still_linked=still_linked)
+
+    transaction.on_commit(_remove)
+
+
+# 게시글/댓글이 바뀌면 상세 조회 캐시를 비운다
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_cache(sender, instance, **kwargs):
+    post_id = instance.id
+    transaction.on_commit(lambda: post_cache.invalidate(post_id))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_cache(sender, instance, **kwargs):
+    comment_id = instance.c_id
+    transaction.on_commit(lambda: comment_cache.invalidate(comment_id))
+
+
+# 댓글 생성/삭제 시 게시글의 comment_count를 증감 (게시글 삭제로 인한 연쇄 삭제 포함)
+@receiver(post_save, sender=Comment)
+def increase_comment_count(sender, instance, created, **kwargs):
+    if created:
+        change_comment_count(instance.post_id, 1)
+        post_id = instance.post_id
+        transaction.on_commit(lambda: post_cache.invalidate(post_id))
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comment_count(sender, instance, origin=None, **kwargs):
+    # 게시글 삭제로 함께 지워지는 댓글이면 곧 사라질 게시글을 갱신할 필요가 없다
+    if isinstance(origin, Post) or getattr(origin, 'model', None) is Post:
+        return
+    change_comment_count(instance.post_id, -1)
+    post_id = instance.post_id
+    transaction.on_commit(lambda: post_cache.invalidate(post_id))
+
+
+# 게시글이 바뀌면 검색 색인을 갱신
+@receiver(post_save, sender=Post)
+def update_search_index_on_save(sender, instance, **kwargs):
+    post_id, title, content = instance.id, instance.title, instance.content
+    transaction.on_commit(lambda: get_search_backend().index(post_id, title, content))
+
+
+@receiver(post_delete, sender=Post)
+def update_search_index_on_delete(sender, instance, **kwargs):
+    post_id = instance.id
+    transaction.on_commit(lambda: get_search_backend().remove(post_id))
+
+
+# 게시글 제목이 바뀌면 자동완성 인덱스를 갱신
+@receiver(post_save, sender=Post)
+def update_title_index_on_save(sender, instance, **kwargs):
+    post_id, title = instance.id, instance.title
+    transaction.on_commit(lambda: title_index.add(post_id, title))
+
+
+@receiver(post_delete, sender=Post)
+def update_title_index_on_delete(sender, instance, **kwargs):
+    post_id = instance.id
+    transaction.on_commit(lambda: title_index.remove(post_id))
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import threading
+import uuid
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core import signing
+
+
+# S3 업로드 공통 코드
+# boto3 클라이언트는 만들 때 자격 증명 확인과 엔드포인트 설정에 시간이 걸리므로 프로세스에서 하나만 만들어 공유한다.
+# (boto3 클라이언트는 스레드 간에 공유해도 안전하고, 세션은 그렇지 않으므로 만들 때만 사용)
+#
+# 업로드는 upload_fileobj로 파일을 chunk 단위로 읽어 보내고, 큰 파일은 multipart로 여러 part를 병렬 전송한다.
+# 업로드 하나가 쓰는 메모리는 대략 multipart_chunksize * max_concurrency로 제한된다.
+# AWS_S3_ENDPOINT_URL을 지정하면 moto 서버 같은 로컬 S3 호환 서버로 보낼 수 있다.
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                session = boto3.session.Session(
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    region_name=settings.AWS_REGION,
+                )
+                _client = session.client(
+                    's3',
+                    endpoint_url=getattr(settings, 'AWS_S3_ENDPOINT_URL', None),
+                    config=Config(
+                        max_pool_connections=getattr(settings, 'AWS_S3_MAX_POOL_CONNECTIONS', 50),
+                        connect_timeout=getattr(settings, 'AWS_S3_CONNECT_TIMEOUT', 5),
+                        read_timeout=getattr(settings, 'AWS_S3_READ_TIMEOUT', 60),
+                        retries={'max_attempts': 3, 'mode': 'standard'},
+                    ),
+                )
+    return _client
+
+
+def get_transfer_config():
+    return TransferConfig(
+        multipart_threshold=getattr(settings, 'AWS_S3_MULTIPART_THRESHOLD', 8 * 1024 * 1024),
+        multipart_chunksize=getattr(settings, 'AWS_S3_MULTIPART_CHUNKSIZE', 8 * 1024 * 1024),
+        max_concurrency=getattr(settings, 'AWS_S3_MAX_CONCURRENCY', 4),
+        use_threads=True,
+    )
+
+
+def build_upload_key(filename):
+    """같은 이름의 파일이라도 덮어쓰지 않도록 uuid를 붙인 S3 key (uploads/이름_uuid.확장자)"""
+    origin_filename, extension = os.path.splitext(os.path.basename(filename))
+    return f"uploads/{origin_filename}_{uuid.uuid4().hex}{extension}"
+
+
+def content_upload_key(content_hash, filename):
+    """내용 해시로 정한 S3 key (uploads/<sha256>.확장자). 같은 내용은 항상 같은 key가 된다."""
+    _, extension = os.path.splitext(os.path.basename(filename))
+    return f"uploads/{content_hash}{extension.lower()}"
+
+
+def sign_upload_key(key):
+    """presign 때 발급한 key를 complete에서 그대로 돌려받았는지 확인하기 위한 서명 토큰"""
+    return signing.dumps(key, salt='posts.storage.upload')
+
+
+def unsign_upload_key(token):
+    """토큰에서 key를 꺼낸다. 위조되었거나 IMAGE_UPLOAD_TOKEN_MAX_AGE가 지났으면 signing.BadSignature"""
+    return signing.loads(token, salt='posts.storage.upload', max_age=getattr(settings, 'IMAGE_UPLOAD_TOKEN_MAX_AGE', 3600))
+
+
+def object_url(key):
+    endpoint = getattr(settings, 'AWS_S3_ENDPOINT_URL', None)
+    if endpoint:
+        return f"{endpoint.rstrip('/')}/{settings.AWS_STORAGE_BUCKET_NAME}/{key}"
+    return f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
+
+
+def upload_fileobj(fileobj, key, content_type=None):
+    """파일 객체를 읽으면서 S3로 보낸다. (전체를 메모리에 올리지 않음)"""
+    extra_args = {}
+    if content_type:
+        extra_args['ContentType'] = content_type
+    get_s3_client().upload_fileobj(
+        fileobj, settings.AWS_STORAGE_BUCKET_NAME, key, ExtraArgs=extra_args, Config=get_transfer_config(),
+    )
+
+
+def presigned_upload(key, content_type, max_size, expires_in):
+    """브라우저가 S3로 바로 올릴 수 있는 presigned POST (url, fields).
+
+    Content-Type과 파일 크기(1 ~ max_size 바이트)는 정책(policy)에 들어가서 S3가 직접 검사한다.
+    """
+    return get_s3_client().generate_presigned_post(
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+        Key=key,
+        Fields={'Content-Type': content_type},
+        Conditions=[
+            {'Content-Type': content_type},
+            ['content-length-range', 1, max_size],
+        ],
+        ExpiresIn=expires_in,
+    )
+
+
+def hash_upload(key, chunk_size=1024 * 1024):
+    """S3 객체를 chunk 단위로 읽으면서 SHA-256을 계산한다. (전체를 메모리에 올리지 않음)"""
+    hasher = hashlib.sha256()
+    body = get_s3_client().get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)['Body']
+    try:
+        for chunk in body.iter_chunks(chunk_size):
+            hasher.update(chunk)
+    finally:
+        body.close()
+    return hasher.hexdigest()
+
+
+def delete_upload(key):
+    get_s3_client().delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+
+
+def head_upload(key):
+    """S3에 올라간 객체의 메타데이터. 없으면 None"""
+    try:
+        return get_s3_client().head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+            return None
+        raise
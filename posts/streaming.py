@@ -0,0 +1,78 @@
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+# 목록 API 스트리밍 응답
+# 전체 목록을 리스트/JSON 문자열로 만들지 않고 QuerySet.iterator(chunk_size)로
+# 조금씩 읽어서 바로 내보내기 때문에, 행 개수와 상관없이 메모리 사용량이 일정하고
+# 첫 바이트가 테이블 크기와 상관없이 바로 나간다.
+
+STREAM_FORMATS = ('json', 'ndjson')
+
+
+def get_stream_format(request):
+    """?stream=1|json|ndjson 파라미터를 해석한다. 스트리밍이 아니면 None."""
+    value = request.GET.get('stream')
+    if not value or value in ('0', 'false'):
+        return None
+    if value in ('1', 'true'):
+        return 'json'
+    return value if value in STREAM_FORMATS else None
+
+
+def _chunk_size():
+    return getattr(settings, 'STREAM_CHUNK_SIZE', 500)
+
+
+def iter_rows(queryset, to_rows):
+    """queryset을 chunk 단위로 읽어서 to_rows(chunk)가 만든 dict를 하나씩 돌려준다."""
+    chunk_size = _chunk_size()
+    iterator = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield from to_rows(chunk)
+
+
+def _dumps(value):
+    # DRF JSONRenderer와 같은 인코딩 (UNICODE_JSON, COMPACT_JSON 기본값)
+    return json.dumps(value, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+
+
+def _json_array(rows, envelope):
+    # {"success":true,"message":"...","data":[ ... ]} 형태를 조각조각 내보낸다
+    head = _dumps(envelope)
+    yield (head[:-1] + (',' if envelope else '') + '"data":[').encode('utf-8')
+
+    first = True
+    for row in rows:
+        if first:
+            first = False
+            yield _dumps(row).encode('utf-8')
+        else:
+            yield (',' + _dumps(row)).encode('utf-8')
+
+    yield b']}'
+
+
+def _ndjson(rows):
+    # 한 줄에 하나의 JSON 객체
+    for row in rows:
+        yield (_dumps(row) + '\n').encode('utf-8')
+
+
+def streaming_response(rows, stream_format, envelope=None):
+    """rows(dict iterator)를 JSON 배열 또는 NDJSON으로 흘려보내는 응답을 만든다."""
+    if stream_format == 'ndjson':
+        response = StreamingHttpResponse(_ndjson(rows), content_type='application/x-ndjson')
+    else:
+        response = StreamingHttpResponse(_json_array(rows, envelope or {}), content_type='application/json')
+
+    # 프록시(nginx 등)가 응답을 모아서 보내지 않도록
+    response['X-Accel-Buffering'] = 'no'
+    return response
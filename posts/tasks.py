@@ -0,0 +1,12 @@
+from taskqueue.registry import task
+
+from .derivatives import save_variants, variant_job
+from .imaging import render_variants
+
+
+# posts 앱의 백그라운드 작업 (run_tasks 워커가 실행)
+
+@task(name='posts.generate_image_variants', max_attempts=3)
+def generate_image_variants(image_id, key):
+    """업로드된 이미지의 파생본을 만들어 S3에 올리고 ImageVariant로 저장한다. (다시 실행해도 같은 결과)"""
+    save_variants(image_id, render_variants(*variant_job(key)))
@@ -1,3 +1,1312 @@
-from django.test import TestCase
+import hashlib
+import json
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+import requests
+from asgiref.sync import async_to_sync
+from django.core import signing
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from PIL import Image as PILImage, UnidentifiedImageError
+from rest_framework.renderers import JSONRenderer
+
+from tests.base import APITestCase, S3APITestCase
+from taskqueue.models import Task
+
+from config.custom_api_exceptions import PostConflictException
+
+from . import imaging, search, storage
+from .autocomplete import title_index
+from .background import run_in_background
+from .category_index import category_index
+from .fast_serializers import post_fast, comment_fast
+from .upload_handlers import ContentHashUploadHandler
+from .cache import ObjectCache
+from .models import Post, Comment, Category, Image, ImageVariant, PostQuota, cat_post_linker
+from .quota import post_quota
+from .serializers import PostSerializer, CommentSerializer
+from .tasks import generate_image_variants
+
+
+class KeysetPaginationTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.posts = [Post.objects.create(title=f'post-{i}', content='본문', user=self.user) for i in range(25)]
+        # 앞의 10개는 같은 시각에 만들어진 것으로 맞춰서 pk로 순서가 정해지는지 확인
+        base = timezone.now() - timedelta(days=1)
+        Post.objects.filter(id__in=[p.id for p in self.posts[:10]]).update(created=base)
+        for i, post in enumerate(self.posts[10:], start=1):
+            Post.objects.filter(id=post.id).update(created=base + timedelta(minutes=i))
+        self.expected = list(Post.objects.order_by('-created', '-id').values_list('id', flat=True))
+
+    def get_page(self, **params):
+        response = self.client.get('/post/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_pages_cover_every_post_once_in_order(self):
+        ids, cursor, pages = [], None, 0
+        while True:
+            body = self.get_page(page_size=10, **({'cursor': cursor} if cursor else {}))
+            ids.extend(row['id'] for row in body['data'])
+            pages += 1
+            cursor = body['next']
+            if cursor is None:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, self.expected)
+
+    def test_first_page_has_no_prev_and_last_page_has_no_next(self):
+        first = self.get_page(page_size=10)
+        self.assertIsNone(first['prev'])
+        self.assertIsNotNone(first['next'])
+
+        last = self.get_page(page_size=25)
+        self.assertEqual(last['count'], 25)
+        self.assertIsNone(last['next'])
+
+    def test_exact_multiple_of_page_size_has_no_empty_trailing_page(self):
+        body = self.get_page(page_size=5)
+        cursor, pages = body['next'], 1
+        while cursor:
+            body = self.get_page(page_size=5, cursor=cursor)
+            self.assertEqual(body['count'], 5)
+            cursor, pages = body['next'], pages + 1
+        self.assertEqual(pages, 5)
+
+    def test_prev_cursor_returns_previous_page(self):
+        first = self.get_page(page_size=7)
+        second = self.get_page(page_size=7, cursor=first['next'])
+        back = self.get_page(page_size=7, cursor=second['prev'])
+        self.assertEqual([row['id'] for row in back['data']], [row['id'] for row in first['data']])
+        self.assertIsNone(back['prev'])
+
+    def test_page_boundary_inside_same_timestamp(self):
+        # 같은 created 값 10개가 페이지 경계에 걸쳐도 빠지거나 겹치지 않는다
+        first = self.get_page(page_size=20)
+        second = self.get_page(page_size=20, cursor=first['next'])
+        ids = [row['id'] for row in first['data']] + [row['id'] for row in second['data']]
+        self.assertEqual(ids, self.expected)
+
+    def test_new_post_does_not_shift_next_page(self):
+        first = self.get_page(page_size=10)
+        Post.objects.create(title='newest', content='본문', user=self.user)
+        second = self.get_page(page_size=10, cursor=first['next'])
+        self.assertEqual([row['id'] for row in second['data']], self.expected[10:20])
+
+    def test_page_size_is_clamped(self):
+        self.assertEqual(self.get_page(page_size=0)['count'], 1)
+        with self.settings(PAGINATION_MAX_PAGE_SIZE=12):
+            self.assertEqual(self.get_page(page_size=1000)['count'], 12)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/post/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+class CommentKeysetPaginationTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        post = Post.objects.create(title='댓글 글', content='본문', user=self.make_user())
+        self.comments = [Comment.objects.create(post=post, author='작성자', body=f'comment-{i}') for i in range(25)]
+        # writen_time/c_id 쌍으로 정렬: 앞의 10개는 같은 시각
+        base = timezone.now() - timedelta(days=1)
+        Comment.objects.filter(c_id__in=[c.c_id for c in self.comments[:10]]).update(writen_time=base)
+        for i, comment in enumerate(self.comments[10:], start=1):
+            Comment.objects.filter(c_id=comment.c_id).update(writen_time=base + timedelta(minutes=i))
+        self.expected = list(Comment.objects.order_by('-writen_time', '-c_id').values_list('c_id', flat=True))
+
+    def get_page(self, **params):
+        response = self.client.get('/post/comments/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def ids(self, body):
+        return [row['c_id'] for row in body['data']]
+
+    def test_pages_cover_every_comment_once_in_order(self):
+        ids, cursor, pages = [], None, 0
+        while True:
+            body = self.get_page(page_size=8, **({'cursor': cursor} if cursor else {}))
+            ids.extend(self.ids(body))
+            pages += 1
+            cursor = body['next']
+            if cursor is None:
+                break
+        self.assertEqual(pages, 4)
+        self.assertEqual(ids, self.expected)
+
+    def test_prev_cursor_returns_previous_page(self):
+        first = self.get_page(page_size=7)
+        self.assertIsNone(first['prev'])
+        second = self.get_page(page_size=7, cursor=first['next'])
+        back = self.get_page(page_size=7, cursor=second['prev'])
+        self.assertEqual(self.ids(back), self.ids(first))
+        self.assertIsNone(back['prev'])
+
+    def test_page_boundary_inside_same_timestamp(self):
+        # 같은 writen_time 10개 중간에서 페이지가 나뉘어도 빠지거나 겹치지 않는다
+        first = self.get_page(page_size=20)
+        second = self.get_page(page_size=20, cursor=first['next'])
+        self.assertEqual(self.ids(first) + self.ids(second), self.expected)
+        self.assertIsNone(second['next'])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/post/comments/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error']['code'], 'INVALID_CURSOR')
+        self.assertEqual(response.json()['error']['code'], 'INVALID_CURSOR')
+
+
+class StreamingListTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        user = self.make_user()
+        for i in range(12):
+            post = Post.objects.create(title=f'스트리밍 {i}', content='본문 "따옴표" <b>html</b>', user=user)
+            Comment.objects.create(post=post, author='작성자', body=f'댓글 {i}')
+
+    def stream(self, url, stream_format):
+        # chunk 경계가 여러 번 생기도록 작게 잡는다
+        with self.settings(STREAM_CHUNK_SIZE=5):
+            response = self.client.get(url, {'stream': stream_format})
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.streaming)
+            body = b''.join(response.streaming_content).decode('utf-8')
+        return response, body
+
+    def assert_matches_page(self, url):
+        page = self.client.get(url, {'page_size': 100}).json()
+
+        response, body = self.stream(url, '1')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response['X-Accel-Buffering'], 'no')
+        streamed = json.loads(body)
+        self.assertEqual(streamed, {'success': True, 'message': page['message'], 'data': page['data']})
+
+        response, body = self.stream(url, 'ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertTrue(body.endswith('\n'))
+        self.assertEqual([json.loads(line) for line in body.splitlines()], page['data'])
+
+    def test_post_list(self):
+        self.assert_matches_page('/post/')
+
+    def test_comment_list(self):
+        self.assert_matches_page('/post/comments/')
+
+    def test_empty_list(self):
+        Post.objects.all().delete()
+        self.assertEqual(json.loads(self.stream('/post/', 'json')[1])['data'], [])
+        self.assertEqual(self.stream('/post/', 'ndjson')[1], '')
+
+    def test_unknown_format_is_not_streamed(self):
+        for value in ('0', 'csv'):
+            response = self.client.get('/post/', {'stream': value})
+            self.assertFalse(response.streaming)
+            self.assertEqual(response.json()['count'], 12)
+
+
+class CategoryIndexTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.python = Category.objects.create(cat_name='python')
+        self.django = Category.objects.create(cat_name='django')
+        self.p1 = Post.objects.create(title='p1', content='본문', user=self.user)
+        self.p2 = Post.objects.create(title='p2', content='본문', user=self.user, status='PUBLISHED')
+        self.p3 = Post.objects.create(title='p3', content='본문', user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            cat_post_linker.objects.create(post=self.p1, category=self.python)
+            cat_post_linker.objects.create(post=self.p2, category=self.python)
+            cat_post_linker.objects.create(post=self.p2, category=self.django)
+
+    def filter_ids(self, *category_ids, **params):
+        response = self.client.get('/post/filter/', {'category': ','.join(map(str, category_ids)), **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.json()['data']]
+
+    def test_and_or_status(self):
+        self.assertEqual(self.filter_ids(self.python.cat_id, self.django.cat_id), [self.p2.id, self.p1.id])
+        self.assertEqual(self.filter_ids(self.python.cat_id, self.django.cat_id, mode='and'), [self.p2.id])
+        self.assertEqual(self.filter_ids(self.python.cat_id, status='PUBLISHED'), [self.p2.id])
+
+    def test_new_link_is_added_after_commit(self):
+        self.filter_ids(self.django.cat_id) # 인덱스를 먼저 만든다
+        with self.captureOnCommitCallbacks(execute=True):
+            cat_post_linker.objects.create(post=self.p3, category=self.django)
+        self.assertEqual(self.filter_ids(self.django.cat_id), [self.p3.id, self.p2.id])
+
+    def test_rolled_back_link_is_not_added(self):
+        self.filter_ids(self.django.cat_id)
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    cat_post_linker.objects.create(post=self.p3, category=self.django)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(self.filter_ids(self.django.cat_id), [self.p2.id])
+
+    def test_deleted_link_is_removed_unless_duplicated(self):
+        self.filter_ids(self.python.cat_id)
+        with self.captureOnCommitCallbacks(execute=True):
+            cat_post_linker.objects.create(post=self.p2, category=self.python) # 중복 연결
+            cat_post_linker.objects.filter(post=self.p1, category=self.python).delete()
+            cat_post_linker.objects.filter(post=self.p2, category=self.python).first().delete()
+        self.assertEqual(self.filter_ids(self.python.cat_id), [self.p2.id])
+
+    def test_updated_link_rebuilds_index(self):
+        self.filter_ids(self.python.cat_id)
+        link = cat_post_linker.objects.get(post=self.p1, category=self.python)
+        with self.captureOnCommitCallbacks(execute=True):
+            link.category = self.django
+            link.save()
+        self.assertEqual(self.filter_ids(self.python.cat_id), [self.p2.id])
+        self.assertEqual(self.filter_ids(self.django.cat_id), [self.p2.id, self.p1.id])
+
+    def test_single_and_multi_category_endpoints_use_same_order(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            cat_post_linker.objects.create(post=self.p3, category=self.python)
+        # 생성 시각과 id 순서가 달라도 두 API 모두 id 내림차순
+        Post.objects.filter(pk=self.p1.pk).update(created=timezone.now() + timedelta(days=1))
+        legacy = [row['id'] for row in self.client.get(f'/post/filter/{self.python.cat_id}/').json()['date']]
+        self.assertEqual(legacy, [self.p3.id, self.p2.id, self.p1.id])
+        self.assertEqual(self.filter_ids(self.python.cat_id), legacy)
+
+    def test_large_category_is_read_in_chunks(self):
+        posts = [Post.objects.create(title=f'많은 글 {i}', content='본문', user=self.user) for i in range(5)]
+        with self.captureOnCommitCallbacks(execute=True):
+            for post in posts:
+                cat_post_linker.objects.create(post=post, category=self.django)
+        expected = sorted([p.id for p in posts] + [self.p2.id], reverse=True)
+
+        self.filter_ids(self.django.cat_id) # 인덱스를 먼저 만든다
+        with self.settings(CATEGORY_FILTER_CHUNK_SIZE=2):
+            with self.assertNumQueries(3): # 6개를 2개씩
+                response = self.client.get(f'/post/filter/{self.django.cat_id}/')
+            self.assertEqual([row['id'] for row in response.json()['date']], expected)
+
+            pages, cursor = [], None
+            while True:
+                body = self.client.get('/post/filter/', {
+                    'category': self.django.cat_id, 'page_size': 4, **({'cursor': cursor} if cursor else {}),
+                }).json()
+                pages.append([row['id'] for row in body['data']])
+                cursor = body['next']
+                if cursor is None:
+                    break
+        self.assertEqual(pages, [expected[:4], expected[4:]])
+
+    def test_async_filter_matches_sync_filter(self):
+        sync_body = self.client.get(f'/post/filter/{self.python.cat_id}/').json()
+        async_body = async_to_sync(self.async_client.get)(f'/post/async/filter/{self.python.cat_id}/').json()
+        self.assertEqual(async_body, sync_body)
+
+    def test_changes_from_other_processes_are_picked_up_after_ttl(self):
+        self.filter_ids(self.django.cat_id)
+        # 시그널 없이 바뀐 행(다른 워커 프로세스의 변경과 같은 상황)
+        cat_post_linker.objects.bulk_create([cat_post_linker(post=self.p3, category=self.django)])
+        self.assertEqual(self.filter_ids(self.django.cat_id), [self.p2.id])
+
+        with self.settings(CATEGORY_INDEX_TTL=0), mock.patch('posts.category_index.run_in_background') as background:
+            # 요청은 다시 만드는 것을 기다리지 않고 이전 인덱스로 답한다
+            with self.assertNumQueries(1): # 게시글 조회만
+                self.assertEqual(self.filter_ids(self.django.cat_id), [self.p2.id])
+            # 이미 다시 만드는 중이면 또 시작하지 않는다
+            self.filter_ids(self.django.cat_id)
+            background.assert_called_once()
+            rebuild, name = background.call_args.args
+            rebuild()
+        self.assertEqual(self.filter_ids(self.django.cat_id), [self.p3.id, self.p2.id])
+
+    def test_changes_during_rebuild_are_replayed(self):
+        self.filter_ids(self.python.cat_id)
+        build = category_index._build
+
+        def build_then_change():
+            postings = build()
+            # DB를 읽은 뒤, 새 인덱스로 바꾸기 전에 커밋된 변경
+            category_index.add(self.python.cat_id, self.p3.id)
+            category_index.remove(self.python.cat_id, self.p1.id)
+            return postings
+
+        with mock.patch.object(category_index, '_build', side_effect=build_then_change):
+            category_index.rebuild()
+        self.assertEqual(self.filter_ids(self.python.cat_id), [self.p3.id, self.p2.id])
+
+    def test_rebuild_started_before_invalidate_is_discarded(self):
+        self.filter_ids(self.python.cat_id)
+        build = category_index._build
+
+        def build_then_invalidate():
+            postings = build()
+            category_index.invalidate()
+            return postings
+
+        with mock.patch.object(category_index, '_build', side_effect=build_then_invalidate):
+            category_index.rebuild()
+        self.assertIsNone(category_index.cached_post_ids(self.python.cat_id))
+
+    def test_background_errors_are_logged(self):
+        def fail():
+            raise RuntimeError('rebuild failed')
+
+        with self.assertLogs('django.request', 'ERROR') as logs:
+            run_in_background(fail, 'test-rebuild').join()
+        self.assertIn('test-rebuild', logs.output[0])
+
+
+class ObjectCacheTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.object_cache = ObjectCache('test')
+        self.cache = caches['objects']
+
+    def test_value_is_loaded_once(self):
+        loader = mock.Mock(return_value={'id': 1})
+        self.assertEqual(self.object_cache.get_or_set(1, loader), {'id': 1})
+        self.assertEqual(self.object_cache.get_or_set(1, loader), {'id': 1})
+        self.assertEqual(loader.call_count, 1)
+
+    def test_invalidate_forces_reload(self):
+        self.object_cache.get_or_set(1, lambda: 'old')
+        self.object_cache.invalidate(1)
+        self.assertEqual(self.object_cache.get_or_set(1, lambda: 'new'), 'new')
+
+    def test_value_loaded_before_invalidate_is_not_stored(self):
+        def loader():
+            # DB를 읽은 뒤 저장하기 전에 다른 요청이 글을 고치고 무효화한 상황
+            self.object_cache.invalidate(1)
+            return 'stale'
+
+        self.assertEqual(self.object_cache.get_or_set(1, loader), 'stale')
+        self.assertEqual(self.object_cache.get_or_set(1, lambda: 'fresh'), 'fresh')
+
+    def test_lock_taken_over_by_another_request_is_kept(self):
+        lock_key = self.object_cache._lock_key(1)
+
+        def loader():
+            # lock_timeout이 지나 다른 요청이 락을 새로 잡은 상황
+            self.cache.set(lock_key, 'other')
+            return 'value'
+
+        self.object_cache.get_or_set(1, loader)
+        self.assertEqual(self.cache.get(lock_key), 'other')
+
+    def test_own_lock_is_released(self):
+        self.object_cache.get_or_set(1, lambda: 'value')
+        self.assertIsNone(self.cache.get(self.object_cache._lock_key(1)))
+
+    def test_async_value_loaded_before_invalidate_is_not_stored(self):
+        async def loader():
+            self.object_cache.invalidate(1)
+            return 'stale'
+
+        async def fresh():
+            return 'fresh'
+
+        self.assertEqual(async_to_sync(self.object_cache.aget_or_set)(1, loader), 'stale')
+        self.assertEqual(async_to_sync(self.object_cache.aget_or_set)(1, fresh), 'fresh')
+        self.assertIsNone(self.cache.get(self.object_cache._lock_key(1)))
+
+
+class ConditionalGetTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.post = Post.objects.create(title='제목', content='본문', user=self.user)
+
+    def assert_revalidates(self, url, edit):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.has_header('ETag'))
+        self.assertTrue(first.has_header('Last-Modified'))
+
+        repeat = self.client.get(url, headers={'If-None-Match': first['ETag']})
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(
+            self.client.get(url, headers={'If-Modified-Since': first['Last-Modified']}).status_code, 304,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            edit()
+        changed = self.client.get(url, headers={'If-None-Match': first['ETag']})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+        return changed
+
+    def rename_post(self):
+        self.post.title = '바뀐 제목'
+        self.post.save()
+
+    def test_post_detail(self):
+        changed = self.assert_revalidates(f'/post/{self.post.id}/', self.rename_post)
+        self.assertEqual(changed.json()['title'], '바뀐 제목')
+
+    def test_comments_after_new_comment(self):
+        Comment.objects.create(post=self.post, author='a', body='첫 댓글')
+        changed = self.assert_revalidates(
+            f'/post/{self.post.id}/comments/',
+            lambda: Comment.objects.create(post=self.post, author='b', body='둘째 댓글'),
+        )
+        self.assertEqual(len(changed.json()['data']), 2)
+
+    def test_comments_after_post_edit(self):
+        # 댓글 목록 응답에도 게시글 제목이 들어간다
+        Comment.objects.create(post=self.post, author='a', body='첫 댓글')
+        changed = self.assert_revalidates(f'/post/{self.post.id}/comments/', self.rename_post)
+        self.assertEqual(changed.json()['post_info']['title'], '바뀐 제목')
+
+    def test_post_without_comments_has_validators(self):
+        self.assert_revalidates(
+            f'/post/{self.post.id}/comments/',
+            lambda: Comment.objects.create(post=self.post, author='a', body='첫 댓글'),
+        )
+
+    def test_missing_post_is_not_found(self):
+        self.assertEqual(self.client.get('/post/999999/comments/').status_code, 404)
+
+
+class PostQuotaTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+
+    def create_post(self, title):
+        return self.client.post('/post/', {'title': title, 'content': '게시글 본문', 'user': self.user.id})
+
+    def test_limit_per_window(self):
+        with self.settings(DAILY_POST_LIMIT=2):
+            self.assertEqual(self.create_post('첫 글').status_code, 201)
+            self.assertEqual(self.create_post('둘째 글').status_code, 201)
+            response = self.create_post('셋째 글')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()['error']['code'], 'DAILY_POST_LIMIT_EXCEEDED')
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(post_quota.remaining(self.user), 0)
+
+    def test_limit_response_reports_window_reset(self):
+        now = timezone.now()
+        with self.settings(DAILY_POST_WINDOW=timedelta(hours=1)):
+            self.assertEqual(self.create_post('첫 글').status_code, 201)
+            response = self.create_post('둘째 글')
+        self.assertEqual(response.status_code, 429)
+
+        reset_at = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        details = response.json()['error']['details']
+        self.assertEqual(details['reset_time'], timezone.localtime(reset_at).isoformat())
+        self.assertTrue(0 < int(response['Retry-After']) <= 3600)
+
+    def test_next_window_resets_count(self):
+        self.assertEqual(self.create_post('첫 글').status_code, 201)
+        self.assertEqual(self.create_post('둘째 글').status_code, 429)
+
+        tomorrow = timezone.now() + timedelta(days=1)
+        with mock.patch('posts.quota.timezone.now', return_value=tomorrow):
+            self.assertEqual(self.create_post('둘째 글').status_code, 201)
+        self.assertEqual(PostQuota.objects.filter(user=self.user).count(), 2)
+
+    def test_window_start_is_aligned(self):
+        now = timezone.now()
+        with self.settings(DAILY_POST_WINDOW=timedelta(hours=1)):
+            start = post_quota.window_start(now)
+        self.assertEqual(start, now.replace(minute=0, second=0, microsecond=0))
+
+    def test_failed_insert_does_not_use_quota(self):
+        Post.objects.create(title='있는 제목', content='본문', user=self.make_user('other'))
+        self.assertEqual(self.create_post('있는 제목').status_code, 409)
+        self.assertEqual(post_quota.remaining(self.user), 1)
+        self.assertEqual(self.create_post('새 제목').status_code, 201)
+
+    def test_remaining_many(self):
+        other = self.make_user('other')
+        self.assertEqual(self.create_post('첫 글').status_code, 201)
+        self.assertEqual(post_quota.remaining_many([self.user.id, other.id]), {self.user.id: 0, other.id: 1})
+
+
+class TitleConflictTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.post = Post.objects.create(title='있는 제목', content='본문', user=self.user)
+
+    def test_duplicate_title_returns_409(self):
+        response = self.client.post('/post/', {'title': '있는 제목', 'content': '게시글 본문', 'user': self.user.id})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Post.objects.filter(title='있는 제목').count(), 1)
+
+    def test_update_to_existing_title_conflicts(self):
+        other = Post.objects.create(title='다른 제목', content='본문', user=self.user)
+        serializer = PostSerializer(other, data={'title': '있는 제목', 'content': '게시글 본문', 'user': self.user.id})
+        self.assertTrue(serializer.is_valid())
+        with self.assertRaises(PostConflictException):
+            serializer.save()
+
+    def test_update_keeping_own_title_is_allowed(self):
+        serializer = PostSerializer(self.post, data={'title': '있는 제목', 'content': '바뀐 본문입니다', 'user': self.user.id})
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.save().content, '바뀐 본문입니다')
+
+
+class DeduplicateTitlesMigrationTests(TransactionTestCase):
+    before = [('posts', '0006_postquota')]
+    after = [('posts', '0007_post_title_unique')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        self.apps = executor.loader.project_state(self.before).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_renamed_title_skips_existing_titles(self):
+        OldPost = self.apps.get_model('posts', 'Post')
+        OldUser = self.apps.get_model('accounts', 'User')
+        user = OldUser.objects.create(username='tester', email='tester@example.com')
+        first = OldPost.objects.create(title='제목', content='본문', user=user)
+        second = OldPost.objects.create(title='제목', content='본문', user=user)
+        # 바꿀 제목("제목-<id>")을 이미 쓰는 게시글
+        OldPost.objects.create(title=f'제목-{second.id}', content='본문', user=user)
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.after)
+
+        titles = dict(OldPost.objects.values_list('id', 'title'))
+        self.assertEqual(titles[first.id], '제목')
+        self.assertEqual(titles[second.id], f'제목-{second.id}-2')
+        self.assertEqual(len(set(titles.values())), 3)
+
+
+class PostBulkCreateTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.other = self.make_user('other')
+
+    def bulk(self, items):
+        return self.client.post('/post/bulk/', items, content_type='application/json')
+
+    def item(self, title, user=None):
+        return {'title': title, 'content': '게시글 본문', 'user': (user or self.user).id}
+
+    def test_creates_posts_and_returns_ids(self):
+        with self.settings(DAILY_POST_LIMIT=5):
+            response = self.bulk([self.item('첫 글'), self.item('둘째 글'), self.item('셋째 글', self.other)])
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual(body['count'], 3)
+        self.assertEqual(body['errors'], [])
+        for row in body['data']:
+            self.assertEqual(Post.objects.get(id=row['id']).title, row['title'])
+        self.assertEqual([row['index'] for row in body['data']], [0, 1, 2])
+
+    def test_invalid_items_are_reported_by_index(self):
+        Post.objects.create(title='있는 제목', content='본문', user=self.other)
+        with self.settings(DAILY_POST_LIMIT=5):
+            response = self.bulk([
+                self.item('새 글'),
+                'not-an-object',
+                self.item('있는 제목'),
+                self.item('새 글'),
+                {'title': '사용자 없음', 'content': '게시글 본문', 'user': 999999},
+                {'title': '짧은 본문', 'content': '본문', 'user': self.user.id},
+            ])
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual([row['index'] for row in body['data']], [0])
+        self.assertEqual([error['index'] for error in body['errors']], [1, 2, 3, 4, 5])
+        self.assertIn('title', body['errors'][1]['errors'])
+        self.assertIn('title', body['errors'][2]['errors'])
+        self.assertIn('user', body['errors'][3]['errors'])
+        self.assertIn('content', body['errors'][4]['errors'])
+
+    def test_quota_is_applied_per_user(self):
+        with self.settings(DAILY_POST_LIMIT=2):
+            response = self.bulk([self.item('1번'), self.item('2번'), self.item('3번'), self.item('4번', self.other)])
+        body = response.json()
+        self.assertEqual([row['index'] for row in body['data']], [0, 1, 3])
+        self.assertEqual([error['index'] for error in body['errors']], [2])
+        self.assertEqual(post_quota.remaining(self.user), 0)
+
+    def test_all_items_invalid_returns_400(self):
+        response = self.bulk([{'title': '', 'content': '', 'user': self.user.id}])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Post.objects.exists())
+
+    def test_request_must_be_non_empty_list(self):
+        self.assertEqual(self.bulk({'title': '하나'}).status_code, 400)
+        self.assertEqual(self.bulk([]).status_code, 400)
+        with self.settings(BULK_CREATE_MAX_ITEMS=2):
+            self.assertEqual(self.bulk([self.item('a1'), self.item('a2'), self.item('a3')]).status_code, 400)
+
+    def test_title_taken_concurrently_cancels_batch(self):
+        remaining_many = post_quota.remaining_many
+
+        def insert_same_title(user_ids):
+            # 제목 검사가 끝난 뒤 다른 요청이 같은 제목을 먼저 저장한 상황
+            Post.objects.create(title='경합 제목', content='본문', user=self.other)
+            return remaining_many(user_ids)
+
+        with mock.patch.object(post_quota, 'remaining_many', side_effect=insert_same_title):
+            response = self.bulk([self.item('경합 제목'), self.item('다른 제목')])
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Post.objects.filter(title='다른 제목').exists())
+        self.assertEqual(post_quota.remaining(self.user), 1)
+
+    def test_created_posts_are_searchable(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.bulk([self.item('검색되는 제목')])
+        self.assertEqual(response.status_code, 201)
+        search = self.client.get('/post/search/', {'q': '검색되는'}).json()
+        self.assertEqual([row['id'] for row in search['data']], [response.json()['data'][0]['id']])
+
+
+class CommentBulkCreateTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.post = Post.objects.create(title='첫 글', content='본문', user=self.user)
+        self.other = Post.objects.create(title='둘째 글', content='본문', user=self.user)
+
+    def bulk(self, items):
+        return self.client.post('/post/comments/bulk/', items, content_type='application/json')
+
+    def item(self, post, body='열다섯 글자가 넘는 댓글 내용입니다', author='작성자'):
+        return {'post': post.id, 'author': author, 'body': body}
+
+    def test_creates_comments_and_updates_counts(self):
+        response = self.bulk([self.item(self.post), self.item(self.post), self.item(self.other)])
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual(body['count'], 3)
+        for row in body['data']:
+            self.assertEqual(Comment.objects.get(c_id=row['c_id']).post_id, row['post'])
+        self.post.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual((self.post.comment_count, self.other.comment_count), (2, 1))
+
+    def test_invalid_items_are_reported_by_index(self):
+        response = self.bulk([
+            self.item(self.post),
+            {'post': 999999, 'author': '작성자', 'body': '열다섯 글자가 넘는 댓글 내용입니다'},
+            {'post': self.post.id, 'author': '작성자'},
+            self.item(self.post, body='짧은 댓글'),
+            {'post': self.post.id, 'author': 12345, 'body': ['열다섯 글자가 넘는 댓글 내용입니다']},
+        ])
+        body = response.json()
+        self.assertEqual([row['index'] for row in body['data']], [0])
+        self.assertEqual([error['index'] for error in body['errors']], [1, 2, 3, 4])
+        self.assertIn('post', body['errors'][0]['errors'])
+        self.assertIn('non_field_errors', body['errors'][1]['errors'])
+        self.assertIn('body', body['errors'][2]['errors'])
+        self.assertEqual(set(body['errors'][3]['errors']), {'author', 'body'})
+
+    def test_ids_are_read_back_when_bulk_insert_returns_none(self):
+        bulk_create = Comment.objects.bulk_create
+
+        def without_ids(objs, **kwargs):
+            # INSERT 후 pk를 돌려주지 않는 DB(MySQL)와 같은 상황
+            result = bulk_create(objs, **kwargs)
+            for obj in objs:
+                obj.c_id = None
+            return result
+
+        Comment.objects.create(post=self.post, author='작성자', body='열다섯 글자가 넘는 댓글 내용입니다')
+        items = [self.item(self.post), self.item(self.other), self.item(self.post), self.item(self.post, author='다른 사람')]
+        with mock.patch.object(Comment.objects, 'bulk_create', side_effect=without_ids):
+            response = self.bulk(items)
+        rows = response.json()['data']
+        self.assertEqual(len({row['c_id'] for row in rows}), 4)
+        for item, row in zip(items, rows):
+            comment = Comment.objects.get(c_id=row['c_id'])
+            self.assertEqual((comment.post_id, comment.author), (item['post'], item['author']))
+
+
+class CommentCountTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.post = Post.objects.create(title='첫 글', content='본문', user=self.user)
+        self.other = Post.objects.create(title='둘째 글', content='본문', user=self.user)
+
+    def count(self, post):
+        return Post.objects.values_list('comment_count', flat=True).get(pk=post.pk)
+
+    def reconcile(self, *args):
+        out = StringIO()
+        call_command('reconcile_comment_counts', *args, stdout=out)
+        return out.getvalue()
+
+    def test_create_and_delete_keep_count(self):
+        first = Comment.objects.create(post=self.post, author='a', body='댓글')
+        Comment.objects.create(post=self.post, author='b', body='댓글')
+        self.assertEqual(self.count(self.post), 2)
+        first.delete()
+        self.assertEqual(self.count(self.post), 1)
+
+    def test_count_does_not_go_negative(self):
+        comment = Comment.objects.create(post=self.post, author='a', body='댓글')
+        Post.objects.filter(pk=self.post.pk).update(comment_count=0)
+        comment.delete()
+        self.assertEqual(self.count(self.post), 0)
+
+    def test_reconcile_fixes_drift(self):
+        Comment.objects.create(post=self.post, author='a', body='댓글')
+        Comment.objects.create(post=self.post, author='b', body='댓글')
+        Post.objects.filter(pk=self.post.pk).update(comment_count=7)
+        Post.objects.filter(pk=self.other.pk).update(comment_count=3)
+
+        output = self.reconcile('--dry-run')
+        self.assertIn(f'post {self.post.id}: 7 -> 2', output)
+        self.assertEqual(self.count(self.post), 7)
+
+        self.reconcile('--batch-size', '1')
+        self.assertEqual((self.count(self.post), self.count(self.other)), (2, 0))
+        self.assertIn('수정한 게시글: 0개', self.reconcile())
+
+    def test_reconcile_invalidates_detail_cache(self):
+        self.assertEqual(self.client.get(f'/post/{self.post.id}/').json()['comment_count'], 0)
+        # 시그널 없이 들어간 댓글: 저장된 값과 캐시 모두 0
+        Comment.objects.bulk_create([Comment(post=self.post, author='a', body='댓글')])
+        self.assertEqual(self.client.get(f'/post/{self.post.id}/').json()['comment_count'], 0)
+        self.reconcile()
+        self.assertEqual(self.client.get(f'/post/{self.post.id}/').json()['comment_count'], 1)
+
+
+class SearchTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.title_hit = Post.objects.create(title='장고 입문', content='웹 프레임워크를 배웁니다', user=self.user)
+            self.content_hit = Post.objects.create(title='파이썬 공부', content='오늘은 장고는 처음 써 봤다', user=self.user)
+            self.other = Post.objects.create(title='리액트 입문', content='프론트엔드 이야기', user=self.user)
+
+    def search(self, q, **params):
+        response = self.client.get('/post/search/', {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_korean_particles_match_and_title_ranks_first(self):
+        body = self.search('장고')
+        self.assertEqual([row['id'] for row in body['data']], [self.title_hit.id, self.content_hit.id])
+        self.assertEqual(body['total'], 2)
+        self.assertEqual([row['id'] for row in self.search('장고는')['data']], [self.content_hit.id])
+
+    def test_all_words_must_match(self):
+        self.assertEqual([row['id'] for row in self.search('입문 리액트')['data']], [self.other.id])
+        self.assertEqual(self.search('입문 없는단어')['data'], [])
+
+    def test_highlight_marks_match_and_escapes_html(self):
+        row = self.search('장고')['data'][1]
+        self.assertEqual(row['highlight']['content'], '오늘은 <mark>장고</mark>는 처음 써 봤다')
+        self.assertEqual(search.highlight('<b>장고</b>', '장고'), '&lt;b&gt;<mark>장고</mark>&lt;/b&gt;')
+        snippet = search.highlight('가' * 100 + ' 장고 ' + '나' * 100, '장고', max_length=20)
+        self.assertTrue(snippet.startswith('…') and snippet.endswith('…'))
+        self.assertIn('<mark>장고</mark>', snippet)
+
+    def test_edit_and_delete_update_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.title = '장고 심화'
+            self.other.save()
+            self.title_hit.delete()
+        self.assertEqual({row['id'] for row in self.search('장고')['data']}, {self.other.id, self.content_hit.id})
+
+    def test_missing_query_is_rejected(self):
+        self.assertEqual(self.client.get('/post/search/').status_code, 400)
+
+    def test_mixed_script_words_are_split(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            mixed = Post.objects.create(title='Django는 처음', content='본문입니다', user=self.user)
+        self.assertEqual([row['id'] for row in self.search('django')['data']], [mixed.id])
+        self.assertEqual([row['id'] for row in self.search('DJANGO는')['data']], [mixed.id])
+        self.assertEqual(self.search('django')['data'][0]['highlight']['title'], '<mark>Django</mark>는 처음')
+
+    def test_single_syllable_query_matches_inside_word(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            meal = Post.objects.create(title='점심 메뉴', content='오늘은 밥을 먹었다', user=self.user)
+        self.assertEqual([row['id'] for row in self.search('밥')['data']], [meal.id])
+
+    def test_memory_index_picks_up_other_process_changes_after_ttl(self):
+        self.search('장고')
+        # 시그널 없이 바뀐 행 (다른 워커 프로세스의 변경과 같은 상황)
+        Post.objects.bulk_create([Post(title='장고 배포', content='본문', user=self.user)])
+        self.assertEqual(self.search('배포')['data'], [])
+        with self.settings(SEARCH_INDEX_TTL=0):
+            self.assertEqual(len(self.search('배포')['data']), 1)
+
+
+class Fts5SearchBackendTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        override = self.settings(SEARCH_INDEX_PATH=Path(directory.name) / 'search.sqlite3')
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = self.make_user()
+        self.title_hit = Post.objects.create(title='장고 입문', content='웹 프레임워크를 배웁니다', user=self.user)
+        self.content_hit = Post.objects.create(title='파이썬 공부', content='오늘은 장고는 처음 써 봤다', user=self.user)
+        self.backend = search.Fts5SearchBackend()
+
+    def test_same_ranking_as_memory_backend(self):
+        memory = search.InMemorySearchBackend()
+        for query in ('장고', '장고는', '입문', '장', 'django'):
+            self.assertEqual(
+                [post_id for post_id, _ in self.backend.search(query)[1]],
+                [post_id for post_id, _ in memory.search(query)[1]],
+            )
+
+    def test_failed_index_is_rolled_back(self):
+        self.backend.search('장고')
+        with mock.patch.object(self.backend, '_terms', side_effect=['장고', RuntimeError]):
+            with self.assertRaises(RuntimeError):
+                self.backend.index(self.title_hit.id, '바뀐 제목', '바뀐 본문')
+        self.assertFalse(self.backend._connect().in_transaction)
+        # 앞의 DELETE도 취소되어 기존 색인이 남아 있다
+        self.assertEqual(self.backend.search('입문')[0], 1)
+
+        self.backend.remove(self.title_hit.id)
+        self.assertEqual(self.backend.search('입문')[0], 0)
+
+
+class TitleAutocompleteTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.posts = {
+                title: Post.objects.create(title=title, content='본문', user=self.user)
+                for title in ('Django 입문', 'django 심화', '장고 입문', '장고 배포', 'Flask 입문')
+            }
+
+    def complete(self, q, **params):
+        response = self.client.get('/post/autocomplete/', {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['title'] for row in response.json()['data']]
+
+    def test_prefix_is_case_insensitive_and_sorted(self):
+        self.assertEqual(self.complete('DJ'), ['django 심화', 'Django 입문'])
+        self.assertEqual(self.complete('장고'), ['장고 배포', '장고 입문'])
+        self.assertEqual(self.complete('장고', limit=1), ['장고 배포'])
+        self.assertEqual(self.complete(''), [])
+
+    def test_edit_and_delete_update_index(self):
+        self.complete('장고')
+        with self.captureOnCommitCallbacks(execute=True):
+            post = self.posts['장고 배포']
+            post.title = 'Flask 배포'
+            post.save()
+            self.posts['Flask 입문'].delete()
+        self.assertEqual(self.complete('장고'), ['장고 입문'])
+        self.assertEqual(self.complete('flask'), ['Flask 배포'])
+
+    def test_other_process_changes_are_picked_up_after_ttl(self):
+        self.complete('장고')
+        Post.objects.bulk_create([Post(title='장고 테스트', content='본문', user=self.user)])
+        self.assertEqual(self.complete('장고 테'), [])
+
+        with self.settings(TITLE_INDEX_TTL=0), mock.patch('posts.autocomplete.run_in_background') as background:
+            # 요청은 다시 만드는 것을 기다리지 않고 이전 인덱스로 답한다
+            with self.assertNumQueries(0):
+                self.assertEqual(self.complete('장고 테'), [])
+            # 이미 다시 만드는 중이면 또 시작하지 않는다
+            self.complete('장고')
+            background.assert_called_once()
+            rebuild, name = background.call_args.args
+            rebuild()
+        self.assertEqual(self.complete('장고 테'), ['장고 테스트'])
+
+    def test_rebuild_started_before_invalidate_is_discarded(self):
+        self.complete('장고')
+        values_list = Post.objects.values_list
+
+        def read_then_invalidate(*args, **kwargs):
+            rows = list(values_list(*args, **kwargs))
+            title_index.invalidate()
+            Post.objects.bulk_create([Post(title='장고 신규', content='본문', user=self.user)])
+            return mock.Mock(iterator=mock.Mock(return_value=iter(rows)))
+
+        with mock.patch.object(Post.objects, 'values_list', side_effect=read_then_invalidate):
+            title_index.rebuild()
+        # 읽은 결과를 버렸으므로 다음 조회 때 DB에서 다시 만든다
+        self.assertEqual(self.complete('장고'), ['장고 배포', '장고 신규', '장고 입문'])
+
+    def test_changes_during_rebuild_are_replayed(self):
+        values_list = Post.objects.values_list
+        removed = self.posts['Flask 입문']
+
+        def read_then_change(*args, **kwargs):
+            rows = list(values_list(*args, **kwargs))
+            # DB를 읽은 뒤, 새 인덱스로 바꾸기 전에 커밋된 변경
+            Post.objects.bulk_create([Post(title='장고 신규', content='본문', user=self.user)])
+            new = Post.objects.get(title='장고 신규')
+            title_index.add(new.id, new.title)
+            title_index.remove(removed.id)
+            return mock.Mock(iterator=mock.Mock(return_value=iter(rows)))
+
+        with mock.patch.object(Post.objects, 'values_list', side_effect=read_then_change):
+            title_index.rebuild()
+        self.assertEqual(self.complete('장고'), ['장고 배포', '장고 신규', '장고 입문'])
+        self.assertEqual(self.complete('flask'), [])
+
+
+class FastSerializerTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.posts = [
+            Post.objects.create(title='첫 글', content='본문 <b>html</b>', user=self.user),
+            Post.objects.create(title='둘째 글', content='본문', user=self.user, status='PUBLISHED'),
+        ]
+        # 마이크로초가 0인 시각과 아닌 시각 모두 확인
+        Post.objects.filter(pk=self.posts[0].pk).update(created=timezone.now().replace(microsecond=0))
+        for post in self.posts:
+            Comment.objects.create(post=post, author='작성자', body='댓글 내용')
+
+    def assert_same_output(self, fast, serializer_class, queryset):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        self.assertEqual(JSONRenderer().render(fast.to_representation(fast.values(queryset))), expected)
+
+    def test_post_output_matches_serializer(self):
+        self.assert_same_output(post_fast, PostSerializer, Post.objects.order_by('id'))
+
+    def test_comment_output_matches_serializer(self):
+        self.assert_same_output(comment_fast, CommentSerializer, Comment.objects.order_by('c_id'))
+
+    def test_output_matches_in_other_timezone(self):
+        with timezone.override('Asia/Seoul'):
+            self.assert_same_output(post_fast, PostSerializer, Post.objects.order_by('id'))
+            self.assert_same_output(comment_fast, CommentSerializer, Comment.objects.order_by('c_id'))
+
+    def test_first(self):
+        post = Post.objects.get(pk=self.posts[1].pk)
+        self.assertEqual(post_fast.first(Post.objects.filter(pk=post.pk)), PostSerializer(post).data)
+        self.assertEqual(
+            async_to_sync(post_fast.afirst)(Post.objects.filter(pk=post.pk)), PostSerializer(post).data,
+        )
+        self.assertIsNone(post_fast.first(Post.objects.none()))
+
+
+class StorageTests(S3APITestCase):
+
+    def get_object(self, key):
+        return self.s3.get_object(Bucket=self.bucket, Key=key)
+
+    def test_upload_fileobj(self):
+        storage.upload_fileobj(BytesIO(b'image-bytes'), 'uploads/a.png', 'image/png')
+        obj = self.get_object('uploads/a.png')
+        self.assertEqual(obj['Body'].read(), b'image-bytes')
+        self.assertEqual(obj['ContentType'], 'image/png')
+
+    def test_large_file_is_uploaded_in_parts(self):
+        # S3의 최소 part 크기(5MB)로 낮춰서 11MB 파일이 3개 part로 나뉘게 한다
+        part = 5 * 1024 * 1024
+        data = bytes(range(256)) * (11 * 1024 * 1024 // 256)
+        with self.settings(AWS_S3_MULTIPART_THRESHOLD=part, AWS_S3_MULTIPART_CHUNKSIZE=part):
+            storage.upload_fileobj(BytesIO(data), 'uploads/big.bin')
+        obj = self.get_object('uploads/big.bin')
+        self.assertEqual(obj['Body'].read(), data)
+        self.assertTrue(obj['ETag'].endswith('-3"')) # multipart 업로드의 ETag는 "<해시>-<part 수>"
+
+    def test_client_is_reused(self):
+        self.assertIs(storage.get_s3_client(), self.s3)
+
+    def test_presigned_upload(self):
+        presigned = storage.presigned_upload('uploads/b.png', 'image/png', max_size=1024, expires_in=60)
+        self.assertEqual(presigned['fields']['key'], 'uploads/b.png')
+        self.assertEqual(presigned['fields']['Content-Type'], 'image/png')
+        self.assertIn('policy', presigned['fields'])
+
+        response = requests.post(
+            presigned['url'], data=presigned['fields'], files={'file': ('b.png', b'png-bytes', 'image/png')},
+        )
+        self.assertLess(response.status_code, 300)
+
+        head = storage.head_upload('uploads/b.png')
+        self.assertEqual(head['ContentLength'], len(b'png-bytes'))
+        self.assertEqual(head['ContentType'], 'image/png')
+
+    def test_head_upload_missing(self):
+        self.assertIsNone(storage.head_upload('uploads/missing.png'))
+
+    def test_object_url(self):
+        self.assertEqual(
+            storage.object_url('uploads/a.png'), 'https://cjkim.s3.ap-northeast-2.amazonaws.com/uploads/a.png',
+        )
+
+
+class PresignedUploadTests(S3APITestCase):
+
+    def presign(self, filename='photo.png', content_type='image/png'):
+        response = self.client.post('/post/upload/presign/', {'filename': filename, 'content_type': content_type}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    def upload(self, data, content=b'png-bytes'):
+        response = requests.post(data['url'], data=data['fields'], files={'file': ('photo.png', content, 'image/png')})
+        self.assertLess(response.status_code, 300)
+
+    def complete(self, token):
+        return self.client.post('/post/upload/complete/', {'upload_token': token}, format='json')
+
+    def test_presign_upload_complete(self):
+        data = self.presign()
+        self.assertTrue(data['key'].startswith('uploads/photo_'))
+        self.upload(data)
+
+        response = self.complete(data['upload_token'])
+        self.assertEqual(response.status_code, 201)
+        image = Image.objects.get(pk=response.json()['id'])
+        self.assertEqual(image.storage_key, data['key'])
+        self.assertEqual(image.image_url, storage.object_url(data['key']))
+
+        # 같은 토큰으로 다시 호출하면 기존 이미지
+        again = self.complete(data['upload_token'])
+        self.assertEqual((again.status_code, again.json()['id']), (200, image.pk))
+        self.assertEqual(Image.objects.count(), 1)
+
+    def test_presign_rejects_content_type(self):
+        response = self.client.post('/post/upload/presign/', {'filename': 'a.exe', 'content_type': 'application/x-msdownload'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_complete_requires_token(self):
+        self.assertEqual(self.client.post('/post/upload/complete/', {'key': 'uploads/photo.png'}, format='json').status_code, 400)
+
+    def test_complete_rejects_unsigned_key(self):
+        # 다른 사람이 올린 객체를 key만 알고 등록하려는 경우
+        self.s3.put_object(Bucket=self.bucket, Key='uploads/other.png', Body=b'png', ContentType='image/png')
+        forged = signing.dumps('uploads/other.png', salt='other-salt')
+        for token in ('uploads/other.png', forged):
+            response = self.complete(token)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()['error']['code'], 'INVALID_UPLOAD_TOKEN')
+        self.assertFalse(Image.objects.exists())
+
+    def test_complete_rejects_expired_token(self):
+        data = self.presign()
+        self.upload(data)
+        with self.settings(IMAGE_UPLOAD_TOKEN_MAX_AGE=-1):
+            response = self.complete(data['upload_token'])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error']['code'], 'INVALID_UPLOAD_TOKEN')
+
+    def test_complete_before_upload(self):
+        data = self.presign()
+        self.assertEqual(self.complete(data['upload_token']).status_code, 404)
+        self.assertFalse(Image.objects.exists())
+
+    def test_complete_records_content_hash(self):
+        data = self.presign()
+        self.upload(data, b'png-bytes')
+        image = Image.objects.get(pk=self.complete(data['upload_token']).json()['id'])
+        self.assertEqual(image.content_hash, hashlib.sha256(b'png-bytes').hexdigest())
+
+    def test_complete_deduplicates_same_content(self):
+        first = self.presign()
+        self.upload(first, b'same-bytes')
+        first_id = self.complete(first['upload_token']).json()['id']
+
+        second = self.presign()
+        self.upload(second, b'same-bytes')
+        response = self.complete(second['upload_token'])
+        self.assertEqual((response.status_code, response.json()['id']), (200, first_id))
+        self.assertEqual(Image.objects.count(), 1)
+        # 중복된 두 번째 객체는 지워진다
+        self.assertIsNone(storage.head_upload(second['key']))
+        self.assertIsNotNone(storage.head_upload(first['key']))
+
+    def test_concurrent_complete_creates_one_image(self):
+        data = self.presign()
+        self.upload(data)
+        head_upload = storage.head_upload
+
+        def head_then_race(key):
+            # 이 요청이 S3를 확인하는 사이에 다른 요청이 같은 key로 먼저 저장
+            Image.objects.create(image_url=storage.object_url(key), storage_key=key)
+            return head_upload(key)
+
+        with mock.patch('posts.views.head_upload', side_effect=head_then_race):
+            response = self.complete(data['upload_token'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Image.objects.get().pk, response.json()['id'])
+
+
+class ImageUploadTests(S3APITestCase):
+
+    def upload(self, content, name='photo.png'):
+        return self.client.post(
+            '/post/upload/', {'image': SimpleUploadedFile(name, content, content_type='image/png')}, format='multipart',
+        )
+
+    def test_hash_is_computed_while_reading_upload(self):
+        handler = ContentHashUploadHandler()
+        handler.new_file('image', 'photo.png', 'image/png', 10)
+        for start, chunk in ((0, b'png-'), (4, b'bytes')):
+            self.assertEqual(handler.receive_data_chunk(chunk, start), chunk) # 다음 핸들러로 그대로 넘긴다
+        self.assertIsNone(handler.file_complete(9))
+        self.assertEqual(handler.hexdigest('image'), hashlib.sha256(b'png-bytes').hexdigest())
+        self.assertIsNone(handler.hexdigest('other'))
+
+    def test_upload_stores_content_addressed_object(self):
+        response = self.upload(b'png-bytes')
+        self.assertEqual(response.status_code, 201)
+        content_hash = hashlib.sha256(b'png-bytes').hexdigest()
+        image = Image.objects.get(pk=response.json()['id'])
+        self.assertEqual((image.content_hash, image.storage_key), (content_hash, f'uploads/{content_hash}.png'))
+        obj = self.s3.get_object(Bucket=self.bucket, Key=image.storage_key)
+        self.assertEqual((obj['Body'].read(), obj['ContentType']), (b'png-bytes', 'image/png'))
+
+    def test_same_content_is_not_uploaded_again(self):
+        first = self.upload(b'png-bytes').json()
+        with mock.patch('posts.views.upload_fileobj') as upload_fileobj:
+            response = self.upload(b'png-bytes', name='copy.png')
+        upload_fileobj.assert_not_called()
+        self.assertEqual((response.status_code, response.json()['id']), (200, first['id']))
+        self.assertEqual(Image.objects.count(), 1)
+
+    def test_missing_file(self):
+        self.assertEqual(self.client.post('/post/upload/', {}, format='multipart').status_code, 400)
+
+    def test_variant_task_is_queued_with_image(self):
+        image = Image.objects.get(pk=self.upload(b'png-bytes').json()['id'])
+        queued = Task.objects.get(name='posts.generate_image_variants')
+        self.assertEqual(queued.args, [image.pk, image.storage_key])
+
+    def test_image_is_rolled_back_when_enqueue_fails(self):
+        # 작업을 넣지 못하면 파생본이 영원히 안 만들어지는 Image도 남기지 않는다
+        self.client.raise_request_exception = False
+        with mock.patch('posts.views.schedule_image_variants', side_effect=RuntimeError('queue down')):
+            self.assertEqual(self.upload(b'png-bytes').status_code, 500)
+        self.assertFalse(Image.objects.exists())
+        self.assertFalse(Task.objects.exists())
+
+
+@override_settings(IMAGE_VARIANT_WIDTHS=(40, 100, 400), IMAGE_VARIANT_FORMATS=('webp', 'jpeg'))
+class ImageVariantTests(S3APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        # 이전 테스트의 moto 상태에 묶인 클라이언트를 다시 쓰지 않도록 비운다
+        imaging._clients.clear()
+        self.addCleanup(imaging._clients.clear)
+
+    def put_image(self, img, key='uploads/photo.png'):
+        buffer = BytesIO()
+        img.save(buffer, 'PNG')
+        return self.put_object(buffer.getvalue(), key)
+
+    def put_object(self, body, key):
+        self.s3.put_object(Bucket=self.bucket, Key=key, Body=body)
+        return Image.objects.create(image_url=storage.object_url(key), storage_key=key)
+
+    def open_object(self, key):
+        obj = self.s3.get_object(Bucket=self.bucket, Key=key)
+        return obj['ContentType'], PILImage.open(BytesIO(obj['Body'].read()))
+
+    def object_keys(self):
+        return sorted(obj['Key'] for obj in self.s3.list_objects_v2(Bucket=self.bucket).get('Contents', []))
+
+    def test_variants_are_saved_for_each_width_and_format(self):
+        image = self.put_image(PILImage.new('RGB', (200, 100), (200, 30, 30)))
+        generate_image_variants(image.pk, image.storage_key)
+
+        # 원본(200px)보다 넓은 400px은 만들지 않는다
+        self.assertEqual(
+            sorted(ImageVariant.objects.filter(image=image).values_list('width', 'height', 'format', 'image_url')),
+            [
+                (40, 20, 'jpeg', storage.object_url('uploads/photo_40w.jpg')),
+                (40, 20, 'webp', storage.object_url('uploads/photo_40w.webp')),
+                (100, 50, 'jpeg', storage.object_url('uploads/photo_100w.jpg')),
+                (100, 50, 'webp', storage.object_url('uploads/photo_100w.webp')),
+            ],
+        )
+        self.assertEqual(self.object_keys(), [
+            'uploads/photo.png', 'uploads/photo_100w.jpg', 'uploads/photo_100w.webp',
+            'uploads/photo_40w.jpg', 'uploads/photo_40w.webp',
+        ])
+        for key, expected in (
+            ('uploads/photo_100w.webp', ('image/webp', 'WEBP', (100, 50))),
+            ('uploads/photo_40w.jpg', ('image/jpeg', 'JPEG', (40, 20))),
+        ):
+            content_type, img = self.open_object(key)
+            self.assertEqual((content_type, img.format, img.size), expected)
+
+        variant = ImageVariant.objects.get(image=image, width=100, format='webp')
+        self.assertEqual(variant.size, self.s3.head_object(Bucket=self.bucket, Key='uploads/photo_100w.webp')['ContentLength'])
+
+        # 작업이 다시 실행되어도 행이 늘어나지 않는다
+        generate_image_variants(image.pk, image.storage_key)
+        self.assertEqual(ImageVariant.objects.filter(image=image).count(), 4)
+
+    def test_small_image_is_not_upscaled(self):
+        image = self.put_image(PILImage.new('RGB', (40, 30)))
+        generate_image_variants(image.pk, image.storage_key)
+        self.assertFalse(ImageVariant.objects.exists())
+        self.assertEqual(self.object_keys(), ['uploads/photo.png'])
+
+    def test_transparent_images_are_flattened_to_white_jpeg(self):
+        rgba = PILImage.new('RGBA', (200, 100), (0, 0, 255, 0))
+        la = PILImage.new('LA', (200, 100), (0, 0))
+        palette = PILImage.new('P', (200, 100), 0)
+        palette.putpalette([0, 0, 255] * 256)
+        palette.info['transparency'] = 0
+
+        for mode, img in (('RGBA', rgba), ('LA', la), ('P', palette)):
+            with self.subTest(mode=mode):
+                key = f'uploads/{mode.lower()}.png'
+                image = self.put_image(img, key)
+                generate_image_variants(image.pk, key)
+
+                _, jpeg = self.open_object(key.replace('.png', '_100w.jpg'))
+                self.assertEqual(jpeg.mode, 'RGB')
+                # 투명한 부분은 흰 배경으로 합성된다 (JPEG 손실 압축 오차 허용)
+                self.assertTrue(all(channel >= 250 for channel in jpeg.getpixel((50, 25))))
+                self.assertEqual(ImageVariant.objects.filter(image=image).count(), 4)
+
+    def test_non_image_object_fails_without_variants(self):
+        image = self.put_object(b'not an image', 'uploads/broken.png')
+        with self.assertRaises(UnidentifiedImageError):
+            generate_image_variants(image.pk, image.storage_key)
+        self.assertFalse(ImageVariant.objects.exists())
+        self.assertEqual(self.object_keys(), ['uploads/broken.png'])
+
+    def test_truncated_image_fails_without_variants(self):
+        buffer = BytesIO()
+        PILImage.new('RGB', (200, 100), (200, 30, 30)).save(buffer, 'PNG')
+        image = self.put_object(buffer.getvalue()[:60], 'uploads/truncated.png')
+        with self.assertRaises(OSError):
+            generate_image_variants(image.pk, image.storage_key)
+        self.assertFalse(ImageVariant.objects.exists())
+        self.assertEqual(self.object_keys(), ['uploads/truncated.png'])
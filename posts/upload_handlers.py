@@ -0,0 +1,37 @@
+import hashlib
+
+from django.core.files.uploadhandler import FileUploadHandler
+
+
+# 업로드되는 파일의 SHA-256을 multipart 본문을 읽는 동안 chunk 단위로 계산하는 업로드 핸들러
+# 파일을 다시 읽지 않고 해시를 얻기 위해 기본 핸들러(메모리/임시 파일) 앞에 넣는다.
+# chunk는 그대로 다음 핸들러로 넘기므로 파일 저장 방식은 바뀌지 않는다.
+#
+# 사용: request.FILES에 처음 접근하기 전에
+#     handler = ContentHashUploadHandler(request)
+#     request.upload_handlers.insert(0, handler)
+#     ... request.FILES['image'] ...
+#     handler.hexdigest('image')
+
+class ContentHashUploadHandler(FileUploadHandler):
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self._hasher = None
+        self.hashes = {} # field_name -> sha256 hex
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self._hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self._hasher.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.hashes[self.field_name] = self._hasher.hexdigest()
+        self._hasher = None
+        return None # 파일 객체는 다음 핸들러가 만든다
+
+    def hexdigest(self, field_name):
+        return self.hashes.get(field_name)
@@ -1,5 +1,8 @@
 from django.urls import path
 from posts.views import *
+from posts.async_views import (
+    AsyncPostList, AsyncPostDetail, AsyncCommentList, AsyncPostCommentList, async_filter_post_by_category,
+)
 
 urlpatterns = [
     #path('', hello_world, name = 'hello_world'),
@@ -9,15 +12,29 @@ urlpatterns = [
     #path('<int:post_id>/', post_detail, name='post_detail'), # Post 단일 조회
 
     path('', PostList.as_view()), # post 전체 조회
+    path('bulk/', PostBulkCreate.as_view(), name='post-bulk-create'), # post 일괄 생성
+    path('search/', PostSearch.as_view(), name='post-search'), # post 전문 검색
+    path('autocomplete/', PostTitleAutocomplete.as_view(), name='post-title-autocomplete'), # post 제목 자동완성
     path('<int:post_id>/', PostDetail.as_view()), # post 개별 조회, 13주차 실습
 
     # 댓글 관련 URL 패턴
     path('comments/', CommentList.as_view(), name='comment-list'),  # 댓글 전체 조회/생성
+    path('comments/bulk/', CommentBulkCreate.as_view(), name='comment-bulk-create'),  # 댓글 일괄 생성
     path('comments/<int:comment_id>/', CommentDetail.as_view(), name='comment-detail'),  # 댓글 상세 조회
     path('<int:post_id>/comments/', PostCommentList.as_view(), name='post-comment-list'),  # 특정 게시글의 댓글 목록
 
     #path('comment/<int:post_id>/', check_comment, name="check_comment"), # 특정 comment를 조회하기
     path('filter/<int:category>/', filter_post_by_category, name="filter_post_by_category"),
-    path('upload/', ImageUploadView.as_view(), name='image-upload')
+    path('filter/', PostCategoryFilter.as_view(), name="post-category-filter"), # 여러 카테고리 AND/OR 필터
+    path('upload/', ImageUploadView.as_view(), name='image-upload'),
+    path('upload/presign/', ImagePresignView.as_view(), name='image-upload-presign'), # S3 직접 업로드 URL 발급
+    path('upload/complete/', ImageUploadCompleteView.as_view(), name='image-upload-complete'), # S3 직접 업로드 완료
+
+    # 읽기 전용 async 버전 (ASGI 서버용, posts/async_views.py)
+    path('async/', AsyncPostList.as_view(), name='async-post-list'),
+    path('async/<int:post_id>/', AsyncPostDetail.as_view(), name='async-post-detail'),
+    path('async/comments/', AsyncCommentList.as_view(), name='async-comment-list'),
+    path('async/<int:post_id>/comments/', AsyncPostCommentList.as_view(), name='async-post-comment-list'),
+    path('async/filter/<int:category>/', async_filter_post_by_category, name='async-filter-post-by-category'),
 
 ]
\ No newline at end of file
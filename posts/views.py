@@ -30,6 +30,48 @@ import uuid # 고유 식별 id를 만들기 위한 import uuid
 import os
 
 from config.custom_exceptions import *
+from .pagination import KeysetPaginator # 커서 기반 페이지네이션
+from .category_index import category_index, id_chunks # 카테고리별 post id 메모리 인덱스
+from .streaming import get_stream_format, iter_rows, streaming_response # 목록 스트리밍
+from .fast_serializers import post_fast, comment_fast # 읽기 전용 빠른 직렬화
+from .cache import post_cache, comment_cache # 상세 조회 캐시
+from .conditional import post_etag, post_last_modified, post_comments_etag, post_comments_last_modified # 조건부 GET
+from .bulk import bulk_create_posts, bulk_create_comments # 일괄 작성
+from .search import get_search_backend, highlight # 전문 검색
+from .autocomplete import title_index # 제목 자동완성
+from .storage import build_upload_key, content_upload_key, object_url, upload_fileobj, presigned_upload, head_upload, hash_upload, delete_upload, sign_upload_key, unsign_upload_key # S3 업로드
+from .upload_handlers import ContentHashUploadHandler # 업로드 중 SHA-256 계산
+from config.throttling import IPTokenBucketThrottle, UserTokenBucketThrottle # 요청 제한 (settings.RATE_LIMITS)
+from .derivatives import schedule_image_variants # 이미지 파생본(썸네일) 생성
+from django.db import transaction, IntegrityError
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from django.core import signing
+from config.custom_api_exceptions import ValidationErrorException, RequiredFieldException, UploadNotFoundException, InvalidUploadTokenException
+
+# 목록 조회 API 공통 swagger 파라미터
+CURSOR_PARAM = openapi.Parameter(
+    name="cursor",
+    in_=openapi.IN_QUERY,
+    type=openapi.TYPE_STRING,
+    description="이전 응답의 next/prev 커서",
+    required=False
+)
+PAGE_SIZE_PARAM = openapi.Parameter(
+    name="page_size",
+    in_=openapi.IN_QUERY,
+    type=openapi.TYPE_INTEGER,
+    description="페이지당 개수 (기본 20, 최대 100)",
+    required=False
+)
+STREAM_PARAM = openapi.Parameter(
+    name="stream",
+    in_=openapi.IN_QUERY,
+    type=openapi.TYPE_STRING,
+    enum=["1", "ndjson"],
+    description="1: 전체 목록을 JSON 배열로 스트리밍, ndjson: 한 줄에 하나씩 스트리밍 (페이지네이션 무시)",
+    required=False
+)
 
 # class PostList(APIView):
 #     def post(self, request, format=None):
@@ -156,6 +198,20 @@ def post_list(request):
      # 게시글 전체 조회
      if request.method == "GET":
         post_all = Post.objects.all()
+
+        # ?stream=1|ndjson 이면 목록을 만들지 않고 바로 흘려보낸다
+        stream_format = get_stream_format(request)
+        if stream_format:
+            rows = iter_rows(post_all.order_by('-created', '-id'), lambda chunk: (
+                {
+                    "id": post.id,
+                    "title" : post.title,
+                    "content": post.content,
+                    "status": post.status,
+                    "user": post.user_id
+                } for post in chunk
+            ))
+            return streaming_response(rows, stream_format, {'status': 200, 'message': '게시글 목록 조회 성공'})
     
 		# 각 데이터를 Json 형식으로 변환하여 리스트에 저장
         post_json_all = []
@@ -270,21 +326,21 @@ def check_comment(request, post_id):
 @require_http_methods(["GET"])
 def filter_post_by_category(request, category):
     if request.method == "GET":
-        #Base_Model에 있는 생성 시각 가져와서 오름차순
-        linker_cat_post = cat_post_linker.objects.filter(category_id = category).order_by('-post__created')
-        post_filtered = [link.post for link in linker_cat_post] # 걸러진 post들을 위한 dictionary
-
+        # 최신순(id 내림차순, 패싯 필터 /post/filter/와 같은 순서)
+        # 카테고리 인덱스에서 post id를 꺼낸 뒤 CATEGORY_FILTER_CHUNK_SIZE개씩 묶어서 가져온다 (N+1 제거, IN 절 크기 제한)
         post_filtered_json_all = [] #모든 json을 dictionary로 받는다
 
-        for fp in post_filtered : 
-            post_filtered_json = {
-                "id" : fp.id,
-                "title" : fp.title,
-                "content" : fp.content,
-                "status" : fp.status,
-                "user" : fp.user.id,
-            }
-            post_filtered_json_all.append(post_filtered_json)
+        for chunk in id_chunks(category_index.post_ids(category)):
+            post_filtered = Post.objects.filter(id__in=chunk).order_by('-id')
+            for fp in post_filtered : 
+                post_filtered_json = {
+                    "id" : fp.id,
+                    "title" : fp.title,
+                    "content" : fp.content,
+                    "status" : fp.status,
+                    "user" : fp.user_id,
+                }
+                post_filtered_json_all.append(post_filtered_json)
 
         return JsonResponse({
             'status': 200,
@@ -292,6 +348,94 @@ def filter_post_by_category(request, category):
             'date' : post_filtered_json_all
         })
 
+# 여러 카테고리를 AND/OR로 조합하고 status로 거르는 패싯 필터
+class PostCategoryFilter(APIView):
+    @swagger_auto_schema(
+        operation_summary="카테고리 패싯 필터",
+        operation_description="여러 카테고리를 AND/OR로 조합하고 상태(status)로 걸러서 게시글을 최신순으로 조회합니다.",
+        manual_parameters=[
+            openapi.Parameter(
+                name="category",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="카테고리 id 목록 (예: 1,2,3)",
+                required=True
+            ),
+            openapi.Parameter(
+                name="mode",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=["and", "or"],
+                description="and: 모든 카테고리에 속한 게시글, or: 하나라도 속한 게시글 (기본 or)",
+                required=False
+            ),
+            openapi.Parameter(
+                name="status",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=["STORED", "PUBLISHED"],
+                description="게시글 상태",
+                required=False
+            ),
+            openapi.Parameter(
+                name="cursor",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description="이전 응답의 next 값",
+                required=False
+            ),
+            PAGE_SIZE_PARAM,
+        ],
+        responses={200: PostSerializer(many=True), 400: "잘못된 필터 파라미터"}
+    )
+    def get(self, request, format=None):
+        raw_categories = ','.join(request.query_params.getlist('category'))
+        mode = request.query_params.get('mode', 'or').lower()
+        post_status = request.query_params.get('status')
+        cursor = request.query_params.get('cursor')
+
+        try:
+            category_ids = [int(c) for c in raw_categories.split(',') if c.strip()]
+            cursor = int(cursor) if cursor else None
+        except ValueError:
+            raise ValidationErrorException(detail="category와 cursor는 정수여야 합니다.")
+
+        if not category_ids:
+            raise RequiredFieldException(field_name='category')
+        if mode not in ('and', 'or'):
+            raise ValidationErrorException(detail="mode는 and 또는 or 이어야 합니다.")
+        if post_status and post_status not in dict(Post.CHOICES):
+            raise ValidationErrorException(detail="status는 STORED 또는 PUBLISHED 이어야 합니다.")
+
+        page_size = KeysetPaginator(Post.objects.none(), 'created', 'id').get_page_size(request)
+
+        # 교집합/합집합은 메모리에서 계산하고, 최신 게시글(큰 id)부터 정렬 (/post/filter/<category>/와 같은 순서)
+        matched = category_index.match(category_ids, mode)
+        if cursor is not None:
+            matched = [pid for pid in matched if pid < cursor]
+
+        # status 조건은 DB에서 거르므로 한 페이지가 찰 때까지 후보를 묶어서 가져온다
+        posts = []
+        chunks = id_chunks(matched, min(page_size * 2, getattr(settings, 'CATEGORY_FILTER_CHUNK_SIZE', 500)))
+        for chunk in chunks:
+            queryset = Post.objects.filter(id__in=chunk).order_by('-id')
+            if post_status:
+                queryset = queryset.filter(status=post_status)
+            posts.extend(post_fast.to_representation(post_fast.values(queryset)))
+            if len(posts) > page_size:
+                break
+        # 한 페이지를 넘게 읽었거나 아직 보지 않은 후보가 남아 있으면 다음 페이지가 있다
+        has_more = len(posts) > page_size or next(chunks, None) is not None
+        posts = posts[:page_size]
+
+        return Response({
+            'success': True,
+            'message': '카테고리별 게시글을 성공적으로 조회했습니다.',
+            'data': posts,
+            'count': len(posts),
+            'next': posts[-1]['id'] if has_more and posts else None,
+        })
+
 # class ImageUploadView(APIView):
 #     def post(self, request):
 #         if 'image' not in request.FILES:
@@ -339,6 +483,9 @@ def filter_post_by_category(request, category):
 # 12주차 swagger decorator를 사용하여 API 문서화
 class PostList(APIView):
     # permission_classes = [IsAuthenticatedOrReadOnly]  # 테스트를 위해 임시 주석처리, 13주차 과제
+    throttle_classes = [IPTokenBucketThrottle, UserTokenBucketThrottle]
+    throttle_scope = 'post_create'
+    throttle_methods = ('POST',) # 목록 조회는 제한하지 않음
     
     @swagger_auto_schema(
         operation_summary="게시글 생성",
@@ -348,7 +495,7 @@ class PostList(APIView):
             201: PostSerializer, 
             400: "잘못된 요청 - 필수 필드 누락 또는 유효성 검사 실패",
             409: "제목 중복 오류",
-            429: "하루 게시글 작성 제한 초과"
+            429: "하루 게시글 작성 제한 초과 또는 요청 한도 초과"
         }
     )
     def post(self, request, format=None):
@@ -364,33 +511,195 @@ class PostList(APIView):
     
     @swagger_auto_schema(
         operation_summary="게시글 목록 조회",
-        operation_description="모든 게시글을 조회합니다.",
+        operation_description="게시글을 최신순으로 커서 페이지네이션하여 조회합니다. 응답의 next/prev 커서를 cursor 파라미터로 넘기면 다음/이전 페이지를 조회합니다.",
+        manual_parameters=[CURSOR_PARAM, PAGE_SIZE_PARAM, STREAM_PARAM],
         responses={200: PostSerializer(many=True)}
     )
     def get(self, request, format=None):
-        posts = Post.objects.all()
-	    # 많은 post들을 받아오려면 (many=True) 써줘야 한다!
-        serializer = PostSerializer(posts, many=True)
+        # ?stream=1|ndjson: 페이지네이션 없이 전체 목록을 스트리밍
+        stream_format = get_stream_format(request)
+        if stream_format:
+            rows = iter_rows(post_fast.values(Post.objects.order_by('-created', '-id')), post_fast.to_representation)
+            return streaming_response(rows, stream_format, {
+                'success': True,
+                'message': '게시글 목록을 성공적으로 조회했습니다.',
+            })
+
+        # 모델 인스턴스 대신 values_list 튜플을 읽어서 미리 만든 변환 함수로 직렬화
+        paginator = KeysetPaginator(
+            post_fast.values(Post.objects.all()), time_field='created', pk_field='id', columns=post_fast.columns
+        )
+        rows, next_cursor, prev_cursor = paginator.paginate(request)
+        data = post_fast.to_representation(rows)
         return Response({
             'success': True,
             'message': '게시글 목록을 성공적으로 조회했습니다.',
-            'data': serializer.data,
-            'count': len(serializer.data)
+            'data': data,
+            'count': len(data),
+            'next': next_cursor,
+            'prev': prev_cursor,
         })
     
+# 게시글 전문 검색
+class PostSearch(APIView):
+    @swagger_auto_schema(
+        operation_summary="게시글 검색",
+        operation_description="제목/내용에서 검색어를 찾아 관련도(BM25) 순으로 조회합니다. 검색어가 나온 부분은 highlight에 <mark>로 표시됩니다.",
+        manual_parameters=[
+            openapi.Parameter(
+                name="q",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="검색어 (모든 단어가 들어있는 게시글만 조회)",
+                required=True
+            ),
+            openapi.Parameter(
+                name="page",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description="페이지 번호 (1부터)",
+                required=False
+            ),
+            PAGE_SIZE_PARAM,
+        ],
+        responses={200: "검색 결과", 400: "검색어 누락"}
+    )
+    def get(self, request, format=None):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise RequiredFieldException(field_name='q')
+
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+        except ValueError:
+            raise ValidationErrorException(detail="page는 정수여야 합니다.")
+        page_size = KeysetPaginator(Post.objects.none(), 'created', 'id').get_page_size(request)
+
+        total, ranked = get_search_backend().search(query, offset=(page - 1) * page_size, limit=page_size)
+
+        # 색인에서 찾은 id로 게시글을 한 번에 조회
+        posts = Post.objects.in_bulk([post_id for post_id, _ in ranked])
+        results = []
+        for post_id, score in ranked:
+            post = posts.get(post_id)
+            if post is None:
+                continue # 색인이 아직 삭제를 반영하지 못한 경우
+            results.append({
+                'id': post.id,
+                'title': post.title,
+                'status': post.status,
+                'user': post.user_id,
+                'created': post.created,
+                'comment_count': post.comment_count,
+                'score': round(score, 4),
+                'highlight': {
+                    'title': highlight(post.title, query),
+                    'content': highlight(post.content, query, max_length=getattr(settings, 'SEARCH_SNIPPET_LENGTH', 120)),
+                },
+            })
+
+        return Response({
+            'success': True,
+            'message': f"'{query}' 검색 결과입니다.",
+            'data': results,
+            'count': len(results),
+            'total': total,
+            'page': page,
+            'next': page + 1 if page * page_size < total else None,
+        })
+
+# 게시글 제목 자동완성
+class PostTitleAutocomplete(APIView):
+    @swagger_auto_schema(
+        operation_summary="게시글 제목 자동완성",
+        operation_description="입력한 접두사로 시작하는 게시글 제목을 사전 순으로 최대 limit개 조회합니다. DB를 조회하지 않고 메모리 인덱스에서 찾습니다.",
+        manual_parameters=[
+            openapi.Parameter(
+                name="q",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="제목 접두사 (대소문자 구분 없음)",
+                required=True
+            ),
+            openapi.Parameter(
+                name="limit",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description="최대 개수 (기본 10, 최대 50)",
+                required=False
+            ),
+        ],
+        responses={200: "자동완성 결과"}
+    )
+    def get(self, request, format=None):
+        prefix = request.query_params.get('q', '')
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            raise ValidationErrorException(detail="limit은 정수여야 합니다.")
+
+        matches = title_index.complete(prefix, limit=limit)
+        return Response({
+            'success': True,
+            'message': '자동완성 결과입니다.',
+            'data': [{'id': post_id, 'title': title} for post_id, title in matches],
+            'count': len(matches),
+        })
+
+# 게시글 일괄 작성 (JSON 배열)
+class PostBulkCreate(APIView):
+    throttle_classes = [IPTokenBucketThrottle, UserTokenBucketThrottle]
+    throttle_scope = 'bulk_create'
+
+    @swagger_auto_schema(
+        operation_summary="게시글 일괄 생성",
+        operation_description="게시글 객체의 JSON 배열을 한 번에 생성합니다. 검사는 배치 단위로 한 번씩만 조회하고, 실패한 항목은 index와 함께 errors로 반환합니다.",
+        request_body=openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT)),
+        responses={
+            201: "생성 결과 (created, errors)",
+            400: "배열이 아니거나 모든 항목이 유효성 검사 실패",
+            409: "동시에 같은 제목이 작성되어 일괄 작성 취소",
+            429: "하루 게시글 작성 제한 초과 또는 요청 한도 초과"
+        }
+    )
+    def post(self, request, format=None):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationErrorException(detail="게시글 객체의 배열을 보내야 합니다.")
+
+        max_items = getattr(settings, 'BULK_CREATE_MAX_ITEMS', 5000)
+        if len(items) > max_items:
+            raise ValidationErrorException(detail=f"한 번에 최대 {max_items}개까지 작성할 수 있습니다.")
+
+        created, errors = bulk_create_posts(items)
+        return Response({
+            'success': bool(created),
+            'message': f'{len(created)}개의 게시글이 생성되었습니다. (실패 {len(errors)}개)',
+            'data': created,
+            'errors': errors,
+            'count': len(created),
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)
+
 class PostDetail(APIView):
     # 시간 비교가 우선시 되어야하므로 permission_class 제일 앞에 배치한다.
     permission_classes = [IsAllowedTime, IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     
     @swagger_auto_schema(
         operation_summary="게시글 상세 조회",
-        operation_description="특정 게시글의 상세 정보를 조회합니다.",
-        responses={200: PostSerializer, 404: "게시글을 찾을 수 없음"}
+        operation_description="특정 게시글의 상세 정보를 조회합니다. If-None-Match / If-Modified-Since 헤더를 보내면 변경이 없을 때 304를 반환합니다.",
+        responses={200: PostSerializer, 304: "변경 없음", 404: "게시글을 찾을 수 없음"}
     )
+    @method_decorator(condition(etag_func=post_etag, last_modified_func=post_last_modified))
     def get(self, request, post_id):
-        post = get_object_or_404(Post, id=post_id)
-        serializer = PostSerializer(post)
-        return Response(serializer.data)
+        # 직렬화 결과를 캐시에서 먼저 찾고, 없을 때만 DB 조회
+        data = post_cache.get_or_set(post_id, lambda: self._load(post_id))
+        return Response(data)
+
+    def _load(self, post_id):
+        data = post_fast.first(Post.objects.filter(id=post_id))
+        if data is None:
+            raise Http404("No Post matches the given query.")
+        return data
 
     @swagger_auto_schema(
         operation_summary="게시글 수정",
@@ -403,6 +712,7 @@ class PostDetail(APIView):
         serializer = PostSerializer(post, data=request.data)
         if serializer.is_valid(): # update이니까 유효성 검사 필요
             serializer.save()
+            post_cache.invalidate(post_id)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -414,6 +724,7 @@ class PostDetail(APIView):
     def delete(self, request, post_id):
         post = get_object_or_404(Post, id=post_id)
         post.delete()
+        post_cache.invalidate(post_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
     
 class CommentDetail(APIView):
@@ -423,22 +734,32 @@ class CommentDetail(APIView):
         responses={200: CommentSerializer, 404: "댓글을 찾을 수 없음"}
     )
     def get(self, request, comment_id):
-        comment = get_object_or_404(Comment, c_id=comment_id)
-        serializer = CommentSerializer(comment)
+        data = comment_cache.get_or_set(comment_id, lambda: self._load(comment_id))
         return Response({
             'success': True,
             'message': '댓글을 성공적으로 조회했습니다.',
-            'data': serializer.data
+            'data': data
         })
 
+    def _load(self, comment_id):
+        data = comment_fast.first(Comment.objects.filter(c_id=comment_id))
+        if data is None:
+            raise Http404("No Comment matches the given query.")
+        return data
+
 class CommentList(APIView):
+    throttle_classes = [IPTokenBucketThrottle, UserTokenBucketThrottle]
+    throttle_scope = 'comment_create'
+    throttle_methods = ('POST',)
+
     @swagger_auto_schema(
         operation_summary="댓글 생성",
         operation_description="새로운 댓글을 생성합니다. 댓글은 최소 15자 이상 작성해야 합니다.",
         request_body=CommentSerializer,
         responses={
             201: CommentSerializer,
-            400: "잘못된 요청 - 필수 필드 누락 또는 유효성 검사 실패"
+            400: "잘못된 요청 - 필수 필드 누락 또는 유효성 검사 실패",
+            429: "요청 한도 초과"
         }
     )
     def post(self, request, format=None):
@@ -454,34 +775,84 @@ class CommentList(APIView):
     
     @swagger_auto_schema(
         operation_summary="댓글 목록 조회",
-        operation_description="모든 댓글을 조회합니다.",
+        operation_description="댓글을 최신순으로 커서 페이지네이션하여 조회합니다.",
+        manual_parameters=[CURSOR_PARAM, PAGE_SIZE_PARAM, STREAM_PARAM],
         responses={200: CommentSerializer(many=True)}
     )
     def get(self, request, format=None):
-        comments = Comment.objects.all().order_by('-writen_time')  # 최신순 정렬
-        serializer = CommentSerializer(comments, many=True)
+        # ?stream=1|ndjson: 페이지네이션 없이 전체 목록을 스트리밍
+        stream_format = get_stream_format(request)
+        if stream_format:
+            rows = iter_rows(comment_fast.values(Comment.objects.order_by('-writen_time', '-c_id')), comment_fast.to_representation)
+            return streaming_response(rows, stream_format, {
+                'success': True,
+                'message': '댓글 목록을 성공적으로 조회했습니다.',
+            })
+
+        # 최신순 정렬 (writen_time, c_id 내림차순)
+        paginator = KeysetPaginator(
+            comment_fast.values(Comment.objects.all()), time_field='writen_time', pk_field='c_id', columns=comment_fast.columns
+        )
+        rows, next_cursor, prev_cursor = paginator.paginate(request)
+        data = comment_fast.to_representation(rows)
         return Response({
             'success': True,
             'message': '댓글 목록을 성공적으로 조회했습니다.',
-            'data': serializer.data,
-            'count': len(serializer.data)
+            'data': data,
+            'count': len(data),
+            'next': next_cursor,
+            'prev': prev_cursor,
         })
 
+# 댓글 일괄 작성 (JSON 배열, 여러 게시글 가능)
+class CommentBulkCreate(APIView):
+    throttle_classes = [IPTokenBucketThrottle, UserTokenBucketThrottle]
+    throttle_scope = 'bulk_create'
+
+    @swagger_auto_schema(
+        operation_summary="댓글 일괄 생성",
+        operation_description="댓글 객체(post, author, body)의 JSON 배열을 한 번에 생성합니다. 여러 게시글의 댓글을 섞어서 보낼 수 있고, 실패한 항목은 index와 함께 errors로 반환합니다.",
+        request_body=openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT)),
+        responses={
+            201: "생성 결과 (created, errors)",
+            400: "배열이 아니거나 모든 항목이 유효성 검사 실패",
+            429: "요청 한도 초과"
+        }
+    )
+    def post(self, request, format=None):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationErrorException(detail="댓글 객체의 배열을 보내야 합니다.")
+
+        max_items = getattr(settings, 'BULK_CREATE_MAX_ITEMS', 5000)
+        if len(items) > max_items:
+            raise ValidationErrorException(detail=f"한 번에 최대 {max_items}개까지 작성할 수 있습니다.")
+
+        created, errors = bulk_create_comments(items)
+        return Response({
+            'success': bool(created),
+            'message': f'{len(created)}개의 댓글이 작성되었습니다. (실패 {len(errors)}개)',
+            'data': created,
+            'errors': errors,
+            'count': len(created),
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)
+
 class PostCommentList(APIView):
     @swagger_auto_schema(
         operation_summary="특정 게시글의 댓글 목록 조회",
-        operation_description="특정 게시글에 작성된 모든 댓글을 조회합니다.",
-        responses={200: CommentSerializer(many=True), 404: "게시글을 찾을 수 없음"}
+        operation_description="특정 게시글에 작성된 모든 댓글을 조회합니다. If-None-Match / If-Modified-Since 헤더를 보내면 변경이 없을 때 304를 반환합니다.",
+        responses={200: CommentSerializer(many=True), 304: "변경 없음", 404: "게시글을 찾을 수 없음"}
     )
+    @method_decorator(condition(etag_func=post_comments_etag, last_modified_func=post_comments_last_modified))
     def get(self, request, post_id):
-        post = get_object_or_404(Post, id=post_id)
-        comments = Comment.objects.filter(post=post).order_by('-writen_time')
-        serializer = CommentSerializer(comments, many=True)
+        post = get_object_or_404(Post.objects.only('id', 'title', 'comment_count'), id=post_id)
+        comments = Comment.objects.filter(post=post).order_by('-writen_time', '-c_id')
+        data = comment_fast.to_representation(comment_fast.values(comments))
         return Response({
             'success': True,
             'message': f'게시글 "{post.title}"의 댓글 목록을 성공적으로 조회했습니다.',
-            'data': serializer.data,
-            'count': len(serializer.data),
+            'data': data,
+            'count': post.comment_count,
             'post_info': {
                 'id': post.id,
                 'title': post.title
@@ -493,7 +864,7 @@ class ImageUploadView(APIView):
 
     @swagger_auto_schema(
         operation_summary="이미지 업로드",
-        operation_description="이미지 파일을 업로드하고 S3 URL을 반환합니다.",
+        operation_description="이미지 파일을 업로드하고 S3 URL을 반환합니다. 같은 내용의 파일이 이미 있으면 업로드하지 않고 기존 이미지를 반환합니다.",
         manual_parameters=[
             openapi.Parameter(
                 name="image",
@@ -503,38 +874,160 @@ class ImageUploadView(APIView):
                 required=True
             )
         ],
-        responses={201: ImageSerializer, 400: "이미지 파일이 없습니다."}
+        responses={201: ImageSerializer, 200: ImageSerializer, 400: "이미지 파일이 없습니다."}
     )
     def post(self, request):
+        # multipart 본문을 읽는 동안 SHA-256을 같이 계산 (request.FILES에 처음 접근하기 전에 등록해야 함)
+        hash_handler = ContentHashUploadHandler(request)
+        request.upload_handlers.insert(0, hash_handler)
+
         if 'image' not in request.FILES:
             return Response({"error": "No image file"}, status=status.HTTP_400_BAD_REQUEST)
 
         image_file = request.FILES['image']
+        content_hash = hash_handler.hexdigest('image')
 
-        s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        # 같은 내용의 이미지가 이미 있으면 S3 업로드와 저장을 건너뛴다
+        existing = Image.objects.filter(content_hash=content_hash).first()
+        if existing is not None:
+            return Response(ImageSerializer(existing).data, status=status.HTTP_200_OK)
 
-        origin_filename, extension = os.path.splitext(image_file.name)
-        own_filename = f"{origin_filename}_{uuid.uuid4().hex}{extension}"
-        file_path = f"uploads/{own_filename}"
+        # key가 내용으로 정해지므로 같은 파일을 동시에 올려도 S3 객체는 하나만 남는다
+        file_path = content_upload_key(content_hash, image_file.name)
 
+        # 공유 S3 클라이언트로 파일을 chunk 단위로 읽으며 업로드 (큰 파일은 multipart 병렬 전송)
         try:
-            s3_client.put_object(
-                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-                Key=file_path,
-                Body=image_file.read(),
-                ContentType=image_file.content_type,
-            )
+            image_file.seek(0)
+            upload_fileobj(image_file, file_path, content_type=image_file.content_type)
         except Exception as e:
             return Response({"error": f"S3 Upload Failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        image_url = f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{file_path}"
+        image_url = object_url(file_path)
+
+        # 썸네일 등 파생본은 작업 큐에 넣고(run_tasks 워커가 생성) 응답은 기다리지 않는다
+        # Image와 작업을 한 트랜잭션에서 만들어서, 작업 없는 Image나 Image 없는 작업이 남지 않게 한다
+        try:
+            with transaction.atomic():
+                image_instance = Image.objects.create(image_url=image_url, content_hash=content_hash, storage_key=file_path)
+                schedule_image_variants(image_instance.id, file_path)
+        except IntegrityError:
+            # 같은 파일을 동시에 올린 다른 요청이 먼저 저장한 경우
+            existing = Image.objects.get(content_hash=content_hash)
+            return Response(ImageSerializer(existing).data, status=status.HTTP_200_OK)
 
-        image_instance = Image.objects.create(image_url=image_url)
         serializer = ImageSerializer(image_instance)
 
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
\ No newline at end of file
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+# 이미지를 Django 서버를 거치지 않고 브라우저에서 S3로 바로 올리는 2단계 업로드
+# 1) presign: 업로드할 key와 presigned POST(url, fields), 서명된 upload_token을 받는다. (크기/Content-Type은 S3가 검사)
+# 2) 브라우저가 fields + file을 url로 multipart POST
+# 3) complete: upload_token으로 key를 확인하고, S3에 객체가 있으면 Image를 만든다.
+#    서버가 발급한 key만 등록되므로 다른 사람이 올린 객체나 임의의 key를 등록할 수 없다.
+#    S3 객체를 읽어 SHA-256을 계산하고, 같은 내용의 이미지가 이미 있으면 새 객체는 지우고 기존 이미지를 돌려준다.
+class ImagePresignView(APIView):
+    @swagger_auto_schema(
+        operation_summary="이미지 업로드 URL 발급",
+        operation_description="S3에 직접 업로드할 수 있는 presigned POST를 발급합니다. 응답의 url로 fields와 file을 multipart/form-data로 보낸 뒤 complete API를 호출하세요.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=['filename', 'content_type'],
+            properties={
+                'filename': openapi.Schema(type=openapi.TYPE_STRING, description="원본 파일 이름"),
+                'content_type': openapi.Schema(type=openapi.TYPE_STRING, description="image/jpeg, image/png 등"),
+                'size': openapi.Schema(type=openapi.TYPE_INTEGER, description="파일 크기(바이트, 선택)"),
+            },
+        ),
+        responses={200: "presigned POST 발급", 400: "잘못된 파일 형식 또는 크기"}
+    )
+    def post(self, request):
+        filename = request.data.get('filename')
+        content_type = request.data.get('content_type')
+        if not filename:
+            raise RequiredFieldException(field_name='filename')
+        if not content_type:
+            raise RequiredFieldException(field_name='content_type')
+
+        allowed_types = settings.IMAGE_UPLOAD_CONTENT_TYPES
+        if content_type not in allowed_types:
+            raise ValidationErrorException(detail=f"content_type은 {', '.join(allowed_types)} 중 하나여야 합니다.")
+
+        max_size = settings.IMAGE_UPLOAD_MAX_SIZE
+        size = request.data.get('size')
+        if size is not None:
+            try:
+                size = int(size)
+            except (TypeError, ValueError):
+                raise ValidationErrorException(detail="size는 정수여야 합니다.")
+            if not 0 < size <= max_size:
+                raise ValidationErrorException(detail=f"파일 크기는 {max_size}바이트 이하여야 합니다.")
+
+        key = build_upload_key(filename)
+        expires_in = settings.IMAGE_UPLOAD_PRESIGN_EXPIRES
+        presigned = presigned_upload(key, content_type, max_size, expires_in)
+        return Response({
+            'success': True,
+            'message': '이미지 업로드 URL을 발급했습니다.',
+            'data': {
+                'key': key,
+                'upload_token': sign_upload_key(key),
+                'url': presigned['url'],
+                'fields': presigned['fields'],
+                'max_size': max_size,
+                'expires_in': expires_in,
+            }
+        })
+
+class ImageUploadCompleteView(APIView):
+    @swagger_auto_schema(
+        operation_summary="이미지 업로드 완료",
+        operation_description="presigned POST로 S3에 올린 파일을 확인하고 이미지 정보를 저장합니다. 같은 토큰으로 다시 호출하거나 같은 내용의 이미지가 이미 있으면 기존 이미지를 반환합니다.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=['upload_token'],
+            properties={'upload_token': openapi.Schema(type=openapi.TYPE_STRING, description="presign API에서 받은 upload_token")},
+        ),
+        responses={201: ImageSerializer, 200: ImageSerializer, 400: "잘못되었거나 만료된 토큰", 404: "S3에 파일이 없음"}
+    )
+    def post(self, request):
+        token = request.data.get('upload_token')
+        if not token:
+            raise RequiredFieldException(field_name='upload_token')
+        # presign API가 서명한 key만 받는다
+        try:
+            key = unsign_upload_key(token)
+        except signing.BadSignature: # 만료(SignatureExpired)도 포함
+            raise InvalidUploadTokenException()
+
+        existing = Image.objects.filter(storage_key=key).first()
+        if existing is not None:
+            return Response(ImageSerializer(existing).data, status=status.HTTP_200_OK)
+
+        head = head_upload(key)
+        if head is None:
+            raise UploadNotFoundException()
+        # S3 정책으로 이미 막히지만, 정책 없이 올라간 객체를 등록하지 않도록 한 번 더 확인
+        if head.get('ContentType') not in settings.IMAGE_UPLOAD_CONTENT_TYPES or head.get('ContentLength', 0) > settings.IMAGE_UPLOAD_MAX_SIZE:
+            raise ValidationErrorException(detail="허용되지 않는 파일 형식 또는 크기입니다.")
+
+        # 크기는 위에서 IMAGE_UPLOAD_MAX_SIZE 이하로 확인했으므로 읽는 양도 그만큼으로 제한된다
+        content_hash = hash_upload(key)
+        duplicate = Image.objects.filter(content_hash=content_hash).first()
+        if duplicate is not None:
+            delete_upload(key)
+            return Response(ImageSerializer(duplicate).data, status=status.HTTP_200_OK)
+
+        try:
+            with transaction.atomic():
+                image_instance = Image.objects.create(image_url=object_url(key), storage_key=key, content_hash=content_hash)
+                schedule_image_variants(image_instance.id, key) # Image와 같은 트랜잭션
+        except IntegrityError:
+            # 같은 토큰(storage_key)이나 같은 내용(content_hash)으로 동시에 들어온 다른 요청이 먼저 저장한 경우
+            existing = Image.objects.filter(storage_key=key).first()
+            if existing is None:
+                existing = Image.objects.get(content_hash=content_hash)
+                delete_upload(key)
+            return Response(ImageSerializer(existing).data, status=status.HTTP_200_OK)
+
+        return Response(ImageSerializer(image_instance).data, status=status.HTTP_201_CREATED)
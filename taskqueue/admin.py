@@ -0,0 +1,18 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'status', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'updated')
+    list_filter = ('status', 'name')
+    actions = ['requeue']
+
+    @admin.action(description="선택한 작업 다시 실행")
+    def requeue(self, request, queryset):
+        count = queryset.exclude(status=Task.RUNNING).update(
+            status=Task.QUEUED, attempts=0, run_at=timezone.now(), locked_until=None, locked_by='',
+        )
+        self.message_user(request, f"{count}개 작업을 다시 넣었습니다.")
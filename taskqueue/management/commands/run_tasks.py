@@ -0,0 +1,44 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from taskqueue.worker import Worker
+
+
+class Command(BaseCommand):
+    help = (
+        "DB 작업 큐(taskqueue.Task)의 작업을 스레드/프로세스 풀에서 실행합니다. "
+        "SIGINT/SIGTERM을 받으면 실행 중인 작업을 마치고 종료합니다. 여러 개를 동시에 띄워도 됩니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=getattr(settings, 'TASK_WORKER_CONCURRENCY', 2),
+                            help="동시에 실행할 작업 수 (풀 크기)")
+        parser.add_argument('--pool', choices=('process', 'thread'), default=getattr(settings, 'TASK_WORKER_POOL', 'process'),
+                            help="CPU를 많이 쓰는 작업은 process, I/O 위주 작업은 thread")
+        parser.add_argument('--poll-interval', type=float, default=getattr(settings, 'TASK_POLL_INTERVAL', 1.0),
+                            help="작업이 없을 때 DB를 다시 확인하는 간격(초)")
+        parser.add_argument('--burst', action='store_true', help="지금 실행할 수 있는 작업을 모두 처리하면 종료")
+
+    def handle(self, *args, **options):
+        worker = Worker(
+            concurrency=options['concurrency'],
+            pool=options['pool'],
+            poll_interval=options['poll_interval'],
+            burst=options['burst'],
+            log=self.stdout.write,
+        )
+
+        def shutdown(signum, frame):
+            self.stdout.write("종료 요청을 받았습니다. 실행 중인 작업을 마치고 종료합니다.")
+            worker.stop()
+
+        signal.signal(signal.SIGINT, shutdown)
+        signal.signal(signal.SIGTERM, shutdown)
+
+        self.stdout.write(
+            f"worker {worker.worker_id} started (pool={options['pool']}, concurrency={options['concurrency']})"
+        )
+        worker.run()
+        self.stdout.write(self.style.SUCCESS(f"worker {worker.worker_id} stopped"))
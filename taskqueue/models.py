@@ -0,0 +1,37 @@
+from django.db import models
+from django.utils import timezone
+
+
+# DB에 저장하는 백그라운드 작업 (taskqueue/worker.py의 run_tasks 워커가 처리)
+# 작업을 요청 트랜잭션 안에서 넣으므로 요청이 롤백되면 작업도 같이 사라진다.
+# 성공한 작업은 지우고, 재시도를 모두 실패한 작업은 dead 상태로 남겨서 관리자 페이지에서 확인/재시도한다.
+class Task(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DEAD = 'dead'
+    STATUSES = (
+        (QUEUED, '대기'),
+        (RUNNING, '실행 중'),
+        (DEAD, '실패(재시도 중단)'),
+    )
+
+    name = models.CharField(max_length=100) # @task로 등록한 이름
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUSES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0) # 실행을 시작한 횟수
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now) # 이 시각 이후에 실행 (재시도 backoff)
+    locked_until = models.DateTimeField(null=True, blank=True) # 실행 중인 워커가 이 시각까지 끝내지 못하면 다른 워커가 다시 가져간다
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='task_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"Task {self.id} {self.name} ({self.status})"
@@ -0,0 +1,90 @@
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Task
+
+
+# 작업 함수 등록과 작업 넣기
+#
+#     # posts/tasks.py
+#     @task(max_attempts=3)
+#     def generate_image_variants(image_id, key): ...
+#
+#     generate_image_variants.delay(image.id, key) # Task 행을 만들고 바로 돌아온다
+#
+# 인자는 JSON으로 저장되므로 모델 객체 대신 id 같은 값을 넘긴다.
+
+_registry = {}
+
+
+class UnknownTaskError(LookupError):
+    pass
+
+
+class TaskFunction:
+
+    def __init__(self, func, name, max_attempts, visibility_timeout):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.visibility_timeout = visibility_timeout
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        return enqueue(self.name, args, kwargs)
+
+    def __repr__(self):
+        return f"<task {self.name}>"
+
+
+def task(name=None, max_attempts=None, visibility_timeout=None):
+    """함수를 작업으로 등록한다. 이름을 주지 않으면 '모듈.함수' 이름을 쓴다.
+
+    visibility_timeout(초) 안에 끝나지 않으면 워커가 죽은 것으로 보고 다른 워커가 다시 실행하므로
+    가장 오래 걸리는 실행 시간보다 넉넉하게 잡는다.
+    """
+    def decorator(func):
+        task_name = name or f"{func.__module__}.{func.__name__}"
+        task_function = TaskFunction(
+            func,
+            task_name,
+            max_attempts or getattr(settings, 'TASK_MAX_ATTEMPTS', 5),
+            visibility_timeout or getattr(settings, 'TASK_VISIBILITY_TIMEOUT', 300),
+        )
+        _registry[task_name] = task_function
+        return task_function
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise UnknownTaskError(name)
+
+
+def enqueue(name, args=(), kwargs=None, countdown=0):
+    """작업을 넣는다. countdown초 뒤부터 실행"""
+    task_function = get_task(name)
+    return Task.objects.create(
+        name=name,
+        args=list(args),
+        kwargs=kwargs or {},
+        max_attempts=task_function.max_attempts,
+        run_at=timezone.now() + timedelta(seconds=countdown),
+    )
+
+
+def retry_delay(attempts):
+    """attempts번 실패한 뒤 다시 실행할 때까지 기다릴 시간 (지수 backoff + jitter)"""
+    base = getattr(settings, 'TASK_RETRY_BACKOFF', 2)
+    cap = getattr(settings, 'TASK_RETRY_BACKOFF_MAX', 600)
+    delay = min(cap, base * 2 ** (attempts - 1))
+    # 같은 이유로 한꺼번에 실패한 작업들이 동시에 다시 몰리지 않도록 흩뜨린다
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
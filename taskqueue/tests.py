@@ -0,0 +1,137 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Task
+from .registry import enqueue, retry_delay, task
+from .worker import Worker
+
+calls = []
+
+
+@task(name='taskqueue.tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task(name='taskqueue.tests.fail', max_attempts=3)
+def fail(value):
+    calls.append(value)
+    raise RuntimeError(f'failed {value}')
+
+
+class WorkerTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+        self.logs = []
+
+    def run_worker(self):
+        # 테스트 작업은 DB를 쓰지 않으므로 스레드 풀로 돌린다. burst: 실행할 작업이 없으면 끝난다
+        Worker(concurrency=2, pool='thread', poll_interval=0.01, burst=True, log=self.logs.append).run()
+
+    def make_ready(self, task_):
+        Task.objects.filter(pk=task_.pk).update(run_at=timezone.now())
+
+    def test_successful_task_is_deleted(self):
+        enqueue('taskqueue.tests.record', ('a',))
+        record.delay('b')
+        self.run_worker()
+        self.assertEqual(sorted(calls), ['a', 'b'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_countdown(self):
+        enqueue('taskqueue.tests.record', ('later',), countdown=60)
+        self.run_worker()
+        self.assertEqual(calls, [])
+        self.assertEqual(Task.objects.get().status, Task.QUEUED)
+
+    def test_failed_task_is_retried_with_backoff(self):
+        queued = enqueue('taskqueue.tests.fail', ('x',))
+        before = timezone.now()
+        with self.assertLogs('taskqueue', 'ERROR') as logs:
+            self.run_worker()
+        self.assertIn('failed (attempt 1/3)', logs.output[0])
+
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts, queued.max_attempts), (Task.QUEUED, 1, 3))
+        self.assertIn('RuntimeError: failed x', queued.last_error)
+        self.assertEqual((queued.locked_by, queued.locked_until), ('', None))
+        # 첫 재시도 대기는 TASK_RETRY_BACKOFF(2초)에 jitter 0.5 ~ 1.0배
+        self.assertGreaterEqual(queued.run_at, before + timedelta(seconds=1))
+        self.assertLessEqual(queued.run_at, timezone.now() + timedelta(seconds=2))
+        self.assertEqual(calls, ['x'])
+
+    def test_task_is_dead_after_max_attempts(self):
+        queued = enqueue('taskqueue.tests.fail', ('x',))
+        for _ in range(3):
+            self.make_ready(queued)
+            with self.assertLogs('taskqueue', 'ERROR'):
+                self.run_worker()
+
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Task.DEAD, 3))
+        self.assertIn('RuntimeError', queued.last_error)
+        self.assertEqual(calls, ['x', 'x', 'x'])
+        self.assertIn('dead after 3 attempts', self.logs[-1])
+
+        # dead 작업은 다시 실행하지 않는다
+        self.make_ready(queued)
+        self.run_worker()
+        self.assertEqual(len(calls), 3)
+
+    def test_expired_visibility_timeout_is_run_again(self):
+        # 실행하던 워커가 죽어서 locked_until이 지난 작업
+        stale = Task.objects.create(
+            name='taskqueue.tests.record', args=['again'], status=Task.RUNNING, attempts=1, max_attempts=5,
+            locked_by='dead-worker', locked_until=timezone.now() - timedelta(seconds=1),
+        )
+        self.run_worker()
+        self.assertEqual(calls, ['again'])
+        self.assertFalse(Task.objects.filter(pk=stale.pk).exists())
+
+    def test_running_task_is_not_taken_before_timeout(self):
+        Task.objects.create(
+            name='taskqueue.tests.record', args=['busy'], status=Task.RUNNING, attempts=1,
+            locked_by='other-worker', locked_until=timezone.now() + timedelta(seconds=60),
+        )
+        self.run_worker()
+        self.assertEqual(calls, [])
+
+    def test_expired_task_without_attempts_left_is_dead(self):
+        stale = Task.objects.create(
+            name='taskqueue.tests.record', args=['x'], status=Task.RUNNING, attempts=5, max_attempts=5,
+            locked_by='dead-worker', locked_until=timezone.now() - timedelta(seconds=1),
+        )
+        self.run_worker()
+        stale.refresh_from_db()
+        self.assertEqual((stale.status, stale.last_error), (Task.DEAD, 'visibility timeout expired'))
+        self.assertEqual(calls, [])
+
+    def test_unknown_task_is_dead(self):
+        unknown = Task.objects.create(name='taskqueue.tests.missing')
+        self.run_worker()
+        unknown.refresh_from_db()
+        self.assertEqual((unknown.status, unknown.last_error), (Task.DEAD, 'unknown task: taskqueue.tests.missing'))
+
+    def test_finish_ignores_task_taken_over_by_another_worker(self):
+        queued = enqueue('taskqueue.tests.fail', ('x',))
+        worker = Worker(pool='thread', log=self.logs.append)
+        (task_id, name, _, _, attempts, max_attempts), = worker.claim(1)
+        # timeout이 지나 다른 워커가 다시 가져간 뒤에 처음 워커의 결과가 도착
+        Task.objects.filter(pk=task_id).update(locked_by='other-worker', attempts=attempts + 1)
+        future = mock.Mock(**{'exception.return_value': RuntimeError('late')})
+        with self.assertLogs('taskqueue', 'WARNING') as logs:
+            worker.finish(future, task_id, name, attempts, max_attempts)
+        self.assertIn('taken over by another worker', logs.output[-1])
+
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.locked_by), (Task.RUNNING, 'other-worker'))
+
+    def test_retry_delay(self):
+        with mock.patch('taskqueue.registry.random.uniform', return_value=1.0):
+            self.assertEqual(
+                [retry_delay(n).total_seconds() for n in (1, 2, 3, 20)], [2, 4, 8, 600],
+            )
@@ -0,0 +1,184 @@
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import traceback
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+import django
+from django.db import close_old_connections
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+from .registry import UnknownTaskError, get_task, retry_delay
+
+logger = logging.getLogger('taskqueue')
+
+
+# 작업 워커 (manage.py run_tasks)
+# 메인 스레드가 DB에서 작업을 가져오고(claim) 결과를 기록하며, 작업 함수는 스레드/프로세스 풀에서 실행한다.
+#
+# - claim: 조건부 UPDATE(status, locked_until)로 먼저 바꾼 워커만 작업을 가져가므로
+#   SELECT ... FOR UPDATE SKIP LOCKED가 없는 DB(SQLite)에서도 여러 워커를 같이 띄울 수 있다.
+# - visibility timeout: 실행 중인 작업은 locked_until까지 다른 워커가 가져가지 않는다.
+#   워커가 죽어서 그 시각이 지나면 다른 워커가 다시 실행한다. (작업은 여러 번 실행될 수 있으므로 멱등하게 작성)
+# - 실패하면 지수 backoff 뒤에 다시 실행하고, max_attempts번 실패하면 dead 상태로 남긴다.
+
+
+def _init_process():
+    # spawn으로 시작한 자식 프로세스에서 앱/작업 등록을 다시 한다
+    django.setup()
+
+
+def run_task(name, args, kwargs):
+    """풀에서 실행되는 부분"""
+    try:
+        get_task(name)(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+class Worker:
+
+    def __init__(self, concurrency=2, pool='process', poll_interval=1.0, burst=False, log=None):
+        self.concurrency = concurrency
+        self.pool = pool
+        self.poll_interval = poll_interval
+        self.burst = burst # 실행할 작업이 없으면 종료
+        self.log = log or logger.info
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = threading.Event()
+
+    def stop(self):
+        """새 작업은 가져오지 않고 실행 중인 작업이 끝나면 run()을 끝낸다."""
+        self._stopping.set()
+
+    def _make_executor(self):
+        if self.pool == 'thread':
+            return ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='task')
+        # 부모의 DB 연결과 스레드를 물려받지 않도록 spawn으로 시작
+        return ProcessPoolExecutor(
+            max_workers=self.concurrency,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_process,
+        )
+
+    def run(self):
+        executor = self._make_executor()
+        inflight = {} # future -> (task_id, name, attempts, max_attempts)
+        try:
+            while not self._stopping.is_set():
+                close_old_connections()
+                self.dead_letter_expired()
+
+                for task_id, name, args, kwargs, attempts, max_attempts in self.claim(self.concurrency - len(inflight)):
+                    try:
+                        future = executor.submit(run_task, name, args, kwargs)
+                    except BrokenExecutor:
+                        # 자식 프로세스가 비정상 종료하면 풀을 다시 만든다 (실행 중이던 작업은 실패로 처리되어 재시도)
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        executor = self._make_executor()
+                        future = executor.submit(run_task, name, args, kwargs)
+                    inflight[future] = (task_id, name, attempts, max_attempts)
+
+                if not inflight:
+                    if self.burst:
+                        break
+                    self._stopping.wait(self.poll_interval)
+                    continue
+
+                done, _ = wait(inflight, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.finish(future, *inflight.pop(future))
+
+            # 종료 요청: 실행 중인 작업만 마무리
+            for future in list(inflight):
+                future.exception()
+                self.finish(future, *inflight.pop(future))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            close_old_connections()
+
+    def _ready(self, now):
+        return (
+            Q(status=Task.QUEUED, run_at__lte=now)
+            | Q(status=Task.RUNNING, locked_until__lte=now, attempts__lt=F('max_attempts'))
+        )
+
+    def claim(self, limit):
+        """실행할 작업을 최대 limit개 가져온다. [(id, name, args, kwargs, attempts, max_attempts)]"""
+        if limit <= 0:
+            return []
+        now = timezone.now()
+        ready = self._ready(now)
+        # 다른 워커와 겹쳐서 몇 개를 놓쳐도 채울 수 있도록 후보를 넉넉히 읽는다
+        candidates = Task.objects.filter(ready).order_by('run_at', 'id').values_list('id', 'name')[:limit * 4]
+
+        claimed = []
+        for task_id, name in candidates:
+            if len(claimed) >= limit:
+                break
+            try:
+                task_function = get_task(name)
+            except UnknownTaskError:
+                Task.objects.filter(pk=task_id).update(
+                    status=Task.DEAD, last_error=f"unknown task: {name}", updated=now,
+                )
+                continue
+            taken = Task.objects.filter(ready, pk=task_id).update(
+                status=Task.RUNNING,
+                attempts=F('attempts') + 1,
+                locked_by=self.worker_id,
+                locked_until=now + timedelta(seconds=task_function.visibility_timeout),
+                updated=now,
+            )
+            if taken:
+                claimed.append(task_id)
+
+        if not claimed:
+            return []
+        return list(
+            Task.objects.filter(pk__in=claimed, locked_by=self.worker_id)
+            .order_by('run_at', 'id')
+            .values_list('id', 'name', 'args', 'kwargs', 'attempts', 'max_attempts')
+        )
+
+    def dead_letter_expired(self):
+        """visibility timeout이 지났고 재시도 횟수도 다 쓴 작업은 dead로 옮긴다."""
+        now = timezone.now()
+        return Task.objects.filter(
+            status=Task.RUNNING, locked_until__lte=now, attempts__gte=F('max_attempts'),
+        ).update(
+            status=Task.DEAD, locked_until=None, last_error='visibility timeout expired', updated=now,
+        )
+
+    def finish(self, future, task_id, name, attempts, max_attempts):
+        # 그 사이 timeout으로 다른 워커가 가져간 작업이면 아무것도 바꾸지 않는다
+        mine = Task.objects.filter(pk=task_id, status=Task.RUNNING, locked_by=self.worker_id, attempts=attempts)
+        now = timezone.now()
+        error = future.exception()
+
+        if error is None:
+            changed = mine.delete()[0]
+            if changed:
+                self.log(f"task {task_id} {name} done")
+        else:
+            detail = ''.join(traceback.format_exception(error))
+            logger.error("task %s %s failed (attempt %s/%s)\n%s", task_id, name, attempts, max_attempts, detail)
+            if attempts >= max_attempts:
+                changed = mine.update(status=Task.DEAD, locked_until=None, last_error=detail, updated=now)
+                if changed:
+                    self.log(f"task {task_id} {name} dead after {attempts} attempts: {error!r}")
+            else:
+                changed = mine.update(
+                    status=Task.QUEUED, run_at=now + retry_delay(attempts),
+                    locked_until=None, locked_by='', last_error=detail, updated=now,
+                )
+                if changed:
+                    self.log(f"task {task_id} {name} failed (attempt {attempts}/{max_attempts}), retrying: {error!r}")
+
+        if not changed:
+            logger.warning("task %s %s was taken over by another worker before it finished", task_id, name)
@@ -0,0 +1,68 @@
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase
+
+try:
+    from moto import mock_aws
+except ImportError: # S3 테스트는 moto가 있을 때만 실행
+    mock_aws = None
+
+from accounts.authentication import user_cache
+from accounts.models import User
+from config.throttling import local_store
+from posts import search, storage
+from posts.autocomplete import title_index
+from posts.category_index import category_index
+
+
+# 테스트 공통 설정
+# - 접근 시간 제한(22:00~07:00)은 테스트를 돌리는 시각과 관계없이 항상 허용
+# - 프로세스 메모리에 남는 인덱스/캐시는 테스트마다 비워서 다른 테스트의 DB 상태가 섞이지 않게 한다
+# - 검색 색인은 개발용 SQLite 파일 대신 테스트마다 새 메모리 색인을 쓴다
+class APITestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('accounts.permissions.IsAllowedTime.has_permission', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        search._backend = search.InMemorySearchBackend()
+        self.addCleanup(setattr, search, '_backend', None)
+
+        category_index.invalidate()
+        title_index.invalidate()
+        local_store.clear()
+        user_cache.clear()
+        for alias in settings.CACHES:
+            caches[alias].clear()
+
+    @staticmethod
+    def make_user(username='tester', password='test-password-1234'):
+        return User.objects.create_user(username=username, email=f'{username}@example.com', password=password)
+
+
+# S3를 쓰는 테스트: moto로 boto3 호출을 가로채서 메모리 안의 가짜 버킷을 쓴다
+@skipUnless(mock_aws, 'moto가 설치되어 있지 않습니다.')
+class S3APITestCase(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        override = self.settings(AWS_ACCESS_KEY_ID='testing', AWS_SECRET_ACCESS_KEY='testing', AWS_S3_ENDPOINT_URL=None)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        aws = mock_aws()
+        aws.start()
+        self.addCleanup(aws.stop)
+
+        # 이전 테스트에서 만든 클라이언트가 남지 않도록 새로 만든다
+        storage._client = None
+        self.addCleanup(setattr, storage, '_client', None)
+        self.s3 = storage.get_s3_client()
+        self.bucket = settings.AWS_STORAGE_BUCKET_NAME
+        self.s3.create_bucket(
+            Bucket=self.bucket, CreateBucketConfiguration={'LocationConstraint': settings.AWS_REGION},
+        )
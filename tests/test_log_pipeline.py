@@ -0,0 +1,45 @@
+import json
+import logging
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from config.log_pipeline import JsonFormatter, NonBlockingFileHandler
+
+
+class NonBlockingFileHandlerTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'requests.log')
+        self.handler = NonBlockingFileHandler(self.path, queue_size=100)
+        self.handler.setFormatter(JsonFormatter())
+        self.addCleanup(self.handler.close)
+
+        self.logger = logging.getLogger(f'test.log_pipeline.{id(self)}')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def read(self, path):
+        self.handler.queue.join() # 리스너 스레드가 다 쓸 때까지 기다린다
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_writes_structured_json_lines(self):
+        self.logger.info('GET /post/ 200', extra={'method': 'GET', 'status': 200, 'request_id': 'abc'})
+        [line] = self.read(self.path)
+        self.assertEqual(line['message'], 'GET /post/ 200')
+        self.assertEqual((line['method'], line['status'], line['request_id']), ('GET', 200, 'abc'))
+
+    def test_reopens_file_after_external_rotation(self):
+        self.logger.info('before')
+        self.read(self.path)
+        # logrotate가 파일을 옮긴 상황
+        os.rename(self.path, self.path + '.1')
+        self.logger.info('after')
+        self.assertEqual([line['message'] for line in self.read(self.path)], ['after'])
+        self.assertEqual([line['message'] for line in self.read(self.path + '.1')], ['before'])
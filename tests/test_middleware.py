@@ -0,0 +1,84 @@
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse
+from django.test import override_settings
+
+from config.logmiddleware import QueryCountMiddleware, RequestLoggingMiddleware
+from config.middlewares import ExceptionHandlerMiddleware
+
+from posts.models import Post, Category, cat_post_linker
+
+from posts.category_index import category_index
+
+from .base import APITestCase
+
+
+class QueryCountMiddlewareTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        Post.objects.create(title='첫 글', content='본문', user=self.make_user())
+
+    @override_settings(QUERY_METRICS_ENABLED=True, QUERY_METRICS_HEADERS=True)
+    def test_headers_report_queries(self):
+        response = self.client.get('/post/')
+        self.assertGreater(int(response['X-Query-Count']), 0)
+        self.assertIn('db;dur=', response['Server-Timing'])
+
+    @override_settings(QUERY_METRICS_ENABLED=True, QUERY_METRICS_HEADERS=True)
+    def test_streaming_response_has_no_query_headers(self):
+        # 본문을 보내는 동안 실행되는 쿼리는 세지 못하므로 헤더를 붙이지 않는다
+        response = self.client.get('/post/', {'stream': '1'})
+        self.assertTrue(response.streaming)
+        b''.join(response.streaming_content)
+        self.assertFalse(response.has_header('X-Query-Count'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    @override_settings(QUERY_METRICS_ENABLED=True, QUERY_METRICS_HEADERS=False)
+    def test_queries_are_logged_without_headers(self):
+        with self.assertLogs('django.request', 'INFO') as logs:
+            response = self.client.get('/post/')
+        self.assertFalse(response.has_header('X-Query-Count'))
+        self.assertFalse(response.has_header('Server-Timing'))
+        record, = [record for record in logs.records if record.getMessage().startswith('GET /post/ 200')]
+        self.assertGreater(record.queries, 0)
+        self.assertIn('queries=', record.getMessage())
+
+    @override_settings(QUERY_METRICS_ENABLED=False)
+    def test_disabled(self):
+        response = self.client.get('/post/')
+        self.assertFalse(response.has_header('X-Query-Count'))
+        self.assertTrue(response.has_header('X-Request-ID'))
+
+
+class AsyncMiddlewareTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.post = Post.objects.create(title='첫 글', content='본문', user=self.make_user())
+        self.category = Category.objects.create(cat_name='python')
+        cat_post_linker.objects.create(post=self.post, category=self.category)
+
+    @override_settings(QUERY_METRICS_ENABLED=True)
+    def test_middlewares_stay_async_in_async_chain(self):
+        async def view(request):
+            return HttpResponse()
+
+        def sync_view(request):
+            return HttpResponse()
+
+        for middleware_class in (RequestLoggingMiddleware, QueryCountMiddleware, ExceptionHandlerMiddleware):
+            self.assertTrue(iscoroutinefunction(middleware_class(view)))
+            self.assertFalse(iscoroutinefunction(middleware_class(sync_view)))
+
+    @override_settings(QUERY_METRICS_ENABLED=True, QUERY_METRICS_HEADERS=True)
+    async def test_async_view_through_middlewares(self):
+        response = await self.async_client.get(f'/post/async/{self.post.id}/', headers={'X-Request-ID': 'req-1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Request-ID'], 'req-1')
+        self.assertGreater(int(response['X-Query-Count']), 0)
+
+    async def test_async_category_filter(self):
+        response = await self.async_client.get(f'/post/async/filter/{self.category.cat_id}/')
+        self.assertEqual([row['id'] for row in response.json()['date']], [self.post.id])
+        # 인덱스가 만들어진 뒤에는 메모리에서 바로 읽는다
+        self.assertEqual(list(category_index.cached_post_ids(self.category.cat_id)), [self.post.id])
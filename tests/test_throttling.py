@@ -0,0 +1,132 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from config.throttling import LocalBucketStore, RedisBucketStore, _redis_stores, get_bucket_store, local_store, parse_rate
+
+from .base import APITestCase
+
+
+class TokenBucketThrottleTests(APITestCase):
+
+    def login(self, ip='10.0.0.1'):
+        return self.client.post('/account/login/', {'username': 'nobody', 'password': 'wrong'}, REMOTE_ADDR=ip)
+
+    def obtain_token(self, ip='10.0.0.1'):
+        return self.client.post('/account/token/', {'username': 'nobody', 'password': 'wrong'}, REMOTE_ADDR=ip)
+
+    @override_settings(RATE_LIMITS={'login': {'ip': '2/min'}})
+    def test_login_is_limited_per_ip(self):
+        self.assertNotEqual(self.login().status_code, 429)
+        self.assertNotEqual(self.login().status_code, 429)
+
+        response = self.login()
+        self.assertEqual(response.status_code, 429)
+        # 2/min: 30초마다 토큰 하나
+        self.assertTrue(0 < int(response['Retry-After']) <= 30)
+        self.assertFalse(response.json()['success'])
+
+        # 다른 IP는 따로 센다
+        self.assertNotEqual(self.login('10.0.0.2').status_code, 429)
+
+    @override_settings(RATE_LIMITS={'login': {'ip': '1/min'}})
+    def test_bucket_refills(self):
+        self.login()
+        self.assertEqual(self.login().status_code, 429)
+        # 빈 버킷이 1분 전에 마지막으로 쓰인 것으로 되돌리면 토큰 하나가 다시 채워져 있다
+        local_store._buckets['ratelimit:login:ip:10.0.0.1'] = (0.0, time.time() - 60)
+        self.assertNotEqual(self.login().status_code, 429)
+        self.assertEqual(self.login().status_code, 429)
+
+    @override_settings(RATE_LIMITS={'login': {'ip': '3/min'}})
+    def test_token_endpoint_is_limited(self):
+        statuses = [self.obtain_token().status_code for _ in range(4)]
+        self.assertEqual(statuses, [401, 401, 401, 429])
+        self.assertTrue(0 < int(self.obtain_token()['Retry-After']) <= 20)
+
+        # /login/과 같은 버킷을 쓰므로 두 주소를 번갈아 써도 한도가 늘지 않는다
+        self.assertNotEqual(self.obtain_token('10.0.0.2').status_code, 429)
+        self.assertNotEqual(self.login('10.0.0.2').status_code, 429)
+        self.assertNotEqual(self.obtain_token('10.0.0.2').status_code, 429)
+        self.assertEqual(self.login('10.0.0.2').status_code, 429)
+
+    @override_settings(RATE_LIMITS={'post_create': {'user': '1/hour'}}, DAILY_POST_LIMIT=10)
+    def test_post_create_is_limited_per_user(self):
+        user = self.make_user()
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+
+        def create(title, ip):
+            return self.client.post('/post/', {'title': title, 'content': '게시글 본문', 'user': user.id}, REMOTE_ADDR=ip, **headers)
+
+        self.assertEqual(create('첫 글', '10.0.0.1').status_code, 201)
+        # IP를 바꿔도 같은 사용자
+        response = create('둘째 글', '10.0.0.2')
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(0 < int(response['Retry-After']) <= 3600)
+
+        # 목록 조회는 제한하지 않는다
+        self.assertEqual(self.client.get('/post/', **headers).status_code, 200)
+
+
+class BucketStoreTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(_redis_stores.clear)
+
+    def login(self):
+        return self.client.post('/account/login/', {'username': 'nobody', 'password': 'wrong'}, REMOTE_ADDR='10.0.0.1')
+
+    def test_local_store_without_redis_url(self):
+        self.assertIs(get_bucket_store(), local_store)
+
+    def test_concurrent_requests_do_not_exceed_capacity(self):
+        store = LocalBucketStore()
+        capacity, refill_rate = parse_rate('10/hour')
+        barrier = threading.Barrier(8)
+        results = []
+
+        def hit():
+            barrier.wait()
+            for _ in range(5):
+                results.append(store.consume('ratelimit:test', capacity, refill_rate))
+
+        threads = [threading.Thread(target=hit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 40)
+        self.assertEqual(results.count(0), capacity)
+
+    def test_redis_script_result_is_wait_seconds(self):
+        store = RedisBucketStore('redis://ratelimit.test:6379/0')
+        store._script = mock.Mock(return_value=b'2.5')
+        self.assertEqual(store.consume('ratelimit:test', *parse_rate('10/min')), 2.5)
+
+        kwargs = store._script.call_args.kwargs
+        self.assertEqual(kwargs['keys'], ['ratelimit:test'])
+        capacity, refill_rate, _, ttl = kwargs['args']
+        self.assertEqual((capacity, refill_rate, ttl), (10, 10 / 60, 61))
+
+    @override_settings(
+        RATE_LIMIT_BACKEND='redis', RATE_LIMIT_REDIS_URL='redis://127.0.0.1:1/0', RATE_LIMIT_REDIS_TIMEOUT=0.05,
+        RATE_LIMITS={'login': {'ip': '1/min'}},
+    )
+    def test_unavailable_redis_falls_back_to_local_store(self):
+        store = get_bucket_store()
+        self.assertIsInstance(store, RedisBucketStore)
+
+        # Redis에 닿지 못해도 500이 아니라 프로세스 메모리 버킷으로 계속 제한한다
+        with self.assertLogs('django.request', 'WARNING') as logs:
+            self.assertNotEqual(self.login().status_code, 429)
+        self.assertIn('rate limit store redis://127.0.0.1:1/0 unavailable', logs.output[0])
+
+        # RATE_LIMIT_REDIS_RETRY 동안은 Redis에 다시 연결하지 않는다
+        with mock.patch.object(store, '_get_script') as get_script:
+            self.assertEqual(self.login().status_code, 429)
+        get_script.assert_not_called()